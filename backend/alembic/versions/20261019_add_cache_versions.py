@@ -0,0 +1,73 @@
+"""add cache_versions and the bump_cache_versions notify function
+
+Revision ID: 20261019_add_cache_versions
+Revises: 20261019_add_ranking_archives
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_add_cache_versions"
+down_revision: Union[str, None] = "20261019_add_ranking_archives"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Bumps each tag once (sorted, so concurrent bumps lock rows in the same
+# order), then NOTIFYs `cache_invalidation` with {tag: new_version}. The
+# notification is delivered when the calling transaction commits. Returns the
+# same object. Callable through PostgREST as rpc/bump_cache_versions.
+BUMP_CACHE_VERSIONS_SQL = """
+CREATE OR REPLACE FUNCTION bump_cache_versions(p_tags text[]) RETURNS jsonb
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_versions jsonb;
+BEGIN
+    WITH bumped AS (
+        INSERT INTO cache_versions AS c (tag, version, seq, updated_at)
+        SELECT t.tag, 1, nextval('cache_versions_seq'), now()
+        FROM (SELECT DISTINCT unnest(p_tags) AS tag ORDER BY 1) AS t
+        ON CONFLICT (tag) DO UPDATE SET
+            version = c.version + 1,
+            seq = EXCLUDED.seq,
+            updated_at = EXCLUDED.updated_at
+        RETURNING c.tag, c.version
+    )
+    SELECT COALESCE(jsonb_object_agg(tag, version), '{}'::jsonb) INTO v_versions FROM bumped;
+    PERFORM pg_notify('cache_invalidation', v_versions::text);
+    RETURN v_versions;
+END;
+$$;
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "cache_versions",
+        sa.Column("tag", sa.String(length=255), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column("seq", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("tag"),
+    )
+    op.create_index("ix_cache_versions_seq", "cache_versions", ["seq"])
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE SEQUENCE IF NOT EXISTS cache_versions_seq")
+    op.execute(BUMP_CACHE_VERSIONS_SQL)
+    op.execute("NOTIFY pgrst, 'reload schema'")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP FUNCTION IF EXISTS bump_cache_versions(text[])")
+        op.execute("DROP SEQUENCE IF EXISTS cache_versions_seq")
+        op.execute("NOTIFY pgrst, 'reload schema'")
+    op.drop_index("ix_cache_versions_seq", table_name="cache_versions")
+    op.drop_table("cache_versions")
@@ -0,0 +1,99 @@
+"""add persist_ranking_list function for atomic ranking writes
+
+Revision ID: 20261019_add_persist_ranking_list_function
+Revises: 20260208_add_computed_tags_to_videos
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_add_persist_ranking_list_function"
+down_revision: Union[str, None] = "20260208_add_computed_tags_to_videos"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Called by the weekly ingestion script via PostgREST (`POST /rest/v1/rpc/...`),
+# so videos, the list and its items are committed in a single transaction.
+# Re-running it for the same list name replaces that list's items in place,
+# which makes retries idempotent per week label.
+PERSIST_RANKING_LIST_SQL = """
+CREATE OR REPLACE FUNCTION persist_ranking_list(
+    p_name text,
+    p_description text,
+    p_videos jsonb,
+    p_items jsonb
+) RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_list_id integer;
+BEGIN
+    -- Serialize concurrent retries for the same week label.
+    PERFORM pg_advisory_xact_lock(hashtext('ranking_lists:' || p_name));
+
+    INSERT INTO videos (
+        youtube_id, title, description, channel_title, channel_id, published_at,
+        view_count, like_count, duration, tags, thumbnail_url
+    )
+    SELECT
+        v.youtube_id, v.title, v.description, v.channel_title, v.channel_id, v.published_at,
+        v.view_count, v.like_count, v.duration, v.tags, v.thumbnail_url
+    FROM jsonb_to_recordset(p_videos) AS v(
+        youtube_id text, title text, description text, channel_title text, channel_id text,
+        published_at timestamp, view_count integer, like_count integer, duration integer,
+        tags json, thumbnail_url text
+    )
+    ON CONFLICT (youtube_id) DO UPDATE SET
+        title = EXCLUDED.title,
+        description = EXCLUDED.description,
+        channel_title = EXCLUDED.channel_title,
+        channel_id = EXCLUDED.channel_id,
+        published_at = EXCLUDED.published_at,
+        view_count = EXCLUDED.view_count,
+        like_count = EXCLUDED.like_count,
+        duration = EXCLUDED.duration,
+        tags = EXCLUDED.tags,
+        thumbnail_url = EXCLUDED.thumbnail_url;
+
+    SELECT id INTO v_list_id
+    FROM ranking_lists
+    WHERE name = p_name
+    ORDER BY id DESC
+    LIMIT 1;
+
+    IF v_list_id IS NULL THEN
+        INSERT INTO ranking_lists (name, description, created_at)
+        VALUES (p_name, p_description, now())
+        RETURNING id INTO v_list_id;
+    ELSE
+        UPDATE ranking_lists SET description = p_description WHERE id = v_list_id;
+        DELETE FROM ranking_items WHERE ranking_list_id = v_list_id;
+    END IF;
+
+    INSERT INTO ranking_items (ranking_list_id, video_id, position, score)
+    SELECT v_list_id, i.video_id, i.position, i.score
+    FROM jsonb_to_recordset(p_items) AS i(video_id text, position integer, score integer);
+
+    RETURN v_list_id;
+END;
+$$;
+"""
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(PERSIST_RANKING_LIST_SQL)
+    # Ask PostgREST to pick up the new function without a restart.
+    op.execute("NOTIFY pgrst, 'reload schema'")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP FUNCTION IF EXISTS persist_ranking_list(text, text, jsonb, jsonb)")
@@ -0,0 +1,41 @@
+"""add ranking_archives for compacted historical weeks
+
+Revision ID: 20261019_add_ranking_archives
+Revises: 20261019_add_ranking_label_date
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_add_ranking_archives"
+down_revision: Union[str, None] = "20261019_add_ranking_label_date"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ranking_archives",
+        sa.Column(
+            "ranking_list_id",
+            sa.Integer(),
+            sa.ForeignKey("ranking_lists.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("codec", sa.String(length=32), nullable=False),
+        sa.Column("item_count", sa.Integer(), nullable=False),
+        sa.Column("payload", sa.LargeBinary(), nullable=False),
+        sa.Column("archived_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("ranking_list_id"),
+    )
+
+
+def downgrade() -> None:
+    # Archived weeks would lose their items; unpack them first with
+    # `python -m scripts.archive_rankings --restore`.
+    op.drop_table("ranking_archives")
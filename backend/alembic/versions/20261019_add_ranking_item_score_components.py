@@ -0,0 +1,112 @@
+"""add ranking_items.score_components and pass it through persist_ranking_list
+
+Revision ID: 20261019_add_ranking_item_score_components
+Revises: 20261019_add_video_stats_history
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_add_ranking_item_score_components"
+down_revision: Union[str, None] = "20261019_add_video_stats_history"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Same function as 20261019_add_persist_ranking_list_function; only the
+# ranking_items column list changes between versions.
+PERSIST_RANKING_LIST_TEMPLATE = """
+CREATE OR REPLACE FUNCTION persist_ranking_list(
+    p_name text,
+    p_description text,
+    p_videos jsonb,
+    p_items jsonb
+) RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_list_id integer;
+BEGIN
+    -- Serialize concurrent retries for the same week label.
+    PERFORM pg_advisory_xact_lock(hashtext('ranking_lists:' || p_name));
+
+    INSERT INTO videos (
+        youtube_id, title, description, channel_title, channel_id, published_at,
+        view_count, like_count, duration, tags, thumbnail_url
+    )
+    SELECT
+        v.youtube_id, v.title, v.description, v.channel_title, v.channel_id, v.published_at,
+        v.view_count, v.like_count, v.duration, v.tags, v.thumbnail_url
+    FROM jsonb_to_recordset(p_videos) AS v(
+        youtube_id text, title text, description text, channel_title text, channel_id text,
+        published_at timestamp, view_count integer, like_count integer, duration integer,
+        tags json, thumbnail_url text
+    )
+    ON CONFLICT (youtube_id) DO UPDATE SET
+        title = EXCLUDED.title,
+        description = EXCLUDED.description,
+        channel_title = EXCLUDED.channel_title,
+        channel_id = EXCLUDED.channel_id,
+        published_at = EXCLUDED.published_at,
+        view_count = EXCLUDED.view_count,
+        like_count = EXCLUDED.like_count,
+        duration = EXCLUDED.duration,
+        tags = EXCLUDED.tags,
+        thumbnail_url = EXCLUDED.thumbnail_url;
+
+    SELECT id INTO v_list_id
+    FROM ranking_lists
+    WHERE name = p_name
+    ORDER BY id DESC
+    LIMIT 1;
+
+    IF v_list_id IS NULL THEN
+        INSERT INTO ranking_lists (name, description, created_at)
+        VALUES (p_name, p_description, now())
+        RETURNING id INTO v_list_id;
+    ELSE
+        UPDATE ranking_lists SET description = p_description WHERE id = v_list_id;
+        DELETE FROM ranking_items WHERE ranking_list_id = v_list_id;
+    END IF;
+
+    INSERT INTO ranking_items ({item_columns})
+    SELECT {item_select}
+    FROM jsonb_to_recordset(p_items) AS i({item_record});
+
+    RETURN v_list_id;
+END;
+$$;
+"""
+
+
+def _persist_ranking_list_sql(with_components: bool) -> str:
+    columns = ["video_id", "position", "score"]
+    record = ["video_id text", "position integer", "score integer"]
+    if with_components:
+        columns.append("score_components")
+        record.append("score_components json")
+    return PERSIST_RANKING_LIST_TEMPLATE.format(
+        item_columns=", ".join(["ranking_list_id"] + columns),
+        item_select=", ".join(["v_list_id"] + [f"i.{column}" for column in columns]),
+        item_record=", ".join(record),
+    )
+
+
+def upgrade() -> None:
+    op.add_column("ranking_items", sa.Column("score_components", sa.JSON(), nullable=True))
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(_persist_ranking_list_sql(with_components=True))
+    op.execute("NOTIFY pgrst, 'reload schema'")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(_persist_ranking_list_sql(with_components=False))
+        op.execute("NOTIFY pgrst, 'reload schema'")
+    op.drop_column("ranking_items", "score_components")
@@ -0,0 +1,114 @@
+"""add ranking_lists.label_date and ranking history indexes
+
+Revision ID: 20261019_add_ranking_label_date
+Revises: 20261019_add_ranking_list_boards
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+import re
+from datetime import date, datetime
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_add_ranking_label_date"
+down_revision: Union[str, None] = "20261019_add_ranking_list_boards"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Lists are created by persist_ranking_boards through PostgREST; fill the
+# label in from the "... YYYY-MM-DD" name suffix as they are inserted, the
+# same rule the API used to apply on every request.
+LABEL_DATE_TRIGGER_SQL = r"""
+CREATE OR REPLACE FUNCTION set_ranking_list_label_date() RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF NEW.label_date IS NULL THEN
+        BEGIN
+            NEW.label_date := substring(NEW.name from '(\d{4}-\d{2}-\d{2})$')::date;
+        EXCEPTION WHEN others THEN
+            NEW.label_date := NULL;
+        END;
+        NEW.label_date := COALESCE(NEW.label_date, COALESCE(NEW.created_at, now())::date);
+    END IF;
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS ranking_lists_label_date ON ranking_lists;
+CREATE TRIGGER ranking_lists_label_date
+    BEFORE INSERT ON ranking_lists
+    FOR EACH ROW EXECUTE FUNCTION set_ranking_list_label_date();
+"""
+
+
+BACKFILL_LABEL_DATE_SQL = r"""
+UPDATE ranking_lists
+SET label_date = COALESCE(
+    CASE WHEN name ~ '\d{4}-\d{2}-\d{2}$'
+        THEN to_date(substring(name from '(\d{4}-\d{2}-\d{2})$'), 'YYYY-MM-DD')
+    END,
+    created_at::date
+)
+"""
+
+
+def _label_date(name: str, created_at: Optional[datetime]) -> Optional[date]:
+    match = re.search(r"(\d{4}-\d{2}-\d{2})$", name or "")
+    if match:
+        try:
+            return datetime.strptime(match.group(1), "%Y-%m-%d").date()
+        except ValueError:
+            pass
+    return created_at.date() if created_at else None
+
+
+def upgrade() -> None:
+    op.add_column("ranking_lists", sa.Column("label_date", sa.Date(), nullable=True))
+    op.create_index(
+        "ix_ranking_lists_board_label_date", "ranking_lists", ["board", "label_date"]
+    )
+    op.create_index(
+        "ix_ranking_items_list_position", "ranking_items", ["ranking_list_id", "position"]
+    )
+    op.create_index(
+        "ix_ranking_items_video_list", "ranking_items", ["video_id", "ranking_list_id"]
+    )
+
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute(BACKFILL_LABEL_DATE_SQL)
+        op.execute(LABEL_DATE_TRIGGER_SQL)
+        return
+
+    ranking_lists = sa.table(
+        "ranking_lists",
+        sa.column("id", sa.Integer),
+        sa.column("name", sa.String),
+        sa.column("created_at", sa.DateTime),
+        sa.column("label_date", sa.Date),
+    )
+    rows = bind.execute(
+        sa.select(ranking_lists.c.id, ranking_lists.c.name, ranking_lists.c.created_at)
+    ).fetchall()
+    for row in rows:
+        bind.execute(
+            ranking_lists.update()
+            .where(ranking_lists.c.id == row.id)
+            .values(label_date=_label_date(row.name, row.created_at))
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS ranking_lists_label_date ON ranking_lists")
+        op.execute("DROP FUNCTION IF EXISTS set_ranking_list_label_date()")
+    op.drop_index("ix_ranking_items_video_list", table_name="ranking_items")
+    op.drop_index("ix_ranking_items_list_position", table_name="ranking_items")
+    op.drop_index("ix_ranking_lists_board_label_date", table_name="ranking_lists")
+    op.drop_column("ranking_lists", "label_date")
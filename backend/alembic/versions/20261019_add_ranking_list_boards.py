@@ -0,0 +1,163 @@
+"""add ranking_lists.board and the persist_ranking_boards function
+
+Revision ID: 20261019_add_ranking_list_boards
+Revises: 20261019_add_ranking_item_score_components
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+import importlib.util
+from pathlib import Path
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_add_ranking_list_boards"
+down_revision: Union[str, None] = "20261019_add_ranking_item_score_components"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Writes the main board and every tag sub-board of one ingestion run, plus
+# the videos they reference, in a single transaction. `p_boards` is a JSON
+# array of {board, name, description, items}; each (name, board) pair is
+# replaced in place when it already exists, so retries stay idempotent.
+# Returns {board: ranking_list_id}.
+PERSIST_RANKING_BOARDS_SQL = """
+CREATE OR REPLACE FUNCTION persist_ranking_boards(
+    p_videos jsonb,
+    p_boards jsonb
+) RETURNS jsonb
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_board jsonb;
+    v_name text;
+    v_list_id integer;
+    v_ids jsonb := '{}'::jsonb;
+BEGIN
+    -- Same lock key as persist_ranking_list; sorted to avoid lock-order
+    -- deadlocks between concurrent writers.
+    FOR v_name IN
+        SELECT DISTINCT b->>'name' FROM jsonb_array_elements(p_boards) AS b ORDER BY 1
+    LOOP
+        PERFORM pg_advisory_xact_lock(hashtext('ranking_lists:' || v_name));
+    END LOOP;
+
+    INSERT INTO videos (
+        youtube_id, title, description, channel_title, channel_id, published_at,
+        view_count, like_count, duration, tags, thumbnail_url
+    )
+    SELECT
+        v.youtube_id, v.title, v.description, v.channel_title, v.channel_id, v.published_at,
+        v.view_count, v.like_count, v.duration, v.tags, v.thumbnail_url
+    FROM jsonb_to_recordset(p_videos) AS v(
+        youtube_id text, title text, description text, channel_title text, channel_id text,
+        published_at timestamp, view_count integer, like_count integer, duration integer,
+        tags json, thumbnail_url text
+    )
+    ON CONFLICT (youtube_id) DO UPDATE SET
+        title = EXCLUDED.title,
+        description = EXCLUDED.description,
+        channel_title = EXCLUDED.channel_title,
+        channel_id = EXCLUDED.channel_id,
+        published_at = EXCLUDED.published_at,
+        view_count = EXCLUDED.view_count,
+        like_count = EXCLUDED.like_count,
+        duration = EXCLUDED.duration,
+        tags = EXCLUDED.tags,
+        thumbnail_url = EXCLUDED.thumbnail_url;
+
+    FOR v_board IN SELECT * FROM jsonb_array_elements(p_boards)
+    LOOP
+        v_list_id := NULL;
+        SELECT id INTO v_list_id
+        FROM ranking_lists
+        WHERE name = v_board->>'name' AND board = v_board->>'board'
+        ORDER BY id DESC
+        LIMIT 1;
+
+        IF v_list_id IS NULL THEN
+            INSERT INTO ranking_lists (name, board, description, created_at)
+            VALUES (v_board->>'name', v_board->>'board', v_board->>'description', now())
+            RETURNING id INTO v_list_id;
+        ELSE
+            UPDATE ranking_lists SET description = v_board->>'description' WHERE id = v_list_id;
+            DELETE FROM ranking_items WHERE ranking_list_id = v_list_id;
+        END IF;
+
+        INSERT INTO ranking_items (ranking_list_id, video_id, position, score, score_components)
+        SELECT v_list_id, i.video_id, i.position, i.score, i.score_components
+        FROM jsonb_to_recordset(v_board->'items') AS i(
+            video_id text, position integer, score integer, score_components json
+        );
+
+        v_ids := v_ids || jsonb_build_object(v_board->>'board', v_list_id);
+    END LOOP;
+
+    RETURN v_ids;
+END;
+$$;
+"""
+
+# The single-list function now writes the main board through the new one, so
+# it can no longer pick up a sub-board list that shares its name.
+PERSIST_RANKING_LIST_SQL = """
+CREATE OR REPLACE FUNCTION persist_ranking_list(
+    p_name text,
+    p_description text,
+    p_videos jsonb,
+    p_items jsonb
+) RETURNS integer
+LANGUAGE sql
+AS $$
+    SELECT (
+        persist_ranking_boards(
+            p_videos,
+            jsonb_build_array(jsonb_build_object(
+                'board', 'main',
+                'name', p_name,
+                'description', p_description,
+                'items', p_items
+            ))
+        )->>'main'
+    )::integer;
+$$;
+"""
+
+
+def _previous_persist_ranking_list_sql() -> str:
+    path = Path(__file__).with_name("20261019_add_ranking_item_score_components.py")
+    spec = importlib.util.spec_from_file_location("_score_components_revision", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module._persist_ranking_list_sql(with_components=True)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "ranking_lists",
+        sa.Column("board", sa.String(length=64), nullable=False, server_default="main"),
+    )
+    op.create_index("ix_ranking_lists_board_name", "ranking_lists", ["board", "name"])
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(PERSIST_RANKING_BOARDS_SQL)
+    op.execute(PERSIST_RANKING_LIST_SQL)
+    op.execute("NOTIFY pgrst, 'reload schema'")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            "DELETE FROM ranking_items WHERE ranking_list_id IN "
+            "(SELECT id FROM ranking_lists WHERE board <> 'main')"
+        )
+        op.execute("DELETE FROM ranking_lists WHERE board <> 'main'")
+        op.execute(_previous_persist_ranking_list_sql())
+        op.execute("DROP FUNCTION IF EXISTS persist_ranking_boards(jsonb, jsonb)")
+        op.execute("NOTIFY pgrst, 'reload schema'")
+    op.drop_index("ix_ranking_lists_board_name", table_name="ranking_lists")
+    op.drop_column("ranking_lists", "board")
@@ -0,0 +1,42 @@
+"""add video_stats_history table and videos.stats_refreshed_at
+
+Revision ID: 20261019_add_video_stats_history
+Revises: 20261019_add_persist_ranking_list_function
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_add_video_stats_history"
+down_revision: Union[str, None] = "20261019_add_persist_ranking_list_function"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "video_stats_history",
+        sa.Column(
+            "video_id",
+            sa.String(length=64),
+            sa.ForeignKey("videos.youtube_id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("observed_at", sa.DateTime(), nullable=False),
+        sa.Column("view_count", sa.BigInteger(), nullable=False),
+        sa.Column("like_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("video_id", "observed_at"),
+    )
+    op.add_column("videos", sa.Column("stats_refreshed_at", sa.DateTime(), nullable=True))
+    op.create_index("ix_videos_stats_refreshed_at", "videos", ["stats_refreshed_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_videos_stats_refreshed_at", table_name="videos")
+    op.drop_column("videos", "stats_refreshed_at")
+    op.drop_table("video_stats_history")
@@ -0,0 +1,103 @@
+"""drop p_videos from persist_ranking_boards and the persist_ranking_list wrapper
+
+Revision ID: 20261019_drop_persist_ranking_videos
+Revises: 20261019_add_cache_versions
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+import importlib.util
+from pathlib import Path
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_drop_persist_ranking_videos"
+down_revision: Union[str, None] = "20261019_add_cache_versions"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Ingestion upserts the videos first, in batches through PostgREST, so the
+# function now only writes the boards: the main board and every tag
+# sub-board of one run, in a single transaction. `p_boards` is a JSON array
+# of {board, name, description, items}; each (name, board) pair is replaced
+# in place when it already exists, so retries stay idempotent. Returns
+# {board: ranking_list_id}.
+PERSIST_RANKING_BOARDS_SQL = """
+CREATE OR REPLACE FUNCTION persist_ranking_boards(p_boards jsonb) RETURNS jsonb
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_board jsonb;
+    v_name text;
+    v_list_id integer;
+    v_ids jsonb := '{}'::jsonb;
+BEGIN
+    -- Sorted to avoid lock-order deadlocks between concurrent writers.
+    FOR v_name IN
+        SELECT DISTINCT b->>'name' FROM jsonb_array_elements(p_boards) AS b ORDER BY 1
+    LOOP
+        PERFORM pg_advisory_xact_lock(hashtext('ranking_lists:' || v_name));
+    END LOOP;
+
+    FOR v_board IN SELECT * FROM jsonb_array_elements(p_boards)
+    LOOP
+        v_list_id := NULL;
+        SELECT id INTO v_list_id
+        FROM ranking_lists
+        WHERE name = v_board->>'name' AND board = v_board->>'board'
+        ORDER BY id DESC
+        LIMIT 1;
+
+        IF v_list_id IS NULL THEN
+            INSERT INTO ranking_lists (name, board, description, created_at)
+            VALUES (v_board->>'name', v_board->>'board', v_board->>'description', now())
+            RETURNING id INTO v_list_id;
+        ELSE
+            UPDATE ranking_lists SET description = v_board->>'description' WHERE id = v_list_id;
+            DELETE FROM ranking_items WHERE ranking_list_id = v_list_id;
+        END IF;
+
+        INSERT INTO ranking_items (ranking_list_id, video_id, position, score, score_components)
+        SELECT v_list_id, i.video_id, i.position, i.score, i.score_components
+        FROM jsonb_to_recordset(v_board->'items') AS i(
+            video_id text, position integer, score integer, score_components json
+        );
+
+        v_ids := v_ids || jsonb_build_object(v_board->>'board', v_list_id);
+    END LOOP;
+
+    RETURN v_ids;
+END;
+$$;
+"""
+
+
+def _boards_revision():
+    path = Path(__file__).with_name("20261019_add_ranking_list_boards.py")
+    spec = importlib.util.spec_from_file_location("_ranking_list_boards_revision", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    # Nothing calls the single-list wrapper any more, and it takes videos.
+    op.execute("DROP FUNCTION IF EXISTS persist_ranking_list(text, text, jsonb, jsonb)")
+    op.execute("DROP FUNCTION IF EXISTS persist_ranking_boards(jsonb, jsonb)")
+    op.execute(PERSIST_RANKING_BOARDS_SQL)
+    op.execute("NOTIFY pgrst, 'reload schema'")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    previous = _boards_revision()
+    op.execute("DROP FUNCTION IF EXISTS persist_ranking_boards(jsonb)")
+    op.execute(previous.PERSIST_RANKING_BOARDS_SQL)
+    op.execute(previous.PERSIST_RANKING_LIST_SQL)
+    op.execute("NOTIFY pgrst, 'reload schema'")
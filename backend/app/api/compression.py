@@ -0,0 +1,214 @@
+"""gzip / brotli content negotiation for API responses.
+
+`CompressionMiddleware` picks the best encoding the client accepts (brotli
+first when the `brotli` package is installed, then gzip) and compresses any
+JSON/text body above `minimum_size`. Responses carrying a strong ETag (see
+`app.api.responses.SnapshotResponse`) are compressed once per ETag and the
+bytes are reused from `CompressedBodyCache` until the content changes; such
+responses also get a 304 when the request's `If-None-Match` matches.
+"""
+
+import gzip
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import cache_lookup_counters
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# Snapshot bodies are compressed once, so they can afford a slower setting.
+SNAPSHOT_GZIP_LEVEL = 9
+SNAPSHOT_BROTLI_QUALITY = 11
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+_BODY_CACHE_HITS, _BODY_CACHE_MISSES = cache_lookup_counters("compressed_body")
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Best supported encoding for an `Accept-Encoding` header, or None.
+
+    Highest q-value wins; ties go to the server preference (br over gzip).
+    `*` stands for any encoding not listed explicitly, and q=0 excludes.
+    """
+    qualities: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name] = quality
+
+    best: Optional[str] = None
+    best_quality = 0.0
+    for encoding in supported_encodings():
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str, *, snapshot: bool = False) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=SNAPSHOT_BROTLI_QUALITY if snapshot else BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=SNAPSHOT_GZIP_LEVEL if snapshot else GZIP_LEVEL, mtime=0)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+class CompressedBodyCache:
+    """Bounded LRU of compressed bodies keyed by (ETag, encoding)."""
+
+    def __init__(self, max_entries: int = 128) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compress(self, etag: str, encoding: str, body: bytes) -> bytes:
+        key = (etag, encoding)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                _BODY_CACHE_HITS.inc()
+                return cached
+            self.misses += 1
+            _BODY_CACHE_MISSES.inc()
+        compressed = compress(body, encoding, snapshot=True)
+        with self._lock:
+            self._entries[key] = compressed
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return compressed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """ETag of the `encoding` representation; strong ETags differ per coding."""
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _etag_matches(if_none_match: str, etags: Tuple[str, ...]) -> bool:
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or any(etag in candidates for etag in etags)
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        minimum_size: int = 1024,
+        cache: Optional[CompressedBodyCache] = None,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache if cache is not None else CompressedBodyCache()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding", ""))
+        if_none_match = request_headers.get("if-none-match")
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+
+        async def buffered_send(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            await self._finish(start, b"".join(chunks), encoding, if_none_match, send)
+
+        await self.app(scope, receive, buffered_send)
+
+    async def _finish(
+        self,
+        start: Message,
+        body: bytes,
+        encoding: Optional[str],
+        if_none_match: Optional[str],
+        send: Send,
+    ) -> None:
+        headers = MutableHeaders(raw=list(start["headers"]))
+        etag = headers.get("etag")
+        strong_etag = etag is not None and not etag.startswith("W/")
+        content_type = headers.get("content-type", "")
+        compressible = (
+            start["status"] == 200
+            and "content-encoding" not in headers
+            and content_type.startswith(COMPRESSIBLE_TYPES)
+        )
+        if compressible:
+            headers.add_vary_header("Accept-Encoding")
+
+        compress_body = compressible and encoding is not None and len(body) >= self.minimum_size
+        if strong_etag and compress_body:
+            headers["etag"] = encoded_etag(etag, encoding)
+
+        if (
+            strong_etag
+            and if_none_match
+            and start["status"] == 200
+            and _etag_matches(if_none_match, (etag, headers["etag"]))
+        ):
+            for name in ("content-length", "content-type"):
+                if name in headers:
+                    del headers[name]
+            await send({"type": "http.response.start", "status": 304, "headers": headers.raw})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        if compress_body:
+            if strong_etag:
+                body = self.cache.get_or_compress(etag, encoding, body)
+            else:
+                body = compress(body, encoding)
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(body))
+
+        await send({**start, "headers": headers.raw})
+        await send({"type": "http.response.body", "body": body})
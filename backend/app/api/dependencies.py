@@ -1,8 +1,13 @@
-from typing import Generator
+import hmac
+from typing import AsyncGenerator, Generator, List, Optional
 
+from fastapi import Depends, Header, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.session import SessionLocal
+from app.db.routing import ReplicaRouter
+from app.db.session import AsyncSessionLocal, SessionLocal, db_router, settings
+from app.services.videos import parse_fields
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -11,3 +16,51 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_db_router() -> ReplicaRouter:
+    return db_router
+
+
+def get_admin_token() -> Optional[str]:
+    return settings.admin_token
+
+
+def require_admin(
+    x_admin_token: Optional[str] = Header(None),
+    admin_token: Optional[str] = Depends(get_admin_token),
+) -> None:
+    """Gate for the admin endpoints: hidden unless a token is configured."""
+    if admin_token is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token, admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+async def get_read_db(
+    router: ReplicaRouter = Depends(get_db_router),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only endpoints: the replica when it is fresh enough."""
+    session_factory = await router.read_sessionmaker()
+    async with session_factory() as db:
+        yield db
+
+
+async def get_video_fields(
+    fields: Optional[str] = Query(
+        None,
+        description=(
+            "Comma-separated video fields to return (youtube_id is always included); "
+            "'*' for all. Defaults to every field except description."
+        ),
+    ),
+) -> List[str]:
+    try:
+        return parse_fields(fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -0,0 +1,40 @@
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.api.dependencies import get_db_router, require_admin
+from app.db.pool import pool_monitors
+from app.db.routing import ReplicaRouter
+from app.db.session import slow_query_log
+from app.services.single_flight import flights
+
+# Internal telemetry (SQL, plans, pool state): every route needs ADMIN_TOKEN.
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/single-flight", response_model=Dict[str, Dict[str, Any]])
+def single_flight_stats() -> Dict[str, Dict[str, Any]]:
+    """Per call name: computations run, callers served and how they spread."""
+    return flights.stats()
+
+
+@router.get("/db-routing", response_model=Dict[str, Any])
+def db_routing_stats(db_router: ReplicaRouter = Depends(get_db_router)) -> Dict[str, Any]:
+    """Where read-only requests went (replica or primary, and why)."""
+    return db_router.stats()
+
+
+@router.get("/pools", response_model=Dict[str, Dict[str, Any]])
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Per engine: connections out, overflow, waiters and checkout latency."""
+    return {name: monitor.stats() for name, monitor in sorted(pool_monitors.items())}
+
+
+@router.get("/slow-queries", response_model=Dict[str, Any])
+def slow_queries(
+    full_scan_on: Optional[str] = Query(None, description="Only statements that fully scan this table"),
+) -> Dict[str, Any]:
+    """Recent statements over the slow-query threshold, newest first, with plans."""
+    if slow_query_log is None:
+        raise HTTPException(status_code=404, detail="Slow-query log is disabled")
+    return {**slow_query_log.stats(), "entries": slow_query_log.entries(full_scan_on=full_scan_on)}
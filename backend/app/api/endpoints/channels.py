@@ -1,25 +1,32 @@
 from typing import Any, Dict, List
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_db
-from app.services.channels import list_top_channels
+from app.api.dependencies import get_read_db
+from app.api.responses import SnapshotResponse
+from app.services.channels import list_top_channels_async
 
 router = APIRouter(prefix="/channels", tags=["channels"])
 
 
-@router.get("/popular", response_model=List[Dict[str, Any]])
-def popular_channels(
+@router.get(
+    "/popular",
+    response_model=List[Dict[str, Any]],
+    response_class=SnapshotResponse,
+)
+async def popular_channels(
     limit: int = Query(30, ge=1, le=100),
-    db: Session = Depends(get_db),
-) -> List[Dict[str, Any]]:
-    rows = list_top_channels(db, limit=limit)
-    return [
-        {
-            "channel_id": channel_id,
-            "channel_title": channel_title,
-            "video_count": count,
-        }
-        for channel_id, channel_title, count in rows
-    ]
+    db: AsyncSession = Depends(get_read_db),
+) -> SnapshotResponse:
+    rows = await list_top_channels_async(db, limit=limit)
+    return SnapshotResponse(
+        [
+            {
+                "channel_id": channel_id,
+                "channel_title": channel_title,
+                "video_count": count,
+            }
+            for channel_id, channel_title, count in rows
+        ]
+    )
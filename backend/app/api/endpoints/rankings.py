@@ -1,26 +1,57 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_db
-from app.schemas.ranking import RankingList
-from app.services.rankings import fetch_weekly_rankings, fetch_ranking_by_id
+from app.api.dependencies import get_read_db, get_video_fields
+from app.api.responses import SnapshotResponse
+from app.schemas.ranking import RankingHistory, RankingList
+from app.services.boards import MAIN_BOARD, is_known_board
+from app.services.rank_history import fetch_ranking_history_async
+from app.services.rankings import fetch_weekly_rankings_async, fetch_ranking_by_id_async
 
 router = APIRouter(prefix="/rankings", tags=["rankings"])
 
 
-@router.get("/weekly", response_model=List[RankingList])
-def list_weekly_rankings(db: Session = Depends(get_db)):
-    rankings = fetch_weekly_rankings(db)
+@router.get("/weekly", response_model=List[RankingList], response_class=SnapshotResponse)
+async def list_weekly_rankings(
+    board: str = Query(
+        MAIN_BOARD,
+        description="Board id: main (default) or a tag sub-board (e.g. whisper, tapping, ja)",
+    ),
+    fields: List[str] = Depends(get_video_fields),
+    db: AsyncSession = Depends(get_read_db),
+):
+    if not is_known_board(board):
+        raise HTTPException(status_code=400, detail="Unknown board")
+    rankings = await fetch_weekly_rankings_async(db, board=board, fields=fields)
     if not rankings:
         raise HTTPException(status_code=404, detail="No rankings available yet")
-    return rankings
+    return SnapshotResponse(rankings)
 
 
-@router.get("/weekly/{ranking_id}", response_model=RankingList)
-def get_weekly_ranking(ranking_id: int, db: Session = Depends(get_db)):
-    ranking = fetch_ranking_by_id(db, ranking_id)
+@router.get("/history", response_model=RankingHistory)
+async def get_ranking_history(
+    board: str = Query(MAIN_BOARD),
+    weeks: int = Query(12, ge=1, le=104),
+    limit: int = Query(100, ge=1, le=200),
+    db: AsyncSession = Depends(get_read_db),
+):
+    if not is_known_board(board):
+        raise HTTPException(status_code=400, detail="Unknown board")
+    history = await fetch_ranking_history_async(db, board=board, weeks=weeks, limit=limit)
+    if not history:
+        raise HTTPException(status_code=404, detail="No rankings available yet")
+    return history
+
+
+@router.get("/weekly/{ranking_id}", response_model=RankingList, response_class=SnapshotResponse)
+async def get_weekly_ranking(
+    ranking_id: int,
+    fields: List[str] = Depends(get_video_fields),
+    db: AsyncSession = Depends(get_read_db),
+):
+    ranking = await fetch_ranking_by_id_async(db, ranking_id, fields=fields)
     if not ranking:
         raise HTTPException(status_code=404, detail="Ranking not found")
-    return ranking
+    return SnapshotResponse(ranking)
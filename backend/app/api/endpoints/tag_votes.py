@@ -2,11 +2,14 @@ from typing import Dict
 
 from fastapi import APIRouter, Depends, Header, HTTPException
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
-from app.api.dependencies import get_db
+from app.api.dependencies import get_async_db, get_db_router
+from app.db.routing import ReplicaRouter
+from app.services.result_cache import ResultCache, get_result_cache
 from app.services.tag_catalog import ALLOWED_TAGS
-from app.services.tag_votes import record_tag_vote
+from app.services.tag_votes import record_tag_vote_async
 
 router = APIRouter(prefix="/videos", tags=["tag-votes"])
 
@@ -15,11 +18,13 @@ class TagVotePayload(BaseModel):
   vote: int  # +1 or -1
 
 @router.post("/{video_id}/tags/{tag}/vote", response_model=Dict[str, int])
-def vote_on_tag(
+async def vote_on_tag(
     video_id: str,
     tag: str,
     payload: TagVotePayload,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    cache: ResultCache = Depends(get_result_cache),
+    router: ReplicaRouter = Depends(get_db_router),
     x_user_fingerprint: str | None = Header(default=None, convert_underscores=False),
 ):
     """Record a +1/-1 vote for a tag on a given video.
@@ -37,12 +42,16 @@ def vote_on_tag(
 
     fingerprint = x_user_fingerprint or "anonymous"
 
-    score = record_tag_vote(
+    # Read-after-write: the score is read back on the primary session.
+    score = await record_tag_vote_async(
         db,
         video_id=video_id,
         tag=tag,
         user_fingerprint=fingerprint,
         vote=payload.vote,
     )
+    router.note_write()
+    # Publishing may block on the database or Redis; keep it off the event loop.
+    await run_in_threadpool(cache.invalidate_video_tags, video_id, [tag])
 
     return {"score": score}
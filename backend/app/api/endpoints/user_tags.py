@@ -2,12 +2,16 @@ from typing import Dict
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
-from app.api.dependencies import get_db
+from app.api.dependencies import get_async_db, get_db_router
+from app.db.routing import ReplicaRouter
 from app.models import Video as VideoModel
+from app.services.result_cache import ResultCache, get_result_cache
 from app.services.tag_catalog import ALLOWED_TAGS
-from app.services.tag_feedback import add_user_tag
+from app.services.tag_feedback import add_user_tag_async
 
 router = APIRouter(prefix="/videos", tags=["user-tags"])
 
@@ -17,17 +21,24 @@ class UserTagPayload(BaseModel):
 
 
 @router.post("/{video_id}/tags", response_model=Dict[str, bool])
-def create_user_tag(
+async def create_user_tag(
     video_id: str,
     payload: UserTagPayload,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    cache: ResultCache = Depends(get_result_cache),
+    router: ReplicaRouter = Depends(get_db_router),
 ):
     if payload.tag not in ALLOWED_TAGS:
         raise HTTPException(status_code=400, detail="Unknown or unsupported tag id")
 
-    video = db.query(VideoModel).filter(VideoModel.youtube_id == video_id).first()
+    video = (
+        await db.execute(select(VideoModel.youtube_id).where(VideoModel.youtube_id == video_id))
+    ).first()
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
 
-    created = add_user_tag(db, video_id=video_id, tag=payload.tag)
+    created = await add_user_tag_async(db, video_id=video_id, tag=payload.tag)
+    if created:
+        router.note_write()
+        await run_in_threadpool(cache.invalidate_video_tags, video_id, [payload.tag])
     return {"created": created}
@@ -1,16 +1,24 @@
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_db
-from app.services.videos import browse_videos
+from app.api.dependencies import get_read_db, get_video_fields
+from app.api.responses import FastJSONResponse
+from app.models import Video as VideoModel
+from app.schemas.ranking import VideoRankHistory
+from app.schemas.video import VideoBase
+from app.services.boards import MAIN_BOARD, is_known_board
+from app.services.rank_history import fetch_video_rank_history_async
+from app.services.result_cache import ResultCache, get_result_cache
+from app.services.videos import browse_videos_async, fetch_video_detail_async
 
 router = APIRouter(prefix="/videos", tags=["videos"])
 
 
-@router.get("", response_model=Dict[str, Any])
-def list_videos(
+@router.get("", response_model=Dict[str, Any], response_class=FastJSONResponse)
+async def list_videos(
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
     # Legacy single-channel param (kept for compatibility)
@@ -40,8 +48,10 @@ def list_videos(
         None,
         description="Comma-separated tag ids to exclude (e.g. mouth_sounds,roleplay)",
     ),
-    db: Session = Depends(get_db),
-) -> Dict[str, Any]:
+    fields: List[str] = Depends(get_video_fields),
+    db: AsyncSession = Depends(get_read_db),
+    cache: ResultCache = Depends(get_result_cache),
+) -> FastJSONResponse:
     tag_list: List[str] = []
     if tags:
         tag_list = [t.strip() for t in tags.split(",") if t.strip()]
@@ -54,7 +64,7 @@ def list_videos(
     if exclude:
         exclude_list = [t.strip() for t in exclude.split(",") if t.strip()]
 
-    items, total = browse_videos(
+    items, total = await browse_videos_async(
         db,
         page=page,
         page_size=page_size,
@@ -65,10 +75,40 @@ def list_videos(
         language=language,
         sort=sort,
         exclude_tags=exclude_list,
+        fields=fields,
+        cache=cache,
     )
-    return {
-        "items": items,
-        "total": total,
-        "page": page,
-        "page_size": page_size,
-    }
+    return FastJSONResponse(
+        {
+            "items": items,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+        }
+    )
+
+
+@router.get("/{video_id}/rank-history", response_model=VideoRankHistory)
+async def get_video_rank_history(
+    video_id: str,
+    board: str = Query(MAIN_BOARD),
+    weeks: int = Query(52, ge=1, le=104),
+    db: AsyncSession = Depends(get_read_db),
+) -> VideoRankHistory:
+    if not is_known_board(board):
+        raise HTTPException(status_code=400, detail="Unknown board")
+    exists = (
+        await db.execute(select(VideoModel.youtube_id).where(VideoModel.youtube_id == video_id))
+    ).first()
+    if not exists:
+        raise HTTPException(status_code=404, detail="Video not found")
+    return await fetch_video_rank_history_async(db, video_id, board=board, weeks=weeks)
+
+
+@router.get("/{video_id}", response_model=VideoBase, response_class=FastJSONResponse)
+async def get_video(video_id: str, db: AsyncSession = Depends(get_read_db)) -> FastJSONResponse:
+    """Full video payload, including the description list endpoints omit."""
+    video = await fetch_video_detail_async(db, video_id)
+    if not video:
+        raise HTTPException(status_code=404, detail="Video not found")
+    return FastJSONResponse(video)
@@ -0,0 +1,52 @@
+"""Request metrics middleware; the metrics themselves live in `app.core.metrics`.
+
+Runs inside `ServerTimingMiddleware`, whose `track_queries()` context
+supplies the per-request DB time and query count.
+"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.timing import route_template
+from app.core.metrics import IN_FLIGHT, REQUESTS, UNMATCHED_ROUTE, route_metrics
+from app.db.instrumentation import current_query_stats
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_counting(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_counting)
+        finally:
+            IN_FLIGHT.dec()
+            # Label by template, never by raw path, to bound the series count.
+            route = route_template(scope) if "route" in scope else UNMATCHED_ROUTE
+            method = scope["method"]
+            metrics = route_metrics(method, route)
+            metrics.seconds.observe(time.perf_counter() - started)
+            metrics.response_bytes.observe(size)
+            stats = current_query_stats()
+            if stats is not None:
+                metrics.db_seconds.observe(stats.seconds)
+                metrics.db_queries.observe(stats.count)
+            REQUESTS.labels(method, route, str(status)).inc()
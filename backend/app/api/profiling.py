@@ -0,0 +1,193 @@
+"""On-demand statistical profiling of single requests.
+
+`ProfilingMiddleware` is only installed when `PROFILE_DIR` is set, so
+without it no code runs at all. When installed, a request is profiled when:
+
+- it carries `X-Profile: <expires>.<signature>`, where `<expires>` is a Unix
+  time and `<signature>` is `profile_token()`'s HMAC-SHA256 of it under
+  `PROFILE_SECRET`; or
+- it is picked at random, with probability `PROFILE_SAMPLE_RATE`.
+
+A sampler thread then records the event loop thread's stack every
+`PROFILE_INTERVAL_MS` until the response is sent. Async endpoints and the
+services they call through `run_sync` execute on that thread; work handed
+to the threadpool (the sync youtube endpoints) is not seen, and neither is
+time spent awaiting I/O. Stacks of concurrent requests on the same loop do
+show up in each other's profiles. One request per process is profiled at a
+time; others are served unprofiled meanwhile.
+
+Each profile is written, off the response path, to `PROFILE_DIR` as
+
+    <unix ms>_<METHOD>_<route>_<duration>ms.folded   collapsed stacks
+    <same name>.json                                 route, path, status, timing
+
+The `.folded` file is the `frame;frame;frame count` format that
+`flamegraph.pl` and speedscope read.
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.timing import route_template
+
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+
+
+def profile_token(secret: str, expires_at: int) -> str:
+    """`X-Profile` value that enables profiling until `expires_at` (Unix time)."""
+    signature = hmac.new(secret.encode(), str(expires_at).encode(), hashlib.sha256).hexdigest()
+    return f"{expires_at}.{signature}"
+
+
+def valid_token(secret: str, token: str, *, now: Optional[float] = None) -> bool:
+    expires, _, _ = token.partition(".")
+    if not expires.isdigit() or int(expires) < (time.time() if now is None else now):
+        return False
+    return hmac.compare_digest(profile_token(secret, int(expires)), token)
+
+
+def _frame_label(code) -> str:
+    # `;` separates frames in the collapsed format.
+    name = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return name.replace(";", ":")
+
+
+class StackSampler:
+    """Counts the stacks of one thread, sampled every `interval` seconds."""
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if labels:
+                self.stacks[";".join(reversed(labels))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _slug(route: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_]+", "-", route).strip("-") or "root"
+
+
+class ProfilingMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        directory: str,
+        secret: Optional[str] = None,
+        sample_rate: float = 0.0,
+        interval_ms: float = 5.0,
+    ) -> None:
+        self.app = app
+        self.directory = directory
+        self.secret = secret
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000
+        self._busy = threading.Lock()
+
+    def wants_profile(self, scope: Scope) -> bool:
+        if self.sample_rate and random.random() < self.sample_rate:
+            return True
+        if self.secret is None:
+            return False
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return valid_token(self.secret, value.decode("latin-1"))
+        return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        if not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            sampler.stop()
+            self._busy.release()
+            metadata = {
+                "method": scope["method"],
+                "route": route_template(scope),
+                "path": scope["path"],
+                "status": status,
+                "duration_ms": round(elapsed * 1000, 2),
+                "interval_ms": self.interval * 1000,
+                "samples": sum(sampler.stacks.values()),
+                "started_at": time.time() - elapsed,
+            }
+            threading.Thread(
+                target=self._write, args=(metadata, sampler.collapsed()), name="profile-writer", daemon=True
+            ).start()
+
+    def _write(self, metadata: dict, collapsed: str) -> None:
+        name = "{}_{}_{}_{}ms".format(
+            int(metadata["started_at"] * 1000),
+            metadata["method"],
+            _slug(metadata["route"]),
+            int(metadata["duration_ms"]),
+        )
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(os.path.join(self.directory, f"{name}.folded"), "w", encoding="utf-8") as folded:
+                folded.write(collapsed)
+            with open(os.path.join(self.directory, f"{name}.json"), "w", encoding="utf-8") as meta:
+                json.dump(metadata, meta, indent=2)
+        except OSError as exc:
+            logger.warning("Writing profile %s failed: %s", name, exc)
+        else:
+            logger.info(
+                "Profiled %s %s in %.1fms -> %s",
+                metadata["method"],
+                metadata["route"],
+                metadata["duration_ms"],
+                name,
+            )
@@ -0,0 +1,49 @@
+"""Response classes for the hot list endpoints.
+
+`FastJSONResponse` encodes plain dicts/lists with orjson instead of running
+FastAPI's `jsonable_encoder` + pydantic validation + stdlib `json`. Endpoints
+that return it must build JSON-ready payloads themselves (see
+`app.services.videos.video_rows_to_dicts`); the declared `response_model` is
+then only used for the OpenAPI schema.
+"""
+
+import hashlib
+from datetime import date, datetime
+from typing import Any, Mapping, Optional
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _default(value: Any) -> Any:
+    # Same ISO format jsonable_encoder produces (orjson's native datetime
+    # output differs for e.g. microsecond-less aware values).
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+        )
+
+
+class SnapshotResponse(FastJSONResponse):
+    """FastJSONResponse with a strong ETag derived from the body.
+
+    Used for payloads that only change when ingestion runs (weekly boards,
+    popular channels). The ETag names the content version: the compression
+    middleware keeps one compressed copy per ETag and answers matching
+    `If-None-Match` requests with 304.
+    """
+
+    def init_headers(self, headers: Optional[Mapping[str, str]] = None) -> None:
+        super().init_headers(headers)
+        digest = hashlib.blake2b(self.body, digest_size=16).hexdigest()
+        self.raw_headers.append((b"etag", f'"{digest}"'.encode("latin-1")))
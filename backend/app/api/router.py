@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.endpoints import channels, rankings, youtube, videos, tag_votes, user_tags
+from app.api.endpoints import admin, channels, rankings, youtube, videos, tag_votes, user_tags
 
 
 api_router = APIRouter()
@@ -10,3 +10,4 @@ api_router.include_router(videos.router)
 api_router.include_router(channels.router)
 api_router.include_router(tag_votes.router)
 api_router.include_router(user_tags.router)
+api_router.include_router(admin.router)
@@ -0,0 +1,87 @@
+"""`Server-Timing` headers and a structured log line for every request.
+
+Each HTTP request runs inside `app.db.instrumentation.track_queries()`.
+When the response starts, the middleware adds
+
+    Server-Timing: db;dur=<ms>;desc="<n> queries", app;dur=<ms>
+
+(time in SQL, and in the whole handler so far). When the response is done,
+it logs one `app.requests` record whose `extra` fields (`method`, `route`,
+`path`, `status`, `duration_ms`, `db_queries`, `db_ms`) a JSON formatter can
+emit as-is.
+"""
+
+import logging
+import time
+from typing import Any, Dict
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.instrumentation import QueryStats, track_queries
+
+
+logger = logging.getLogger("app.requests")
+
+
+def server_timing(stats: QueryStats, elapsed: float) -> str:
+    return (
+        f'db;dur={stats.seconds * 1000:.2f};desc="{stats.count} queries", '
+        f"app;dur={elapsed * 1000:.2f}"
+    )
+
+
+def route_template(scope: Scope) -> str:
+    """The matched route's path template (`/api/videos/{video_id}`), else the path."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or scope.get("path", "")
+
+
+class ServerTimingMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        with track_queries() as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", server_timing(stats, time.perf_counter() - started))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                elapsed = time.perf_counter() - started
+                logger.info(
+                    "%s %s %s %.1fms (%d queries, %.1fms db)",
+                    scope["method"],
+                    scope["path"],
+                    status,
+                    elapsed * 1000,
+                    stats.count,
+                    stats.seconds * 1000,
+                    extra=request_log_fields(scope, status, elapsed, stats),
+                )
+
+
+def request_log_fields(scope: Scope, status: int, elapsed: float, stats: QueryStats) -> Dict[str, Any]:
+    return {
+        "method": scope["method"],
+        "route": route_template(scope),
+        "path": scope["path"],
+        "status": status,
+        "duration_ms": round(elapsed * 1000, 2),
+        "db_queries": stats.count,
+        "db_ms": round(stats.seconds * 1000, 2),
+    }
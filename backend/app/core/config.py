@@ -7,12 +7,56 @@ from pydantic import BaseSettings
 class Settings(BaseSettings):
     project_name: str = "TingleRadar"
     database_url: str
+    # Override for the API's async engine; derived from database_url if unset.
+    async_database_url: Optional[str] = None
+    # Read replica for GET endpoints (same URL forms as database_url).
+    replica_database_url: Optional[str] = None
+    # Reads fall back to the primary for this long after a write, and while
+    # the replica's replay lag (probed every replica_lag_check_seconds) is
+    # above it.
+    replica_max_lag_seconds: float = 5.0
+    replica_lag_check_seconds: float = 2.0
+    # Per-engine pool limits (ignored for SQLite). Checkouts wait at most
+    # db_pool_timeout_seconds, and fail at once when db_pool_max_waiters
+    # callers are already queued for a saturated pool.
+    db_pool_size: int = 5
+    db_max_overflow: int = 5
+    db_pool_timeout_seconds: float = 5.0
+    db_pool_recycle_seconds: int = 1800
+    db_pool_max_waiters: Optional[int] = 50
+    # Postgres statement_timeout for every pooled connection; 0 disables.
+    db_statement_timeout_ms: int = 15000
+    # Statements at least this slow are logged with their EXPLAIN plan
+    # (GET /api/admin/slow-queries, and appended to slow_query_log_path if
+    # set). Off unless set; 500 is a sensible start.
+    slow_query_threshold_ms: Optional[float] = None
+    slow_query_buffer_size: int = 200
+    slow_query_log_path: Optional[str] = None
+    slow_query_explain: bool = True
+    # Required in the X-Admin-Token header by the /api/admin endpoints, which
+    # answer 404 while it is unset.
+    admin_token: Optional[str] = None
+    # Per-request sampling profiler (app.api.profiling), off unless
+    # profile_dir is set. Requests are profiled when signed with
+    # profile_secret (X-Profile header) or picked at profile_sample_rate.
+    profile_dir: Optional[str] = None
+    profile_secret: Optional[str] = None
+    profile_sample_rate: float = 0.0
+    profile_interval_ms: float = 5.0
     supabase_service_role_key: str
     youtube_api_key: Optional[str] = None
     youtube_client_id: Optional[str] = None
     youtube_client_secret: Optional[str] = None
     youtube_oauth_redirect: Optional[str] = None
     frontend_cors_origins: Optional[str] = None
+    # redis://host:port/db for a shared result cache; unset = per-process LRU.
+    result_cache_url: Optional[str] = None
+    result_cache_ttl_seconds: int = 300
+    result_cache_max_entries: int = 1024
+    # Fan LRU invalidations out to other workers through cache_versions
+    # (LISTEN/NOTIFY on Postgres, polling elsewhere).
+    cache_bus_enabled: bool = True
+    cache_bus_poll_seconds: float = 1.0
 
     class Config:
         env_file = Path(__file__).resolve().parents[2] / ".env"
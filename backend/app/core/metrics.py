@@ -0,0 +1,194 @@
+"""Prometheus metrics for the API and the ingestion jobs.
+
+`GET /metrics` renders them in the Prometheus text format. With several
+uvicorn workers, point `PROMETHEUS_MULTIPROC_DIR` at an empty directory
+shared by all of them (it must be set before the app starts, and cleared
+on each deploy). `prometheus_client` then keeps every metric in
+memory-mapped files there, and `/metrics` on any worker aggregates all of
+them. Without it, each process reports only its own numbers.
+
+Recording is an in-memory (or mmap) increment. Per-route children are
+resolved once and reused (`RouteMetrics`), so requests skip the label
+lookup.
+
+Ingestion jobs run elsewhere (GitHub Actions), so `track_job` pushes their
+metrics to a Pushgateway when `PROMETHEUS_PUSHGATEWAY_URL` is set.
+"""
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterator, NamedTuple, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    push_to_gateway,
+)
+from prometheus_client import multiprocess
+
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = "tingleradar"
+# Requests that matched no route share one label value.
+UNMATCHED_ROUTE = "<unmatched>"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = tuple(256 * 4**n for n in range(8))  # 256 B .. 4 MiB
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Time to respond, per route template.",
+    ["method", "route"],
+    namespace=NAMESPACE,
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS = Counter(
+    "http_requests",
+    "Responses sent, per route template and status.",
+    ["method", "route", "status"],
+    namespace=NAMESPACE,
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests being handled.",
+    namespace=NAMESPACE,
+    multiprocess_mode="livesum",
+)
+RESPONSE_BYTES = Histogram(
+    "http_response_size_bytes",
+    "Response body size as sent (after compression).",
+    ["method", "route"],
+    namespace=NAMESPACE,
+    buckets=SIZE_BUCKETS,
+)
+DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Time spent in SQL per request.",
+    ["method", "route"],
+    namespace=NAMESPACE,
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements per request.",
+    ["method", "route"],
+    namespace=NAMESPACE,
+    buckets=QUERY_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups",
+    "Cache lookups by outcome; hit ratio = hit / (hit + miss).",
+    ["cache", "result"],
+    namespace=NAMESPACE,
+)
+
+# Ingestion jobs push their own registry, without the API's metrics.
+ingestion_registry = CollectorRegistry()
+JOB_RUNS = Counter(
+    "ingestion_runs",
+    "Ingestion job runs by outcome.",
+    ["job", "outcome"],
+    namespace=NAMESPACE,
+    registry=ingestion_registry,
+)
+JOB_SECONDS = Histogram(
+    "ingestion_run_duration_seconds",
+    "Ingestion job run time.",
+    ["job"],
+    namespace=NAMESPACE,
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600),
+    registry=ingestion_registry,
+)
+JOB_LAST_SUCCESS = Gauge(
+    "ingestion_last_success_timestamp_seconds",
+    "Unix time the job last finished successfully.",
+    ["job"],
+    namespace=NAMESPACE,
+    registry=ingestion_registry,
+    multiprocess_mode="max",
+)
+JOB_ITEMS = Counter(
+    "ingestion_items",
+    "Items an ingestion job processed, by kind (videos, youtube_requests, ...).",
+    ["job", "kind"],
+    namespace=NAMESPACE,
+    registry=ingestion_registry,
+)
+
+
+@lru_cache(maxsize=None)
+def cache_lookup_counters(cache: str) -> Tuple[Counter, Counter]:
+    """(hit, miss) counters of `cache`."""
+    return CACHE_LOOKUPS.labels(cache, "hit"), CACHE_LOOKUPS.labels(cache, "miss")
+
+
+class RouteMetrics(NamedTuple):
+    seconds: Histogram
+    response_bytes: Histogram
+    db_seconds: Histogram
+    db_queries: Histogram
+
+
+_route_metrics: Dict[Tuple[str, str], RouteMetrics] = {}
+
+
+def route_metrics(method: str, route: str) -> RouteMetrics:
+    key = (method, route)
+    metrics = _route_metrics.get(key)
+    if metrics is None:
+        metrics = _route_metrics[key] = RouteMetrics(
+            REQUEST_SECONDS.labels(method, route),
+            RESPONSE_BYTES.labels(method, route),
+            DB_SECONDS.labels(method, route),
+            DB_QUERIES.labels(method, route),
+        )
+    return metrics
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """(body, content type) for a scrape of this process, or of all workers."""
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY) + generate_latest(ingestion_registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop a stopped worker's live gauges (in-flight) from the aggregate."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(pid)
+
+
+@contextmanager
+def track_job(job: str) -> Iterator[None]:
+    """Count, time and (optionally) push one run of an ingestion job."""
+    started = time.monotonic()
+    outcome = "failure"
+    try:
+        yield
+        outcome = "success"
+        JOB_LAST_SUCCESS.labels(job).set(time.time())
+    finally:
+        JOB_RUNS.labels(job, outcome).inc()
+        JOB_SECONDS.labels(job).observe(time.monotonic() - started)
+        gateway = os.environ.get("PROMETHEUS_PUSHGATEWAY_URL")
+        if gateway:
+            try:
+                push_to_gateway(gateway, job=job, registry=ingestion_registry)
+            except OSError as exc:
+                logger.warning("Pushing %s metrics to %s failed: %s", job, gateway, exc)
@@ -0,0 +1,161 @@
+"""Connection pool sizing, statement timeouts and checkout monitoring.
+
+Pooled (non-SQLite) engines get a `QueuePool` subclass that times every
+checkout into a `PoolMonitor`: how long callers waited for a connection, a
+latency histogram, timeouts, and the checked-out/overflow counts the pool
+itself reports. `GET /api/admin/pools` returns them.
+
+Waiting for a connection is bounded twice: by `pool_timeout` for each
+caller, and by `max_waiters`. Once the pool is at capacity and that many
+callers are already queued, further checkouts fail immediately with the
+same `sqlalchemy.exc.TimeoutError` a pool timeout raises; the API answers
+both with 503 instead of stacking requests behind a stalled database.
+"""
+
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Optional, Type
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import Settings
+
+
+# Upper bounds (seconds) of the checkout latency histogram.
+CHECKOUT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Monitors of the engines built by `pool_options`, by name.
+pool_monitors: Dict[str, "PoolMonitor"] = {}
+
+
+class PoolMonitor:
+    def __init__(self, name: str, *, max_waiters: Optional[int] = None) -> None:
+        self.name = name
+        self.max_waiters = max_waiters
+        self.pool: Optional[QueuePool] = None
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.max_waiting = 0
+        self.checkouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+        self.rejected = 0
+        # Bucket upper bound (None = above the last bound) -> checkouts.
+        self.histogram: Counter = Counter()
+
+    def enter(self, pool: QueuePool) -> None:
+        """Register a caller about to wait for `pool`, or refuse it."""
+        self.pool = pool
+        with self._lock:
+            saturated = self.max_waiters is not None and self.waiting >= self.max_waiters
+            if saturated and _at_capacity(pool):
+                self.rejected += 1
+                raise exc.TimeoutError(
+                    f"{self.name} pool exhausted: {self.waiting} callers already waiting "
+                    f"for a connection (limit {self.max_waiters})"
+                )
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+
+    def leave(self, seconds: float, *, timed_out: bool = False) -> None:
+        bucket = next((bound for bound in CHECKOUT_BUCKETS if seconds <= bound), None)
+        with self._lock:
+            self.waiting -= 1
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+            self.histogram[bucket] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        pool = self.pool
+        with self._lock:
+            return {
+                "pool_size": pool.size() if pool is not None else None,
+                "checked_out": pool.checkedout() if pool is not None else 0,
+                "overflow": max(pool.overflow(), 0) if pool is not None else 0,
+                "waiting": self.waiting,
+                "max_waiting": self.max_waiting,
+                "checkouts": self.checkouts,
+                "wait_seconds_total": round(self.wait_seconds, 6),
+                "wait_seconds_max": round(self.max_wait_seconds, 6),
+                "timeouts": self.timeouts,
+                "rejected": self.rejected,
+                "checkout_seconds_histogram": {
+                    ("+Inf" if bound is None else str(bound)): self.histogram[bound]
+                    for bound in (*CHECKOUT_BUCKETS, None)
+                },
+            }
+
+
+def _at_capacity(pool: QueuePool) -> bool:
+    # overflow() starts at -pool_size, so this is "every connection is out".
+    return pool.checkedout() >= pool.size() + max(pool._max_overflow, 0)
+
+
+class _MonitoredPool:
+    monitor: PoolMonitor
+
+    def _do_get(self) -> Any:
+        self.monitor.enter(self)
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.monitor.leave(time.perf_counter() - started, timed_out=True)
+            raise
+        except BaseException:
+            self.monitor.leave(time.perf_counter() - started)
+            raise
+        self.monitor.leave(time.perf_counter() - started)
+        return connection
+
+
+def monitored_pool_class(base: Type[QueuePool], monitor: PoolMonitor) -> Type[QueuePool]:
+    # A class attribute rather than a constructor argument: `Pool.recreate()`
+    # (engine.dispose()) rebuilds the pool from its class and known options.
+    return type(f"Monitored{base.__name__}", (_MonitoredPool, base), {"monitor": monitor})
+
+
+def pool_options(
+    url: str,
+    settings: Settings,
+    *,
+    name: str,
+    asyncio: bool = False,
+) -> Dict[str, Any]:
+    """`create_engine` pool arguments for `url`, registering a monitor as `name`.
+
+    SQLite keeps SQLAlchemy's default (per-thread / unpooled) pools.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    monitor = pool_monitors[name] = PoolMonitor(name, max_waiters=settings.db_pool_max_waiters)
+    base = AsyncAdaptedQueuePool if asyncio else QueuePool
+    return {
+        "poolclass": monitored_pool_class(base, monitor),
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+    }
+
+
+def install_statement_timeout(engine: Engine, timeout_ms: Optional[int]) -> None:
+    """Set Postgres' `statement_timeout` on every new connection of `engine`."""
+    if not timeout_ms or engine.dialect.name != "postgresql":
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_statement_timeout(dbapi_connection: Any, _record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"SET statement_timeout = {int(timeout_ms)}")
+        cursor.close()
+        # Committed, or the pool's reset-on-return rollback would undo it.
+        dbapi_connection.commit()
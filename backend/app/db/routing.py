@@ -0,0 +1,114 @@
+"""Routing of read-only requests between the primary and a read replica.
+
+GET endpoints take their session from `ReplicaRouter.read_sessionmaker`;
+writes, and reads that must see them (the score `record_tag_vote` returns),
+always use the primary. The replica is skipped, and reads go to the
+primary, while:
+
+- a write happened less than `max_lag_seconds` ago (`note_write`). Writes in
+  this process call it directly; writes elsewhere arrive through the cache
+  invalidation bus. This also keeps pages cached right after an
+  invalidation from being computed off a replica that has not replayed the
+  write yet.
+- the replica's measured replay lag is above `max_lag_seconds`, or it cannot
+  be measured. The lag is probed at most every `check_interval` seconds.
+"""
+
+import logging
+import time
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+
+logger = logging.getLogger(__name__)
+
+# Session.info key marking replica sessions; opportunistic write-backs (the
+# computed_tags backfill) are skipped on them.
+READ_ONLY = "read_only"
+
+# 0 when the replica has replayed everything it received (an idle standby's
+# last replay timestamp keeps aging without it being behind).
+REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+async def measure_replica_lag(db: AsyncSession) -> float:
+    """Replay lag of the database behind `db`, in seconds."""
+    if db.bind.dialect.name != "postgresql":
+        return 0.0
+    return float((await db.execute(REPLICA_LAG_SQL)).scalar())
+
+
+class ReplicaRouter:
+    def __init__(
+        self,
+        primary: sessionmaker,
+        replica: Optional[sessionmaker] = None,
+        *,
+        max_lag_seconds: float = 5.0,
+        check_interval: float = 2.0,
+        probe: Callable[[AsyncSession], Awaitable[float]] = measure_replica_lag,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.primary = primary
+        self.replica = replica
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self._probe = probe
+        self._clock = clock
+        self._primary_until = float("-inf")
+        self._checked_at = float("-inf")
+        self._lag: Optional[float] = None
+        self._routes: Counter = Counter()
+
+    def note_write(self, *_: Any) -> None:
+        """Send reads to the primary until replicas have caught up."""
+        self._primary_until = self._clock() + self.max_lag_seconds
+
+    async def read_sessionmaker(self) -> sessionmaker:
+        if self.replica is None:
+            return self.primary
+        now = self._clock()
+        if now < self._primary_until:
+            return self._route("primary_recent_write")
+        if now - self._checked_at >= self.check_interval:
+            # Claimed before awaiting, so concurrent requests keep using the
+            # last measurement instead of probing too.
+            self._checked_at = now
+            self._lag = await self._measure()
+        if self._lag is None:
+            return self._route("primary_replica_unavailable")
+        if self._lag > self.max_lag_seconds:
+            return self._route("primary_replica_lagging")
+        return self._route("replica")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "replica_configured": self.replica is not None,
+            "replica_lag_seconds": self._lag,
+            "max_lag_seconds": self.max_lag_seconds,
+            "reads": dict(sorted(self._routes.items())),
+        }
+
+    async def _measure(self) -> Optional[float]:
+        try:
+            async with self.replica() as db:
+                return await self._probe(db)
+        except Exception as exc:  # noqa: BLE001 - any failure means "do not use it"
+            logger.warning("Replica lag probe failed, reading from the primary: %s", exc)
+            return None
+
+    def _route(self, route: str) -> sessionmaker:
+        self._routes[route] += 1
+        return self.replica if route == "replica" else self.primary
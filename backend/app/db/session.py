@@ -1,14 +1,99 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import Settings
+from app.db.pool import install_statement_timeout, pool_options
+from app.db.routing import READ_ONLY, ReplicaRouter
+from app.db.slow_queries import SlowQueryLog, install_slow_query_log
+
+
+# Async driver for each sync backend DATABASE_URL may name.
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """`url` with its driver swapped for the asyncio one (pg8000 -> asyncpg)."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    driver = ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        raise ValueError(f"No async driver configured for {backend!r} URLs")
+    return str(parsed.set(drivername=f"{backend}+{driver}"))
 
 
 settings = Settings()
 
+slow_query_log = None
+if settings.slow_query_threshold_ms is not None:
+    slow_query_log = SlowQueryLog(
+        settings.slow_query_threshold_ms,
+        capacity=settings.slow_query_buffer_size,
+        sink_path=settings.slow_query_log_path,
+        explain=settings.slow_query_explain,
+    )
+
 engine = create_engine(
     settings.database_url,
     future=True,
     pool_pre_ping=True,
+    **pool_options(settings.database_url, settings, name="primary"),
 )
+install_statement_timeout(engine, settings.db_statement_timeout_ms)
+install_slow_query_log(engine, slow_query_log, name="primary")
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+# The API's request path. Scripts and the youtube endpoints, which block on
+# HTTP anyway, stay on the sync engine above.
+_async_url = settings.async_database_url or async_database_url(settings.database_url)
+async_engine = create_async_engine(
+    _async_url,
+    pool_pre_ping=True,
+    **pool_options(_async_url, settings, name="primary_async", asyncio=True),
+)
+install_statement_timeout(async_engine.sync_engine, settings.db_statement_timeout_ms)
+# EXPLAINs run on the sync engine; both drivers share a paramstyle.
+install_slow_query_log(async_engine.sync_engine, slow_query_log, name="primary_async", explain_engine=engine)
+AsyncSessionLocal = sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    # Services return plain dicts, but nothing should lazily reload after commit.
+    expire_on_commit=False,
+)
+
+# Optional read replica for GET endpoints; see `app.db.routing`.
+AsyncReplicaSessionLocal = None
+if settings.replica_database_url:
+    _replica_url = async_database_url(settings.replica_database_url)
+    async_replica_engine = create_async_engine(
+        _replica_url,
+        pool_pre_ping=True,
+        **pool_options(_replica_url, settings, name="replica_async", asyncio=True),
+    )
+    install_statement_timeout(async_replica_engine.sync_engine, settings.db_statement_timeout_ms)
+    # Plans come from the primary, which has the same schema and indexes.
+    install_slow_query_log(
+        async_replica_engine.sync_engine,
+        slow_query_log,
+        name="replica_async",
+        explain_engine=engine,
+    )
+    AsyncReplicaSessionLocal = sessionmaker(
+        bind=async_replica_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+        info={READ_ONLY: True},
+    )
+
+db_router = ReplicaRouter(
+    AsyncSessionLocal,
+    AsyncReplicaSessionLocal,
+    max_lag_seconds=settings.replica_max_lag_seconds,
+    check_interval=settings.replica_lag_check_seconds,
+)
@@ -0,0 +1,255 @@
+"""Slow-statement log with EXPLAIN plans.
+
+`install_slow_query_log(engine, log)` times every statement `engine`
+executes. One that takes at least `threshold_ms` is recorded with:
+
+- the SQL as sent to the driver, and its parameters with every string,
+  bytes or other non-numeric value replaced by its type (`"<str>"`), so
+  fingerprints and search text never reach the log;
+- the caller: the innermost frame in our own code (`app/services/videos.py:312
+  in browse_videos`);
+- the plan from `EXPLAIN` (Postgres) or `EXPLAIN QUERY PLAN` (SQLite), and
+  the tables it reads with a full scan (`Seq Scan on videos` / `SCAN videos`).
+
+The request thread only copies the statement into a bounded queue. A
+background thread runs the EXPLAIN on `explain_engine`, a sync engine on
+the same database (async engines cannot be driven from a plain thread),
+then appends the entry to a ring buffer of the last `capacity` entries and,
+if `sink_path` is set, to that JSONL file. When the queue is full, entries
+are dropped and counted rather than making requests wait.
+
+`GET /api/admin/slow-queries` returns the buffer.
+"""
+
+import json
+import logging
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+import greenlet
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+logger = logging.getLogger(__name__)
+
+# Frames under this directory (backend/) count as our code for caller lookup.
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_THIS_FILE = os.path.abspath(__file__)
+
+# Only statements EXPLAIN accepts; never SET, BEGIN, DDL or EXPLAIN itself.
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH|INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+_FULL_SCAN_PATTERNS = (
+    re.compile(r"Seq Scan on (\w+)"),  # Postgres
+    re.compile(r"^SCAN (?:TABLE )?(\w+)$", re.MULTILINE),  # SQLite, without an index
+)
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """`parameters` with only numbers, booleans and NULLs left readable."""
+    if isinstance(parameters, dict):
+        return {key: redact_parameters(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_parameters(value) for value in parameters]
+    if parameters is None or isinstance(parameters, (bool, int, float)):
+        return parameters
+    return f"<{type(parameters).__name__}>"
+
+
+def full_scans(plan: str) -> List[str]:
+    """Tables `plan` reads with a sequential (full) scan, in plan order."""
+    tables: List[str] = []
+    for pattern in _FULL_SCAN_PATTERNS:
+        for table in pattern.findall(plan):
+            if table not in tables:
+                tables.append(table)
+    return tables
+
+
+def caller_location() -> Optional[str]:
+    """`path:line in function` of the innermost frame in our own code."""
+    frame = sys._getframe(1)
+    # Async engines execute inside a greenlet whose stack ends at SQLAlchemy's
+    # `greenlet_spawn`; the awaiting coroutine is on the parent's stack.
+    current = greenlet.getcurrent()
+    while True:
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if filename.startswith(_PROJECT_ROOT) and filename != _THIS_FILE:
+                path = os.path.relpath(filename, _PROJECT_ROOT)
+                return f"{path}:{frame.f_lineno} in {frame.f_code.co_name}"
+            frame = frame.f_back
+        current = current.parent
+        if current is None:
+            return None
+        frame = current.gr_frame
+
+
+class SlowQueryLog:
+    def __init__(
+        self,
+        threshold_ms: float,
+        *,
+        capacity: int = 200,
+        sink_path: Optional[str] = None,
+        explain: bool = True,
+        queue_size: int = 100,
+    ) -> None:
+        self.threshold = threshold_ms / 1000
+        self.sink_path = sink_path
+        self.explain = explain
+        self._entries: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.recorded = 0
+        self.dropped = 0
+
+    def observe(
+        self,
+        statement: str,
+        parameters: Any,
+        seconds: float,
+        *,
+        engine_name: str,
+        explain_engine: Optional[Engine],
+    ) -> None:
+        """Queue a statement that took `seconds` if it is over the threshold."""
+        # Our own EXPLAINs run on a logged engine too.
+        if seconds < self.threshold or statement.startswith("EXPLAIN "):
+            return
+        entry = {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "engine": engine_name,
+            "duration_ms": round(seconds * 1000, 3),
+            "statement": statement,
+            "parameters": redact_parameters(parameters),
+            "caller": caller_location(),
+            "plan": None,
+            "full_scans": [],
+        }
+        try:
+            # The raw parameters stay in memory, only for the EXPLAIN.
+            self._queue.put_nowait((entry, parameters, explain_engine))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return
+        self._ensure_worker()
+
+    def entries(self, *, full_scan_on: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Recorded entries, newest first; optionally only full scans of a table."""
+        with self._lock:
+            entries = list(self._entries)
+        if full_scan_on is not None:
+            entries = [entry for entry in entries if full_scan_on in entry["full_scans"]]
+        return entries[::-1]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "threshold_ms": self.threshold * 1000,
+                "capacity": self._entries.maxlen,
+                "recorded": self.recorded,
+                "dropped": self.dropped,
+                "pending": self._queue.qsize(),
+            }
+
+    def drain(self) -> None:
+        """Block until every queued entry is recorded (for tests and shutdown)."""
+        self._queue.join()
+
+    def _ensure_worker(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="slow-query-explain", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            entry, parameters, explain_engine = self._queue.get()
+            try:
+                if self.explain and explain_engine is not None:
+                    self._explain(entry, parameters, explain_engine)
+                self._record(entry)
+            except Exception:  # pragma: no cover - never let the worker die
+                logger.exception("Recording a slow query failed")
+            finally:
+                self._queue.task_done()
+
+    def _explain(self, entry: Dict[str, Any], parameters: Any, engine: Engine) -> None:
+        statement = entry["statement"]
+        if not _EXPLAINABLE.match(statement):
+            return
+        prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+        if isinstance(parameters, list):
+            # executemany: one parameter set is enough for the plan.
+            parameters = parameters[0] if parameters else ()
+        try:
+            with engine.connect() as conn:
+                rows = conn.exec_driver_sql(prefix + statement, parameters).fetchall()
+        except Exception as exc:
+            entry["plan_error"] = str(exc)
+            return
+        # Postgres returns one "QUERY PLAN" column; SQLite's detail is the last.
+        plan = "\n".join(str(row[-1]) for row in rows)
+        entry["plan"] = plan
+        entry["full_scans"] = full_scans(plan)
+
+    def _record(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries.append(entry)
+            self.recorded += 1
+        if entry["full_scans"]:
+            logger.warning(
+                "Slow query (%.1fms) from %s scans %s",
+                entry["duration_ms"],
+                entry["caller"],
+                ", ".join(entry["full_scans"]),
+            )
+        if self.sink_path:
+            with open(self.sink_path, "a", encoding="utf-8") as sink:
+                sink.write(json.dumps(entry, default=str) + "\n")
+
+
+def install_slow_query_log(
+    engine: Engine,
+    log: Optional[SlowQueryLog],
+    *,
+    name: str,
+    explain_engine: Optional[Engine] = None,
+) -> None:
+    """Time `engine`'s statements into `log` (for async engines, pass `.sync_engine`).
+
+    `explain_engine` defaults to `engine` itself, which must then be sync.
+    """
+    if log is None:
+        return
+    explain_engine = explain_engine or engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is not None:
+            context._slow_query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def check_duration(conn, cursor, statement, parameters, context, executemany) -> None:
+        started = getattr(context, "_slow_query_started", None)
+        if started is None:
+            return
+        log.observe(
+            statement,
+            parameters,
+            time.perf_counter() - started,
+            engine_name=name,
+            explain_engine=explain_engine,
+        )
@@ -1,8 +1,19 @@
-from fastapi import FastAPI
+import os
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 
+from app.api.compression import CompressionMiddleware
+from app.api.metrics import MetricsMiddleware
+from app.api.profiling import ProfilingMiddleware
+from app.api.timing import ServerTimingMiddleware
 from app.api.router import api_router
 from app.core.config import Settings
+from app.core.metrics import mark_process_dead, render_metrics
+from app.db.session import db_router
+from app.services.result_cache import get_result_cache
 
 
 settings = Settings()
@@ -33,11 +44,57 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
+if settings.profile_dir:
+    app.add_middleware(
+        ProfilingMiddleware,
+        directory=settings.profile_dir,
+        secret=settings.profile_secret,
+        sample_rate=settings.profile_sample_rate,
+        interval_ms=settings.profile_interval_ms,
+    )
+# Outermost, so its app timing covers compression too.
+app.add_middleware(ServerTimingMiddleware)
 
 app.include_router(api_router, prefix="/api")
 
 
+@app.exception_handler(PoolTimeoutError)
+async def database_busy(request: Request, exc: PoolTimeoutError) -> JSONResponse:
+    # No connection within db_pool_timeout_seconds, or too many waiters
+    # already (see app.db.pool): shed the request rather than queue it.
+    return JSONResponse(
+        {"detail": "Database busy, try again shortly"},
+        status_code=503,
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.on_event("startup")
+def start_cache_invalidation_listener() -> None:
+    # Applies invalidations made by other workers and the ingestion jobs.
+    bus = get_result_cache().bus
+    if bus is not None:
+        # Writes made elsewhere also move reads back to the primary for a while.
+        bus.subscribe(db_router.note_write)
+        bus.start()
+
+
+@app.on_event("shutdown")
+def stop_cache_invalidation_listener() -> None:
+    bus = get_result_cache().bus
+    if bus is not None:
+        bus.stop()
+    mark_process_dead(os.getpid())
+
+
 @app.get("/healthz")
 def healthcheck() -> dict:
     return {"status": "ok"}
 
+
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    body, content_type = render_metrics()
+    return Response(body, media_type=content_type)
@@ -1,16 +1,21 @@
-from .ranking import RankingItem, RankingList, UserTag
+from .ranking import RankingArchive, RankingItem, RankingList, UserTag
 from .video import Video
 from .youtube import YouTubeCredential, YouTubePlaylist
 from .creator import CreatorWatchlist
 from .tag_vote import VideoTagVote
+from .video_stats import VideoStatsHistory
+from .cache_version import CacheVersion
 
 __all__ = [
     "Video",
     "RankingList",
     "RankingItem",
+    "RankingArchive",
     "UserTag",
     "YouTubeCredential",
     "YouTubePlaylist",
     "CreatorWatchlist",
     "VideoTagVote",
+    "VideoStatsHistory",
+    "CacheVersion",
 ]
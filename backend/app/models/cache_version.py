@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, String
+
+from app.db.base import Base
+
+
+class CacheVersion(Base):
+    """Shared version counter of one result-cache invalidation tag.
+
+    Every bump takes a new `seq`, so workers that cannot LISTEN (SQLite) can
+    poll for rows changed since the last `seq` they saw. On Postgres the
+    `bump_cache_versions` function also NOTIFYs listeners. See
+    `app.services.invalidation`.
+    """
+
+    __tablename__ = "cache_versions"
+
+    tag = Column(String(255), primary_key=True)
+    version = Column(BigInteger, nullable=False)
+    seq = Column(BigInteger, nullable=False, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
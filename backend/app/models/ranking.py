@@ -1,5 +1,16 @@
 from datetime import datetime
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    JSON,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+)
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -7,26 +18,65 @@ from app.db.base import Base
 
 class RankingList(Base):
     __tablename__ = "ranking_lists"
+    __table_args__ = (
+        Index("ix_ranking_lists_board_name", "board", "name"),
+        Index("ix_ranking_lists_board_label_date", "board", "label_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(128), nullable=False)
+    # "main" or a tag sub-board (see app.services.boards); sub-boards reuse the
+    # main list's name.
+    board = Column(String(64), nullable=False, default="main", server_default="main")
     description = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Week the list is labelled with (the "YYYY-MM-DD" name suffix); set by a
+    # Postgres trigger on insert.
+    label_date = Column(Date, nullable=True)
     ranking_items = relationship("RankingItem", back_populates="ranking_list")
+    archive = relationship("RankingArchive", uselist=False, back_populates="ranking_list")
 
 
 class RankingItem(Base):
     __tablename__ = "ranking_items"
+    __table_args__ = (
+        Index("ix_ranking_items_list_position", "ranking_list_id", "position"),
+        Index("ix_ranking_items_video_list", "video_id", "ranking_list_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     ranking_list_id = Column(Integer, ForeignKey("ranking_lists.id"), nullable=False)
     video_id = Column(String(64), ForeignKey("videos.youtube_id"), nullable=False)
     position = Column(Integer, nullable=False)
     score = Column(Integer, nullable=True)
+    # Per-signal share of `score` (same x10000 scale), written by fetch_rankings.
+    score_components = Column(JSON, nullable=True)
 
     ranking_list = relationship("RankingList", back_populates="ranking_items")
 
 
+class RankingArchive(Base):
+    """Compacted items of an old ranking list.
+
+    `app.services.ranking_archive` packs a list's items into one compressed
+    blob and deletes the `ranking_items` rows; readers decode it on demand.
+    """
+
+    __tablename__ = "ranking_archives"
+
+    ranking_list_id = Column(
+        Integer,
+        ForeignKey("ranking_lists.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    codec = Column(String(32), nullable=False)
+    item_count = Column(Integer, nullable=False)
+    payload = Column(LargeBinary, nullable=False)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    ranking_list = relationship("RankingList", back_populates="archive")
+
+
 class UserTag(Base):
     __tablename__ = "user_tags"
 
@@ -11,6 +11,8 @@ from sqlalchemy import (
     Text,
 )
 
+from sqlalchemy.orm import deferred
+
 from app.db.base import Base
 
 
@@ -19,7 +21,9 @@ class Video(Base):
 
     youtube_id = Column(String(64), primary_key=True, index=True)
     title = Column(String(512), nullable=False)
-    description = Column(Text, nullable=True)
+    # Unbounded and only shown on the detail view, so ORM loads skip it unless
+    # undeferred; list endpoints select columns explicitly (see services.videos).
+    description = deferred(Column(Text, nullable=True))
     channel_title = Column(String(256), nullable=False)
     channel_id = Column(String(64), nullable=False)
     published_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -30,3 +34,5 @@ class Video(Base):
     computed_tags = Column(JSON, nullable=True)
     thumbnail_url = Column(String(1024), nullable=True)
     is_active = Column(Boolean, default=True, nullable=False)
+    # Last time view/like counts were re-polled by scripts/refresh_video_stats.py.
+    stats_refreshed_at = Column(DateTime, nullable=True, index=True)
@@ -0,0 +1,24 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, String
+
+from app.db.base import Base
+
+
+class VideoStatsHistory(Base):
+    """Append-only view/like observations for growth and velocity signals.
+
+    Kept deliberately narrow: the (video_id, observed_at) primary key doubles
+    as the only index, there is no surrogate id, and observations are
+    truncated to the hour. `app.services.video_stats.downsample_history`
+    thins old points so the table does not grow without bound.
+    """
+
+    __tablename__ = "video_stats_history"
+
+    video_id = Column(
+        String(64),
+        ForeignKey("videos.youtube_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    observed_at = Column(DateTime, primary_key=True)
+    view_count = Column(BigInteger, nullable=False)
+    like_count = Column(Integer, nullable=False)
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -9,11 +9,35 @@ class RankingItem(BaseModel):
     rank: int
     video: VideoBase
     score: int
+    score_components: Optional[Dict[str, int]] = None
 
 
 class RankingList(BaseModel):
     id: int
     name: str
+    board: str = "main"
     description: str
     published_at: str
     items: List[RankingItem]
+
+
+class RankTrack(BaseModel):
+    video_id: str
+    # Delta-encoded, see app.services.rank_history.
+    ranks: List[Optional[int]]
+
+
+class RankingHistory(BaseModel):
+    board: str
+    # First week label; each following label is `week_gaps[i]` days later.
+    start: Optional[str]
+    week_gaps: List[int]
+    videos: List[RankTrack]
+
+
+class VideoRankHistory(BaseModel):
+    video_id: str
+    board: str
+    start: Optional[str]
+    week_gaps: List[int]
+    ranks: List[Optional[int]]
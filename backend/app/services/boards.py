@@ -0,0 +1,30 @@
+"""Weekly sub-boards.
+
+Besides the main board, each weekly ingestion run publishes one board per tag
+in `TAG_FAMILIES` ("top whisper", "top tapping", "top Japanese", ...). They are
+derived from the candidates already fetched for the main board and share its
+list name (and so its week label); `ranking_lists.board` tells them apart.
+"""
+
+from typing import Dict, List, Optional
+
+from app.services.tagging import TAG_FAMILIES
+
+
+MAIN_BOARD = "main"
+
+BOARD_FAMILY: Dict[str, str] = {
+    tag: family for family, tags in TAG_FAMILIES.items() for tag in tags
+}
+
+
+def sub_boards() -> List[str]:
+    return list(BOARD_FAMILY)
+
+
+def is_known_board(board: str) -> bool:
+    return board == MAIN_BOARD or board in BOARD_FAMILY
+
+
+def board_family(board: str) -> Optional[str]:
+    return BOARD_FAMILY.get(board)
@@ -1,11 +1,14 @@
 from typing import List, Tuple
 
 from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models import Video as VideoModel
+from app.services.single_flight import coalesced
 
 
+@coalesced("list_top_channels")
 def list_top_channels(db: Session, limit: int = 30) -> List[Tuple[str, str, int]]:
     """Return the most frequent channels in the videos catalog.
 
@@ -26,3 +29,9 @@ def list_top_channels(db: Session, limit: int = 30) -> List[Tuple[str, str, int]
     )
 
     return [(r.channel_id, r.channel_title, int(r.video_count)) for r in rows]
+
+
+@coalesced("list_top_channels")
+async def list_top_channels_async(db: AsyncSession, limit: int = 30) -> List[Tuple[str, str, int]]:
+    # __wrapped__: already coalesced here, on the event loop.
+    return await db.run_sync(list_top_channels.__wrapped__, limit)
@@ -0,0 +1,240 @@
+"""Cross-process invalidation bus for the per-process result caches.
+
+Each API worker keeps its own `LRUBackend`, so a vote handled by one worker
+used to leave every other worker serving the old page until the TTL ran
+out. With the bus, every invalidation bumps shared counters in
+`cache_versions` (`bump_versions`). The bus then fans the new versions out
+to every process that runs `InvalidationBus.start()`:
+
+- Postgres: `bump_cache_versions()` NOTIFYs `cache_invalidation` on commit.
+  A listener thread per worker holds one LISTEN connection and applies each
+  payload as it arrives. It also re-polls every `resync_interval` seconds
+  and after reconnecting, so nothing sent while it was disconnected is lost.
+- Anything else (SQLite in tests and local runs): the listener polls
+  `cache_versions` for rows with a `seq` above the last one it saw, every
+  `poll_interval` seconds.
+
+Subscribers get {tag: version} dicts. Versions only ever grow, and the bus
+only passes on versions newer than any it delivered before, so overlapping
+sources (our own notification echo, a poll after a notify) reach
+subscribers once.
+"""
+
+import json
+import logging
+import select
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import create_engine, func, select as sql_select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import Settings
+from app.models import CacheVersion
+
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "cache_invalidation"
+# Sequence values are taken before commit, so a bump can become visible after
+# a higher one; every poll re-reads this many sequence values behind its
+# cursor to pick such stragglers up.
+POLL_OVERLAP = 100
+
+
+def bump_versions(connection: Connection, tags: Iterable[str]) -> Dict[str, int]:
+    """Increment each tag's shared version; returns {tag: new_version}.
+
+    Runs in the caller's transaction. On Postgres the NOTIFY goes out when
+    it commits.
+    """
+    tags = sorted(set(tags))
+    if not tags:
+        return {}
+    if connection.dialect.name == "postgresql":
+        versions = connection.execute(
+            text("SELECT bump_cache_versions(CAST(:tags AS text[]))"), {"tags": tags}
+        ).scalar()
+        if isinstance(versions, str):
+            versions = json.loads(versions)
+        return {tag: int(version) for tag, version in versions.items()}
+
+    table = CacheVersion.__table__
+    seq = connection.execute(sql_select(func.coalesce(func.max(table.c.seq), 0))).scalar()
+    current = dict(
+        connection.execute(
+            sql_select(table.c.tag, table.c.version).where(table.c.tag.in_(tags))
+        ).all()
+    )
+    versions = {}
+    for tag in tags:
+        seq += 1
+        versions[tag] = current.get(tag, 0) + 1
+        if tag in current:
+            connection.execute(
+                table.update()
+                .where(table.c.tag == tag)
+                .values(version=versions[tag], seq=seq, updated_at=func.now())
+            )
+        else:
+            connection.execute(
+                table.insert().values(tag=tag, version=versions[tag], seq=seq, updated_at=func.now())
+            )
+    return versions
+
+
+class InvalidationBus:
+    def __init__(
+        self,
+        engine: Engine,
+        *,
+        channel: str = NOTIFY_CHANNEL,
+        poll_interval: float = 1.0,
+        resync_interval: float = 30.0,
+    ) -> None:
+        self.engine = engine
+        self.channel = channel
+        self.poll_interval = poll_interval
+        self.resync_interval = resync_interval
+        self._subscribers: List[Callable[[Dict[str, int]], None]] = []
+        self._cursor: Optional[int] = None
+        self._delivered: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def listens(self) -> bool:
+        return self.engine.dialect.name == "postgresql"
+
+    def subscribe(self, callback: Callable[[Dict[str, int]], None]) -> None:
+        self._subscribers.append(callback)
+
+    def publish(self, tags: Iterable[str]) -> Dict[str, int]:
+        """Bump `tags` for every process; applied locally right away."""
+        with self.engine.begin() as connection:
+            versions = bump_versions(connection, tags)
+        self._deliver(versions)
+        return versions
+
+    def poll(self) -> Dict[str, int]:
+        """Apply versions bumped since the last poll; returns the new ones."""
+        table = CacheVersion.__table__
+        with self.engine.connect() as connection:
+            if self._cursor is None:
+                # Nothing cached yet predates this process; start from now.
+                self._cursor = connection.execute(
+                    sql_select(func.coalesce(func.max(table.c.seq), 0))
+                ).scalar()
+                return {}
+            rows = connection.execute(
+                sql_select(table.c.tag, table.c.version, table.c.seq).where(
+                    table.c.seq > self._cursor - POLL_OVERLAP
+                )
+            ).all()
+        if not rows:
+            return {}
+        self._cursor = max(self._cursor, max(row.seq for row in rows))
+        return self._deliver({row.tag: int(row.version) for row in rows})
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="cache-invalidation-listener", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _deliver(self, versions: Dict[str, int]) -> Dict[str, int]:
+        with self._lock:
+            fresh = {
+                tag: version
+                for tag, version in versions.items()
+                if version > self._delivered.get(tag, 0)
+            }
+            self._delivered.update(fresh)
+        if not fresh:
+            return fresh
+        for callback in list(self._subscribers):
+            try:
+                callback(fresh)
+            except Exception:  # noqa: BLE001 - one bad subscriber must not stop the rest
+                logger.exception("Cache invalidation subscriber failed")
+        return fresh
+
+    def _run(self) -> None:
+        backoff = self.poll_interval
+        while not self._stopped.is_set():
+            try:
+                if self.listens:
+                    self._listen()
+                else:
+                    self.poll()
+                    self._stopped.wait(self.poll_interval)
+                backoff = self.poll_interval
+            except Exception as exc:  # noqa: BLE001 - keep the listener alive
+                logger.warning("Cache invalidation listener failed, retrying: %s", exc)
+                self._stopped.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def _listen(self) -> None:
+        raw = self.engine.raw_connection()
+        # LISTEN needs autocommit; keep this connection out of the pool.
+        raw.detach()
+        try:
+            dbapi = raw.connection
+            dbapi.autocommit = True
+            cursor = dbapi.cursor()
+            cursor.execute(f"LISTEN {self.channel}")
+            # Catch up on whatever was bumped while we were not listening.
+            self.poll()
+            last_resync = time.monotonic()
+            while not self._stopped.is_set():
+                # Wake at least once a second so stop() is noticed.
+                readable, _, _ = select.select([_socket(dbapi)], [], [], 1.0)
+                if readable:
+                    for payload in _drain_notifications(dbapi, cursor, self.channel):
+                        self._deliver({tag: int(v) for tag, v in json.loads(payload).items()})
+                if time.monotonic() - last_resync >= self.resync_interval:
+                    self.poll()
+                    last_resync = time.monotonic()
+        finally:
+            raw.close()
+
+
+def _socket(dbapi: Any) -> Any:
+    # psycopg2 connections are selectable themselves; pg8000 keeps its socket
+    # on `_usock`.
+    return getattr(dbapi, "_usock", dbapi)
+
+
+def _drain_notifications(dbapi: Any, cursor: Any, channel: str) -> List[str]:
+    if hasattr(dbapi, "notifies"):  # psycopg2
+        dbapi.poll()
+        payloads = [note.payload for note in dbapi.notifies if note.channel == channel]
+        dbapi.notifies.clear()
+        return payloads
+    # pg8000 only reads NotificationResponse messages while running a query.
+    cursor.execute("SELECT 1")
+    cursor.fetchall()
+    payloads = [note[2] for note in dbapi.notifications if note[1] == channel]
+    dbapi.notifications.clear()
+    return payloads
+
+
+@lru_cache()
+def get_invalidation_bus() -> InvalidationBus:
+    settings = Settings()
+    # A small engine of its own: the listener pins one connection for good and
+    # scripts use the bus without importing the API's session module.
+    engine = create_engine(settings.database_url, future=True, pool_pre_ping=True)
+    return InvalidationBus(engine, poll_interval=settings.cache_bus_poll_seconds)
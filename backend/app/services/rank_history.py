@@ -0,0 +1,220 @@
+"""Week-over-week rank history for boards and single videos.
+
+Responses are delta-encoded to keep long trends small: week labels are sent
+as a start date plus the gap in days to each following week, and a rank
+series is sent as the first rank followed by the change from the previous
+rank (`rank - previous_rank`, so negative means the video climbed). `None`
+marks a week the video was not on the board; the next rank after a gap is
+relative to the last week it was present.
+
+Weeks compacted by `app.services.ranking_archive` are decoded and merged in,
+so callers cannot tell hot and archived weeks apart.
+"""
+
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, exists, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import CTE, ColumnElement
+
+from app.models import RankingArchive as RankingArchiveModel
+from app.models import RankingItem as RankingItemModel
+from app.models import RankingList as RankingListModel
+from app.schemas.ranking import RankingHistory, RankTrack, VideoRankHistory
+from app.services.ranking_archive import load_archived_items
+
+
+def delta_encode(values: Sequence[Optional[int]]) -> List[Optional[int]]:
+    encoded: List[Optional[int]] = []
+    previous: Optional[int] = None
+    for value in values:
+        if value is None:
+            encoded.append(None)
+            continue
+        encoded.append(value if previous is None else value - previous)
+        previous = value
+    return encoded
+
+
+def delta_decode(values: Sequence[Optional[int]]) -> List[Optional[int]]:
+    decoded: List[Optional[int]] = []
+    previous: Optional[int] = None
+    for value in values:
+        if value is None:
+            decoded.append(None)
+            continue
+        previous = value if previous is None else previous + value
+        decoded.append(previous)
+    return decoded
+
+
+def _week_gaps(labels: Sequence[date]) -> List[int]:
+    return [(current - prior).days for prior, current in zip(labels, labels[1:])]
+
+
+def recent_weeks(db: Session, *, board: str, weeks: int) -> CTE:
+    """CTE of (list_id, label_date) for the last `weeks` labelled weeks.
+
+    When a week was written more than once, the newest list wins. Lists
+    with neither items nor an archive (an aborted write) are skipped.
+    """
+    return (
+        db.query(
+            func.max(RankingListModel.id).label("list_id"),
+            RankingListModel.label_date.label("label_date"),
+        )
+        .filter(
+            RankingListModel.board == board,
+            RankingListModel.label_date.isnot(None),
+            or_(RankingListModel.ranking_items.any(), RankingListModel.archive.has()),
+        )
+        .group_by(RankingListModel.label_date)
+        .order_by(RankingListModel.label_date.desc())
+        .limit(weeks)
+        .cte("recent_weeks")
+    )
+
+
+def _week_positions(
+    db: Session, weeks: CTE, items_filter: ColumnElement
+) -> Tuple[List[Tuple[int, date]], List[int], List[Tuple[int, str, int]]]:
+    """Run the one history query: every week of `weeks`, outer-joined to its
+    hot items matching `items_filter`.
+
+    Returns the weeks oldest first, the ids of archived weeks, and the
+    matching (list_id, video_id, position) rows.
+    """
+    archived = exists().where(RankingArchiveModel.ranking_list_id == weeks.c.list_id)
+    rows = (
+        db.query(
+            weeks.c.list_id,
+            weeks.c.label_date,
+            archived.label("archived"),
+            RankingItemModel.video_id,
+            RankingItemModel.position,
+        )
+        .select_from(weeks)
+        .outerjoin(
+            RankingItemModel,
+            and_(RankingItemModel.ranking_list_id == weeks.c.list_id, items_filter),
+        )
+        .all()
+    )
+    labels = {list_id: label for list_id, label, _, _, _ in rows}
+    week_rows = sorted(labels.items(), key=lambda week: week[1])
+    archived_ids = sorted({list_id for list_id, _, is_archived, _, _ in rows if is_archived})
+    items = [
+        (list_id, video_id, position)
+        for list_id, _, _, video_id, position in rows
+        if video_id is not None
+    ]
+    return week_rows, archived_ids, items
+
+
+def fetch_ranking_history(
+    db: Session,
+    *,
+    board: str,
+    weeks: int,
+    limit: int,
+) -> Optional[RankingHistory]:
+    """Rank trend of the top `limit` videos of the latest week, over `weeks` weeks.
+
+    The week selection, the latest week's top videos and their positions in
+    every week come from one query (the week list is a CTE). Archived weeks
+    cost one more query, only when the window reaches them.
+    """
+    recent = recent_weeks(db, board=board, weeks=weeks)
+    newest_list = (
+        select(recent.c.list_id).order_by(recent.c.label_date.desc()).limit(1).scalar_subquery()
+    )
+    latest_videos = select(RankingItemModel.video_id).where(
+        RankingItemModel.ranking_list_id == newest_list,
+        RankingItemModel.position <= limit,
+    )
+    week_rows, archived_ids, rows = _week_positions(
+        db, recent, RankingItemModel.video_id.in_(latest_videos)
+    )
+    if not week_rows:
+        return None
+    list_ids = [list_id for list_id, _ in week_rows]
+    latest_id = list_ids[-1]
+
+    # The newest week is never archived, so the subquery above always sees it.
+    tracked = {video_id for _, video_id, _ in rows}
+    for list_id, items in load_archived_items(db, archived_ids).items():
+        rows.extend(
+            (list_id, item.video_id, item.position) for item in items if item.video_id in tracked
+        )
+
+    positions: Dict[str, Dict[int, int]] = {}
+    for list_id, video_id, position in rows:
+        by_week = positions.setdefault(video_id, {})
+        # Keep the best position if a list ever holds a video twice.
+        by_week[list_id] = min(position, by_week.get(list_id, position))
+
+    ordered = sorted(positions, key=lambda video_id: positions[video_id][latest_id])
+    return RankingHistory(
+        board=board,
+        start=week_rows[0][1].isoformat(),
+        week_gaps=_week_gaps([label for _, label in week_rows]),
+        videos=[
+            RankTrack(
+                video_id=video_id,
+                ranks=delta_encode([positions[video_id].get(list_id) for list_id in list_ids]),
+            )
+            for video_id in ordered
+        ],
+    )
+
+
+def fetch_video_rank_history(
+    db: Session,
+    video_id: str,
+    *,
+    board: str,
+    weeks: int,
+) -> VideoRankHistory:
+    """One video's rank over the last `weeks` weeks; one query, plus one for
+    archived weeks when the window reaches them."""
+    week_rows, archived_ids, rows = _week_positions(
+        db, recent_weeks(db, board=board, weeks=weeks), RankingItemModel.video_id == video_id
+    )
+    list_ids = [list_id for list_id, _ in week_rows]
+    positions: Dict[int, int] = {}
+    for list_id, _, position in rows:
+        positions[list_id] = min(position, positions.get(list_id, position))
+    for list_id, items in load_archived_items(db, archived_ids).items():
+        matches = [item.position for item in items if item.video_id == video_id]
+        if matches:
+            positions[list_id] = min(matches)
+
+    return VideoRankHistory(
+        video_id=video_id,
+        board=board,
+        start=week_rows[0][1].isoformat() if week_rows else None,
+        week_gaps=_week_gaps([label for _, label in week_rows]),
+        ranks=delta_encode([positions.get(list_id) for list_id in list_ids]),
+    )
+
+
+async def fetch_ranking_history_async(
+    db: AsyncSession,
+    *,
+    board: str,
+    weeks: int,
+    limit: int,
+) -> Optional[RankingHistory]:
+    return await db.run_sync(fetch_ranking_history, board=board, weeks=weeks, limit=limit)
+
+
+async def fetch_video_rank_history_async(
+    db: AsyncSession,
+    video_id: str,
+    *,
+    board: str,
+    weeks: int,
+) -> VideoRankHistory:
+    return await db.run_sync(fetch_video_rank_history, video_id, board=board, weeks=weeks)
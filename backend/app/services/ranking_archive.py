@@ -0,0 +1,218 @@
+"""Compaction of old ranking weeks into compressed archive rows.
+
+Only the latest board is served hot, but every week adds 60-100
+`ranking_items` rows per board. Once a list is older than the retention
+window its items are packed column-wise (video ids, positions, scores, score
+components) into one zlib-compressed JSON blob in `ranking_archives` and the
+item rows are deleted. `load_items` hides the difference from readers.
+"""
+
+import json
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models import RankingArchive as RankingArchiveModel
+from app.models import RankingItem as RankingItemModel
+from app.models import RankingList as RankingListModel
+
+
+ARCHIVE_CODEC = "zlib-json-v1"
+
+
+class StoredItem(NamedTuple):
+    video_id: str
+    position: int
+    score: Optional[int]
+    score_components: Optional[Dict[str, int]]
+
+
+@dataclass
+class ArchiveResult:
+    lists: int = 0
+    items: int = 0
+    raw_bytes: int = 0
+    stored_bytes: int = 0
+
+
+def encode_items(items: Sequence[StoredItem]) -> bytes:
+    ordered = sorted(items, key=lambda item: item.position)
+    columns = {
+        "video_id": [item.video_id for item in ordered],
+        "position": [item.position for item in ordered],
+        "score": [item.score for item in ordered],
+        "score_components": [item.score_components for item in ordered],
+    }
+    return zlib.compress(json.dumps(columns, separators=(",", ":")).encode("utf-8"), 9)
+
+
+def decode_items(payload: bytes, codec: str = ARCHIVE_CODEC) -> List[StoredItem]:
+    if codec != ARCHIVE_CODEC:
+        raise ValueError(f"Unsupported ranking archive codec: {codec}")
+    columns = json.loads(zlib.decompress(payload))
+    return [
+        StoredItem(*row)
+        for row in zip(
+            columns["video_id"],
+            columns["position"],
+            columns["score"],
+            columns["score_components"],
+        )
+    ]
+
+
+def load_items(db: Session, list_ids: Iterable[int]) -> Dict[int, List[StoredItem]]:
+    """Items per ranking list in position order, from hot rows or archives."""
+    ids = list(list_ids)
+    items: Dict[int, List[StoredItem]] = {list_id: [] for list_id in ids}
+    if not ids:
+        return items
+
+    rows = (
+        db.query(
+            RankingItemModel.ranking_list_id,
+            RankingItemModel.video_id,
+            RankingItemModel.position,
+            RankingItemModel.score,
+            RankingItemModel.score_components,
+        )
+        .filter(RankingItemModel.ranking_list_id.in_(ids))
+        .order_by(RankingItemModel.ranking_list_id, RankingItemModel.position)
+        .all()
+    )
+    for list_id, *fields in rows:
+        items[list_id].append(StoredItem(*fields))
+
+    for archive in _archives(db, [list_id for list_id in ids if not items[list_id]]):
+        items[archive.ranking_list_id] = decode_items(archive.payload, archive.codec)
+    return items
+
+
+def load_archived_items(db: Session, list_ids: Iterable[int]) -> Dict[int, List[StoredItem]]:
+    """Decoded items of whichever of `list_ids` are archived."""
+    return {
+        archive.ranking_list_id: decode_items(archive.payload, archive.codec)
+        for archive in _archives(db, list(list_ids))
+    }
+
+
+def _archives(db: Session, list_ids: List[int]) -> List[RankingArchiveModel]:
+    if not list_ids:
+        return []
+    return (
+        db.query(RankingArchiveModel)
+        .filter(RankingArchiveModel.ranking_list_id.in_(list_ids))
+        .all()
+    )
+
+
+def select_archivable_lists(
+    db: Session,
+    *,
+    cutoff: datetime,
+    board: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> List[RankingListModel]:
+    """Lists labelled before `cutoff` that still have hot items.
+
+    The newest week of each board is never returned, so the board that is
+    being served stays hot even when ingestion has stalled. Like
+    `fetch_weekly_rankings`, only lists with items count as the newest week;
+    an item-less list from an aborted write does not.
+    """
+    newest = (
+        db.query(
+            RankingListModel.board.label("board"),
+            func.max(RankingListModel.label_date).label("label_date"),
+        )
+        .filter(RankingListModel.ranking_items.any())
+        .group_by(RankingListModel.board)
+        .subquery()
+    )
+    query = (
+        db.query(RankingListModel)
+        .join(newest, newest.c.board == RankingListModel.board)
+        .filter(
+            RankingListModel.label_date.isnot(None),
+            RankingListModel.label_date < cutoff.date(),
+            RankingListModel.label_date < newest.c.label_date,
+            RankingListModel.ranking_items.any(),
+            ~RankingListModel.archive.has(),
+        )
+        .order_by(RankingListModel.label_date, RankingListModel.id)
+    )
+    if board is not None:
+        query = query.filter(RankingListModel.board == board)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+
+def archive_ranking_list(db: Session, ranking: RankingListModel, result: ArchiveResult) -> None:
+    """Pack one list's items into an archive row and delete them. Does not commit."""
+    items = load_items(db, [ranking.id])[ranking.id]
+    payload = encode_items(items)
+    db.add(
+        RankingArchiveModel(
+            ranking_list_id=ranking.id,
+            codec=ARCHIVE_CODEC,
+            item_count=len(items),
+            payload=payload,
+        )
+    )
+    db.query(RankingItemModel).filter(RankingItemModel.ranking_list_id == ranking.id).delete(
+        synchronize_session=False
+    )
+    result.lists += 1
+    result.items += len(items)
+    result.raw_bytes += len(json.dumps([list(item) for item in items]).encode("utf-8"))
+    result.stored_bytes += len(payload)
+
+
+def archive_old_weeks(
+    db: Session,
+    *,
+    now: datetime,
+    keep_weeks: int,
+    board: Optional[str] = None,
+    limit: Optional[int] = None,
+    dry_run: bool = False,
+) -> ArchiveResult:
+    """Archive every list labelled more than `keep_weeks` weeks before `now`.
+
+    Commits once per list, so an interrupted run keeps its progress and never
+    leaves a list half-archived.
+    """
+    result = ArchiveResult()
+    cutoff = now - timedelta(weeks=keep_weeks)
+    for ranking in select_archivable_lists(db, cutoff=cutoff, board=board, limit=limit):
+        archive_ranking_list(db, ranking, result)
+        if dry_run:
+            db.rollback()
+        else:
+            db.commit()
+    return result
+
+
+def restore_archives(db: Session, list_ids: Optional[Iterable[int]] = None) -> int:
+    """Unpack archived lists back into `ranking_items`. Commits per list."""
+    query = db.query(RankingArchiveModel)
+    if list_ids is not None:
+        query = query.filter(RankingArchiveModel.ranking_list_id.in_(list(list_ids)))
+    restored = 0
+    for archive in query.all():
+        db.bulk_insert_mappings(
+            RankingItemModel,
+            [
+                {"ranking_list_id": archive.ranking_list_id, **item._asdict()}
+                for item in decode_items(archive.payload, archive.codec)
+            ],
+        )
+        db.delete(archive)
+        db.commit()
+        restored += 1
+    return restored
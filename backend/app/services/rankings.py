@@ -1,31 +1,46 @@
-from datetime import datetime
+from datetime import datetime, time
 import re
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models import RankingList as RankingListModel
-from app.models import RankingItem as RankingItemModel
 from app.models import Video as VideoModel
-from app.schemas.ranking import RankingItem, RankingList
-from app.schemas.video import VideoBase
-from app.services.tag_feedback import build_effective_tags, get_user_tags_map
-from app.services.tagging import compute_tags_for_video
-from app.services.tag_votes import get_tag_vote_scores
-
-
-def fetch_ranking_by_id(db: Session, ranking_id: int) -> Optional[RankingList]:
+from app.services.boards import MAIN_BOARD
+from app.services.ranking_archive import load_items
+from app.services.single_flight import coalesced
+from app.services.videos import DEFAULT_LIST_FIELDS, video_columns, video_rows_to_dicts
+
+
+@coalesced("fetch_ranking_by_id")
+def fetch_ranking_by_id(
+    db: Session,
+    ranking_id: int,
+    fields: Sequence[str] = DEFAULT_LIST_FIELDS,
+) -> Optional[Dict[str, Any]]:
     ranking = db.query(RankingListModel).filter(RankingListModel.id == ranking_id).first()
     if not ranking:
         return None
-    return _build_ranking_payload(db, ranking)
+    return _build_ranking_payload(db, ranking, fields)
+
+
+@coalesced("fetch_ranking_by_id")
+async def fetch_ranking_by_id_async(
+    db: AsyncSession,
+    ranking_id: int,
+    fields: Sequence[str] = DEFAULT_LIST_FIELDS,
+) -> Optional[Dict[str, Any]]:
+    # __wrapped__: already coalesced here, on the event loop.
+    return await db.run_sync(fetch_ranking_by_id.__wrapped__, ranking_id, fields)
 
 
 def _extract_label_date(name: str, created_at: datetime) -> datetime:
     """Use the YYYY-MM-DD suffix in the ranking name when present.
 
     This keeps the weekly label stable even for backfilled lists that were
-    created later in time.
+    created later in time. Only needed for rows that predate the persisted
+    `label_date` column.
     """
     match = re.search(r"(\d{4}-\d{2}-\d{2})$", name)
     if not match:
@@ -36,77 +51,106 @@ def _extract_label_date(name: str, created_at: datetime) -> datetime:
         return created_at
 
 
-def _build_ranking_payload(db: Session, ranking: RankingListModel) -> RankingList:
-    items_query = (
-        db.query(RankingItemModel)
-        .filter(RankingItemModel.ranking_list_id == ranking.id)
-        .order_by(RankingItemModel.position)
-        .all()
-    )
+def _label_date(ranking: RankingListModel) -> datetime:
+    if ranking.label_date is not None:
+        return datetime.combine(ranking.label_date, time.min)
+    return _extract_label_date(ranking.name, ranking.created_at)
+
+
+def _build_ranking_payload(
+    db: Session,
+    ranking: RankingListModel,
+    fields: Sequence[str] = DEFAULT_LIST_FIELDS,
+) -> Dict[str, Any]:
+    """Build a `RankingList`-shaped dict (JSON-ready, no pydantic models),
+    with each video projected onto `fields`."""
+    # Archived weeks come back decoded, in the same shape as hot items.
+    items = load_items(db, [ranking.id])[ranking.id]
+    video_ids = [item.video_id for item in items]
+    rows = db.query(*video_columns(fields)).filter(VideoModel.youtube_id.in_(video_ids)).all()
+    # Attach computed tags so the frontend can filter by trigger/roleplay/etc.
+    videos_by_id = {
+        video["youtube_id"]: video for video in video_rows_to_dicts(db, rows, fields)
+    }
+
     ranking_items = []
-    computed_tags_updated = False
-    user_tags_by_video = get_user_tags_map(db, [item.video_id for item in items_query])
-    for item in items_query:
-        video = db.query(VideoModel).filter(VideoModel.youtube_id == item.video_id).first()
-        if not video:
+    for item in items:
+        video_payload = videos_by_id.get(item.video_id)
+        if not video_payload:
             continue
-
-        video_payload = VideoBase.from_orm(video)
-        # Attach computed tags so the frontend can filter by trigger/roleplay/etc.
-        # Prefer persisted computed_tags when available; otherwise compute once
-        # and persist back to the Video row so subsequent requests reuse it.
-        if video.computed_tags:
-            auto_tags = list(video.computed_tags)
-        else:
-            auto_tags = compute_tags_for_video(video)
-            video.computed_tags = auto_tags
-            db.add(video)
-            computed_tags_updated = True
-
-        video_payload.computed_tags = build_effective_tags(
-            auto_tags=auto_tags,
-            vote_scores=get_tag_vote_scores(db, video.youtube_id),
-            user_tags=user_tags_by_video.get(video.youtube_id, []),
-        )
-
         ranking_items.append(
-            RankingItem(
-                rank=item.position,
-                score=item.score or 0,
-                video=video_payload,
-            )
+            {
+                "rank": item.position,
+                "video": video_payload,
+                "score": item.score or 0,
+                "score_components": item.score_components,
+            }
         )
 
-    if computed_tags_updated:
-        db.commit()
-
-    label_date = _extract_label_date(ranking.name, ranking.created_at)
+    label_date = _label_date(ranking)
 
-    return RankingList(
-        id=ranking.id,
-        name=ranking.name,
-        description=ranking.description or "",
-        published_at=label_date.isoformat(),
-        items=ranking_items,
-    )
+    return {
+        "id": ranking.id,
+        "name": ranking.name,
+        "board": ranking.board or MAIN_BOARD,
+        "description": ranking.description or "",
+        "published_at": label_date.isoformat(),
+        "items": ranking_items,
+    }
 
 
-def fetch_weekly_rankings(db: Session) -> List[RankingList]:
+@coalesced("fetch_weekly_rankings")
+def fetch_weekly_rankings(
+    db: Session,
+    board: str = MAIN_BOARD,
+    fields: Sequence[str] = DEFAULT_LIST_FIELDS,
+) -> List[Dict[str, Any]]:
     """Return the most recent weekly ranking list only.
 
     The API contract for /rankings/weekly still returns a list for
     backwards-compatibility, but the payload contains just the latest
     ranking. Older weeks remain in the database for historical analysis
     and offline tooling.
+
+    Tag sub-boards are served from the same snapshot as the main board: the
+    week is picked on the main board, then the sub-board with that name is
+    looked up, so a board that was too thin to publish this week is reported
+    as missing rather than served stale.
     """
+    # Lists written before persistence became atomic can be orphaned (no
+    # items); never serve one of those as the latest board.
     latest = (
         db.query(RankingListModel)
+        .filter(
+            RankingListModel.board == MAIN_BOARD,
+            RankingListModel.ranking_items.any(),
+        )
         .order_by(RankingListModel.created_at.desc())
         .first()
     )
 
+    if latest and board != MAIN_BOARD:
+        latest = (
+            db.query(RankingListModel)
+            .filter(
+                RankingListModel.board == board,
+                RankingListModel.name == latest.name,
+                RankingListModel.ranking_items.any(),
+            )
+            .order_by(RankingListModel.id.desc())
+            .first()
+        )
+
     if not latest:
         return []
 
-    return [_build_ranking_payload(db, latest)]
+    return [_build_ranking_payload(db, latest, fields)]
+
 
+@coalesced("fetch_weekly_rankings")
+async def fetch_weekly_rankings_async(
+    db: AsyncSession,
+    board: str = MAIN_BOARD,
+    fields: Sequence[str] = DEFAULT_LIST_FIELDS,
+) -> List[Dict[str, Any]]:
+    return await db.run_sync(fetch_weekly_rankings.__wrapped__, board, fields)
@@ -0,0 +1,492 @@
+"""Tag-invalidated result cache for catalog queries (`browse_videos`).
+
+Entries are keyed on a normalized query signature and stamped with the
+versions of the invalidation tags they depend on. Writers bump tags instead
+of deleting entries, so an entry is stale as soon as any tag it was stamped
+with has moved on:
+
+- `catalog`: every entry. Bumped by catalog-wide rewrites (tag backfills,
+  stats refreshes).
+- `channel:<id>` / `channel:*`: entries filtered to those channels, or not
+  filtered by channel at all. Ingestion bumps the channels it touched plus
+  `channel:*`.
+- `tag:<id>`: entries filtered (or excluded) by that tag. Votes and user tags
+  bump it.
+- `video:<id>`: entries that expose the video's computed_tags. Votes and user
+  tags bump it.
+
+Two backends: `LRUBackend` (per process, the default) and `RedisBackend`,
+which speaks plain RESP so any Redis-compatible server works and shares
+entries and invalidations between API workers and ingestion jobs. LRU
+caches get their invalidations to other processes through the
+`app.services.invalidation` bus (Postgres LISTEN/NOTIFY); without it, other
+workers only catch up when the entry's TTL runs out.
+
+Cache failures never fail a query: the result is computed directly and the
+error is logged.
+
+`ResultCache.fetch_async` serves the async API path. Backends that block on
+the network (`CacheBackend.blocking`) are then called from a worker thread.
+"""
+
+import hashlib
+import logging
+import socket
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from functools import lru_cache, partial
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from urllib.parse import urlparse
+
+import anyio.to_thread
+import orjson
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import Settings
+from app.core.metrics import cache_lookup_counters
+from app.services.invalidation import InvalidationBus, get_invalidation_bus
+
+
+logger = logging.getLogger(__name__)
+
+CATALOG_TAG = "catalog"
+ALL_CHANNELS_TAG = "channel:*"
+# Bumped together with every `video:` tag; see `ResultCache.fetch`.
+FEEDBACK_TAG = "feedback"
+
+DEFAULT_TTL_SECONDS = 300
+DEFAULT_MAX_ENTRIES = 1024
+
+
+def channel_tag(channel_id: str) -> str:
+    return f"channel:{channel_id}"
+
+
+def tag_tag(tag: str) -> str:
+    return f"tag:{tag}"
+
+
+def video_tag(video_id: str) -> str:
+    return f"video:{video_id}"
+
+
+def channel_invalidation_tags(channel_ids: Iterable[str]) -> List[str]:
+    return [ALL_CHANNELS_TAG, *sorted({channel_tag(c) for c in channel_ids if c})]
+
+
+class CacheError(Exception):
+    """The cache backend could not serve a request."""
+
+
+class CacheBackend:
+    """Byte-value store plus monotonically increasing tag versions."""
+
+    # Whether calls wait on I/O (and so must stay off the event loop).
+    blocking = False
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes) -> None:
+        raise NotImplementedError
+
+    def versions(self, tags: Sequence[str]) -> List[int]:
+        """Current version of each tag; never-bumped tags are 0."""
+        raise NotImplementedError
+
+    def bump(self, tags: Sequence[str]) -> None:
+        raise NotImplementedError
+
+    def apply_versions(self, versions: Mapping[str, int]) -> None:
+        """Apply shared versions published by another process."""
+
+
+class LRUBackend(CacheBackend):
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        # Latest shared (bus) version seen per tag. Local versions stay
+        # independent and are bumped once per newer shared version, so local
+        # fallbacks and repeated deliveries cannot desynchronize them.
+        self._shared_versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def versions(self, tags: Sequence[str]) -> List[int]:
+        with self._lock:
+            return [self._versions.get(tag, 0) for tag in tags]
+
+    def bump(self, tags: Sequence[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    def apply_versions(self, versions: Mapping[str, int]) -> None:
+        with self._lock:
+            for tag, version in versions.items():
+                if version > self._shared_versions.get(tag, 0):
+                    self._shared_versions[tag] = version
+                    self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RespClient:
+    """Just enough of a RESP2 client: one connection, pipelined commands."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 6379,
+        *,
+        db: int = 0,
+        password: Optional[str] = None,
+        timeout: float = 1.0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_url(cls, url: str, *, timeout: float = 1.0) -> "RespClient":
+        parsed = urlparse(url)
+        db = int(parsed.path.lstrip("/") or 0)
+        return cls(
+            parsed.hostname or "localhost",
+            parsed.port or 6379,
+            db=db,
+            password=parsed.password,
+            timeout=timeout,
+        )
+
+    def execute(self, *args: Any) -> Any:
+        return self.pipeline([args])[0]
+
+    def pipeline(self, commands: Sequence[Sequence[Any]]) -> List[Any]:
+        with self._lock:
+            try:
+                if self._sock is None:
+                    self._connect()
+                self._sock.sendall(b"".join(_encode_command(command) for command in commands))
+                replies = [self._read_reply() for _ in commands]
+            except (OSError, CacheError):
+                self.close()
+                raise
+        for reply in replies:
+            if isinstance(reply, CacheError):
+                raise reply
+        return replies
+
+    def close(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            finally:
+                self._sock = None
+                self._reader = None
+
+    def _connect(self) -> None:
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._reader = self._sock.makefile("rb")
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            self._sock.sendall(b"".join(_encode_command(command) for command in setup))
+            for _ in setup:
+                reply = self._read_reply()
+                if isinstance(reply, CacheError):
+                    raise reply
+
+    def _read_reply(self) -> Any:
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise CacheError("Connection closed by cache server")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode("utf-8")
+        if kind == b"-":
+            # Returned rather than raised so the rest of the pipeline is read.
+            return CacheError(rest.decode("utf-8"))
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(rest)
+            if count < 0:
+                return None
+            return [self._read_reply() for _ in range(count)]
+        raise CacheError(f"Unexpected RESP reply: {line!r}")
+
+
+def _encode_command(args: Sequence[Any]) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, bytes):
+            data = arg
+        else:
+            data = str(arg).encode("utf-8")
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+class RedisBackend(CacheBackend):
+    blocking = True
+
+    def __init__(
+        self,
+        client: RespClient,
+        *,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        prefix: str = "tingleradar:",
+    ) -> None:
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.execute("GET", self.prefix + key)
+
+    def set(self, key: str, value: bytes) -> None:
+        self.client.execute("SET", self.prefix + key, value, "EX", self.ttl_seconds)
+
+    def versions(self, tags: Sequence[str]) -> List[int]:
+        if not tags:
+            return []
+        values = self.client.execute("MGET", *[self._version_key(tag) for tag in tags])
+        return [int(value) if value is not None else 0 for value in values]
+
+    def bump(self, tags: Sequence[str]) -> None:
+        if tags:
+            self.client.pipeline([("INCR", self._version_key(tag)) for tag in tags])
+
+    def _version_key(self, tag: str) -> str:
+        return f"{self.prefix}version:{tag}"
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _dumps(value: Any) -> bytes:
+    return orjson.dumps(
+        value,
+        default=_json_default,
+        option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SORT_KEYS,
+    )
+
+
+class ResultCache:
+    def __init__(self, backend: CacheBackend, *, bus: Optional[InvalidationBus] = None) -> None:
+        self.backend = backend
+        self.bus = bus
+        self.hits = 0
+        self.misses = 0
+        if bus is not None:
+            bus.subscribe(backend.apply_versions)
+
+    @classmethod
+    def from_url(
+        cls,
+        url: Optional[str],
+        *,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> "ResultCache":
+        """`redis://[:password@]host[:port][/db]`, or None/`memory://` for the LRU."""
+        if url and urlparse(url).scheme in ("redis", "resp"):
+            return cls(RedisBackend(RespClient.from_url(url), ttl_seconds=ttl_seconds))
+        return cls(LRUBackend(max_entries=max_entries, ttl_seconds=ttl_seconds))
+
+    def fetch(
+        self,
+        namespace: str,
+        signature: Mapping[str, Any],
+        tags: Iterable[str],
+        compute: Callable[[], Any],
+        *,
+        result_tags: Optional[Callable[[Any], Iterable[str]]] = None,
+    ) -> Any:
+        """Cached `compute()` for `signature`, stamped with `tags`.
+
+        `result_tags` adds tags that are only known from the result (the
+        videos on a page). Their versions are read after computing, so a
+        write that lands in between could go unnoticed; every such write also
+        bumps FEEDBACK_TAG, and the result is not stored if it moved.
+        """
+        key = self._key(namespace, signature)
+        tags = sorted(set(tags))
+        hit, value, before = self._lookup(namespace, key, tags)
+        if hit:
+            return value
+        value = compute()
+        if before is not None:
+            self._store(namespace, key, tags, before, value, result_tags)
+        return value
+
+    async def fetch_async(
+        self,
+        namespace: str,
+        signature: Mapping[str, Any],
+        tags: Iterable[str],
+        compute: Callable[[], Awaitable[Any]],
+        *,
+        result_tags: Optional[Callable[[Any], Iterable[str]]] = None,
+    ) -> Any:
+        """`fetch` for a coroutine `compute`."""
+        key = self._key(namespace, signature)
+        tags = sorted(set(tags))
+        hit, value, before = await self._off_loop(self._lookup, namespace, key, tags)
+        if hit:
+            return value
+        value = await compute()
+        if before is not None:
+            await self._off_loop(self._store, namespace, key, tags, before, value, result_tags)
+        return value
+
+    def _key(self, namespace: str, signature: Mapping[str, Any]) -> str:
+        return f"{namespace}:{hashlib.blake2b(_dumps(signature), digest_size=16).hexdigest()}"
+
+    def _lookup(
+        self, namespace: str, key: str, tags: List[str]
+    ) -> Tuple[bool, Any, Optional[List[int]]]:
+        """(hit, cached value, versions of `tags` + FEEDBACK_TAG before computing).
+
+        The versions are None when the backend failed; the result is then
+        computed but not stored.
+        """
+        try:
+            cached = self.backend.get(key)
+            if cached is not None:
+                entry = orjson.loads(cached)
+                stamped = entry["tags"]
+                if self.backend.versions(list(stamped)) == list(stamped.values()):
+                    self.hits += 1
+                    cache_lookup_counters(namespace)[0].inc()
+                    return True, entry["value"], None
+            before = self.backend.versions(tags + [FEEDBACK_TAG])
+        except (OSError, CacheError) as exc:
+            logger.warning("Result cache read failed for %s: %s", namespace, exc)
+            return False, None, None
+        self.misses += 1
+        cache_lookup_counters(namespace)[1].inc()
+        return False, None, before
+
+    def _store(
+        self,
+        namespace: str,
+        key: str,
+        tags: List[str],
+        before: List[int],
+        value: Any,
+        result_tags: Optional[Callable[[Any], Iterable[str]]],
+    ) -> None:
+        extra = sorted(set(result_tags(value))) if result_tags else []
+        try:
+            after = self.backend.versions(extra + [FEEDBACK_TAG])
+            if after[-1] != before[-1]:
+                return
+            stamped = dict(zip(tags, before[:-1]))
+            stamped.update(zip(extra, after[:-1]))
+            self.backend.set(key, _dumps({"tags": stamped, "value": value}))
+        except (OSError, CacheError) as exc:
+            logger.warning("Result cache write failed for %s: %s", namespace, exc)
+
+    async def _off_loop(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.backend.blocking:
+            return await anyio.to_thread.run_sync(partial(fn, *args))
+        return fn(*args)
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        tags = sorted(set(tags))
+        if self.bus is not None:
+            try:
+                # Delivered to this process's backend synchronously.
+                self.bus.publish(tags)
+                return
+            except SQLAlchemyError as exc:
+                logger.warning("Publishing invalidation of %s failed: %s", tags, exc)
+        try:
+            self.backend.bump(tags)
+        except (OSError, CacheError) as exc:
+            logger.warning("Result cache invalidation of %s failed: %s", tags, exc)
+
+    def invalidate_catalog(self) -> None:
+        self.invalidate([CATALOG_TAG])
+
+    def invalidate_channels(self, channel_ids: Iterable[str]) -> None:
+        """Videos of these channels were added or changed."""
+        self.invalidate(channel_invalidation_tags(channel_ids))
+
+    def invalidate_video_tags(self, video_id: str, tags: Iterable[str]) -> None:
+        """Votes or user tags changed `tags` on one video."""
+        self.invalidate(
+            [video_tag(video_id), FEEDBACK_TAG, *(tag_tag(tag) for tag in tags)]
+        )
+
+
+@lru_cache()
+def get_result_cache() -> ResultCache:
+    settings = Settings()
+    cache = ResultCache.from_url(
+        settings.result_cache_url,
+        ttl_seconds=settings.result_cache_ttl_seconds,
+        max_entries=settings.result_cache_max_entries,
+    )
+    if isinstance(cache.backend, LRUBackend) and settings.cache_bus_enabled:
+        cache = ResultCache(cache.backend, bus=get_invalidation_bus())
+    return cache
@@ -0,0 +1,133 @@
+"""Vectorized ranking score for weekly board candidates.
+
+The board used to be ordered by raw view count, which mostly rewards channel
+size. The score here blends three per-video signals, each normalized to
+[0, 1] over the whole candidate set:
+
+- velocity: views per hour since publish, log-scaled so one viral upload does
+  not flatten everyone else to zero;
+- like_ratio: likes / views with a small Bayesian prior, so a video with 3
+  views and 1 like doesn't top the chart;
+- tag_quality: net community tag votes, squashed with tanh around neutral.
+
+Everything is computed on NumPy arrays; scoring tens of thousands of
+candidates takes a few milliseconds.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+
+SIGNALS = ("velocity", "like_ratio", "tag_quality")
+# Scores are persisted in the integer `ranking_items.score` column.
+SCORE_SCALE = 10_000
+
+# Prior for the like ratio: behaves as if every video already had
+# LIKE_PRIOR_VIEWS views at the catalog-typical LIKE_PRIOR_RATIO.
+LIKE_PRIOR_VIEWS = 500.0
+LIKE_PRIOR_RATIO = 0.03
+# Net votes at which tag_quality is ~76% of the way to its extreme.
+TAG_VOTE_SCALE = 5.0
+
+
+@dataclass(frozen=True)
+class ScoreWeights:
+    velocity: float = 0.6
+    like_ratio: float = 0.25
+    tag_quality: float = 0.15
+
+    def as_dict(self) -> Dict[str, float]:
+        return {signal: float(getattr(self, signal)) for signal in SIGNALS}
+
+
+@dataclass
+class ScoreResult:
+    """Total score and weighted per-signal contributions, in input order."""
+
+    scores: np.ndarray
+    contributions: Dict[str, np.ndarray]
+
+    def ranking(self) -> np.ndarray:
+        """Indices ordered by score desc; ties keep input order."""
+        return np.argsort(-self.scores, kind="stable")
+
+    def scaled(self, index: int) -> int:
+        return int(round(float(self.scores[index]) * SCORE_SCALE))
+
+    def scaled_contributions(self, index: int) -> Dict[str, int]:
+        return {
+            signal: int(round(float(values[index]) * SCORE_SCALE))
+            for signal, values in self.contributions.items()
+        }
+
+
+def _min_max(values: np.ndarray) -> np.ndarray:
+    if values.size == 0:
+        return values
+    low = values.min()
+    span = values.max() - low
+    if span <= 0:
+        return np.zeros_like(values)
+    return (values - low) / span
+
+
+def score_arrays(
+    view_counts: np.ndarray,
+    like_counts: np.ndarray,
+    published_ts: np.ndarray,
+    tag_vote_totals: np.ndarray,
+    *,
+    now_ts: float,
+    weights: ScoreWeights = ScoreWeights(),
+) -> ScoreResult:
+    """Score candidates given parallel arrays (timestamps in epoch seconds)."""
+    views = np.maximum(np.asarray(view_counts, dtype=np.float64), 0.0)
+    likes = np.asarray(like_counts, dtype=np.float64)
+    hours = np.maximum((now_ts - np.asarray(published_ts, dtype=np.float64)) / 3600.0, 1.0)
+    votes = np.asarray(tag_vote_totals, dtype=np.float64)
+
+    smoothed_ratio = (likes + LIKE_PRIOR_RATIO * LIKE_PRIOR_VIEWS) / (views + LIKE_PRIOR_VIEWS)
+    signals = {
+        "velocity": _min_max(np.log1p(views / hours)),
+        "like_ratio": _min_max(smoothed_ratio),
+        "tag_quality": 0.5 + 0.5 * np.tanh(votes / TAG_VOTE_SCALE),
+    }
+
+    weight_map = weights.as_dict()
+    total_weight = sum(weight_map.values()) or 1.0
+    contributions = {
+        signal: signals[signal] * (weight_map[signal] / total_weight) for signal in SIGNALS
+    }
+    scores = np.zeros(views.shape, dtype=np.float64)
+    for values in contributions.values():
+        scores += values
+    return ScoreResult(scores=scores, contributions=contributions)
+
+
+def _timestamp(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def score_videos(
+    videos: Sequence[Mapping],
+    *,
+    now: datetime,
+    tag_vote_totals: Optional[Mapping[str, int]] = None,
+    weights: ScoreWeights = ScoreWeights(),
+) -> ScoreResult:
+    """Score normalized video payloads (`youtube_id`, counts, `published_at`)."""
+    count = len(videos)
+    votes = tag_vote_totals or {}
+    return score_arrays(
+        np.fromiter((v.get("view_count") or 0 for v in videos), dtype=np.float64, count=count),
+        np.fromiter((v.get("like_count") or 0 for v in videos), dtype=np.float64, count=count),
+        np.fromiter((_timestamp(v["published_at"]) for v in videos), dtype=np.float64, count=count),
+        np.fromiter((votes.get(v["youtube_id"], 0) for v in videos), dtype=np.float64, count=count),
+        now_ts=_timestamp(now),
+        weights=weights,
+    )
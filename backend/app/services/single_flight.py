@@ -0,0 +1,220 @@
+"""Single-flight coalescing of identical in-process calls.
+
+When the weekly board's cache entry expires or ingestion lands, many
+requests ask for the same expensive result at once. `SingleFlight.do` lets
+the first caller for a key compute it while concurrent callers with the
+same key wait and receive the same result (or exception). Once the
+computation finishes, the key is released, so later calls compute afresh.
+Nothing here is a cache.
+
+`SingleFlight.do_async` is the same for coroutines: followers await the
+leader's result without blocking their event loop. If the leader itself is
+cancelled (its client went away), the key is released and its followers
+start over, one of them leading; they never see the leader's cancellation.
+Sync and async calls with the same key do not coalesce with each other.
+
+Each computation records how many callers it served, per call name; see
+`SingleFlight.stats`.
+"""
+
+import asyncio
+import concurrent.futures
+import inspect
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+# Upper bounds of the callers-per-computation histogram.
+CALLER_BUCKETS = (1, 2, 5, 10, 25, 50, 100)
+
+
+def freeze(value: Any) -> Hashable:
+    """Hashable equivalent of JSON-like arguments (lists, dicts, sets)."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(freeze(item) for item in value))
+    return value
+
+
+@dataclass
+class FlightStats:
+    computations: int = 0
+    callers: int = 0
+    max_callers: int = 0
+    # Bucket upper bound (None = above the last bound) -> computations.
+    histogram: Counter = field(default_factory=Counter)
+
+    def record(self, callers: int) -> None:
+        self.computations += 1
+        self.callers += callers
+        self.max_callers = max(self.max_callers, callers)
+        bucket = next((bound for bound in CALLER_BUCKETS if callers <= bound), None)
+        self.histogram[bucket] += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "computations": self.computations,
+            "callers": self.callers,
+            "coalesced": self.callers - self.computations,
+            "max_callers": self.max_callers,
+            "callers_histogram": {
+                ("+Inf" if bound is None else str(bound)): self.histogram[bound]
+                for bound in (*CALLER_BUCKETS, None)
+            },
+        }
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.callers = 1
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _AsyncCall:
+    def __init__(self) -> None:
+        # A thread-safe future, so followers on another event loop (one per
+        # request under the test client) can await it too.
+        self.future: concurrent.futures.Future = concurrent.futures.Future()
+        self.callers = 1
+
+
+class _LeaderCancelled(Exception):
+    """Set on an async flight whose leader was cancelled; followers retry."""
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._calls: Dict[Tuple[str, Hashable], _Call] = {}
+        self._async_calls: Dict[Tuple[str, Hashable], _AsyncCall] = {}
+        self._stats: Dict[str, FlightStats] = {}
+        self._lock = threading.Lock()
+
+    def do(self, name: str, key: Hashable, fn: Callable[[], T]) -> T:
+        flight_key = (name, key)
+        with self._lock:
+            call = self._calls.get(flight_key)
+            leader = call is None
+            if leader:
+                call = self._calls[flight_key] = _Call()
+            else:
+                call.callers += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            self._release(self._calls, flight_key, call.callers)
+            call.done.set()
+        return call.result
+
+    async def do_async(self, name: str, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        flight_key = (name, key)
+        while True:
+            with self._lock:
+                call = self._async_calls.get(flight_key)
+                leader = call is None
+                if leader:
+                    call = self._async_calls[flight_key] = _AsyncCall()
+                else:
+                    call.callers += 1
+
+            if leader:
+                break
+            try:
+                # Shielded: a follower that is cancelled must not cancel the others.
+                return await asyncio.shield(asyncio.wrap_future(call.future))
+            except _LeaderCancelled:
+                continue
+
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            # Only the leader was cancelled: hand the key to its followers
+            # rather than failing them too. Not recorded, as nothing was served.
+            with self._lock:
+                del self._async_calls[flight_key]
+            call.future.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as exc:
+            self._release(self._async_calls, flight_key, call.callers)
+            call.future.set_exception(exc)
+            raise
+        self._release(self._async_calls, flight_key, call.callers)
+        call.future.set_result(result)
+        return result
+
+    def _release(
+        self,
+        calls: Dict[Tuple[str, Hashable], Any],
+        flight_key: Tuple[str, Hashable],
+        callers: int,
+    ) -> None:
+        with self._lock:
+            del calls[flight_key]
+            self._stats.setdefault(flight_key[0], FlightStats()).record(callers)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in sorted(self._stats.items())}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+flights = SingleFlight()
+
+
+def coalesced(name: str, *, skip: int = 1) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Run concurrent calls with equal arguments once, through `flights`.
+
+    The first `skip` positional parameters (the session) are not part of the
+    key. Arguments are bound against the signature with defaults applied, so
+    positional and keyword spellings of the same call coalesce. Coroutine
+    functions go through `SingleFlight.do_async`.
+    """
+
+    def decorator(fn: Callable[..., T]) -> Callable[..., T]:
+        signature = inspect.signature(fn)
+        keyed = list(signature.parameters)[skip:]
+
+        def key_of(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Hashable:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return tuple(freeze(bound.arguments[param]) for param in keyed)
+
+        if inspect.iscoroutinefunction(fn):
+
+            @wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                return await flights.do_async(
+                    name, key_of(args, kwargs), lambda: fn(*args, **kwargs)
+                )
+
+            return async_wrapper
+
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            return flights.do(name, key_of(args, kwargs), lambda: fn(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
@@ -1,6 +1,7 @@
 from collections import defaultdict
 from typing import Iterable
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models import UserTag
@@ -58,3 +59,13 @@ def add_user_tag(
     db.add(UserTag(video_id=video_id, tag=tag, source=source))
     db.commit()
     return True
+
+
+async def add_user_tag_async(
+    db: AsyncSession,
+    *,
+    video_id: str,
+    tag: str,
+    source: str = "user",
+) -> bool:
+    return await db.run_sync(add_user_tag, video_id=video_id, tag=tag, source=source)
@@ -1,6 +1,8 @@
 from collections import defaultdict
-from typing import Dict
+from typing import Dict, Iterable
 
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models import VideoTagVote
@@ -52,6 +54,23 @@ def record_tag_vote(
     return sum(v[0] for v in total)
 
 
+async def record_tag_vote_async(
+    db: AsyncSession,
+    *,
+    video_id: str,
+    tag: str,
+    user_fingerprint: str,
+    vote: int,
+) -> int:
+    return await db.run_sync(
+        record_tag_vote,
+        video_id=video_id,
+        tag=tag,
+        user_fingerprint=user_fingerprint,
+        vote=vote,
+    )
+
+
 def get_tag_vote_scores(db: Session, video_id: str) -> Dict[str, int]:
     """Return {tag: score} for all tags that have votes on this video."""
     rows = (
@@ -63,3 +82,21 @@ def get_tag_vote_scores(db: Session, video_id: str) -> Dict[str, int]:
     for tag, vote in rows:
         scores[tag] += vote
     return dict(scores)
+
+
+def get_tag_vote_scores_map(db: Session, video_ids: Iterable[str]) -> Dict[str, Dict[str, int]]:
+    """{video_id: {tag: score}} for the given videos that have votes, in one query."""
+    ids = list(dict.fromkeys(video_ids))
+    if not ids:
+        return {}
+
+    rows = (
+        db.query(VideoTagVote.video_id, VideoTagVote.tag, func.sum(VideoTagVote.vote))
+        .filter(VideoTagVote.video_id.in_(ids))
+        .group_by(VideoTagVote.video_id, VideoTagVote.tag)
+        .all()
+    )
+    scores: Dict[str, Dict[str, int]] = defaultdict(dict)
+    for video_id, tag, score in rows:
+        scores[video_id][tag] = int(score)
+    return dict(scores)
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Iterable, List, Dict
+from typing import Dict, Iterable, List, Optional
 
 from app.models.video import Video
 
@@ -43,12 +43,35 @@ ROLEPLAY_SCENE_RULES: List[TagRule] = [
 ]
 
 
-def _build_bag(video: Video) -> Dict[str, str]:
-    """Build lowercased search bags for different fields from a Video row."""
-    title = (video.title or "").lower()
-    description = (video.description or "").lower()
-    tags_raw: Iterable[str] = video.tags or []
-    tags_joined = " ".join(tags_raw).lower()
+# Language tags share the vote/user-tag namespace with the rules above.
+LANGUAGE_TAGS = ("en", "ja", "ko", "zh")
+
+# Tag families that get their own weekly sub-board (see app.services.boards).
+TAG_FAMILIES: Dict[str, List[str]] = {
+    "triggers": [
+        "tapping",
+        "scratching",
+        "crinkling",
+        "brushing",
+        "ear_cleaning",
+        "mouth_sounds",
+        "white_noise",
+        "binaural",
+        "visual_asmr",
+        "layered",
+        "roleplay",
+    ],
+    "talking_style": ["whisper", "soft_spoken", "no_talking"],
+    "language": list(LANGUAGE_TAGS),
+}
+
+
+def _build_bag_from_fields(
+    title: Optional[str], description: Optional[str], tags: Optional[Iterable[str]]
+) -> Dict[str, str]:
+    title = (title or "").lower()
+    description = (description or "").lower()
+    tags_joined = " ".join(tags or []).lower()
 
     return {
         "title": title,
@@ -58,6 +81,11 @@ def _build_bag(video: Video) -> Dict[str, str]:
     }
 
 
+def _build_bag(video: Video) -> Dict[str, str]:
+    """Build lowercased search bags for different fields from a Video row."""
+    return _build_bag_from_fields(video.title, video.description, video.tags)
+
+
 def compute_tags_for_video(video: Video) -> List[str]:
     """Compute a list of tags for a single Video using simple keyword rules.
 
@@ -66,7 +94,19 @@ def compute_tags_for_video(video: Video) -> List[str]:
     explainable tagging baseline for the weekly rankings.
     """
 
-    bag_by_field = _build_bag(video)
+    return _apply_rules(_build_bag(video))
+
+
+def compute_tags(
+    title: Optional[str],
+    description: Optional[str],
+    tags: Optional[Iterable[str]] = None,
+) -> List[str]:
+    """Same rules as `compute_tags_for_video`, for payloads that are not ORM rows."""
+    return _apply_rules(_build_bag_from_fields(title, description, tags))
+
+
+def _apply_rules(bag_by_field: Dict[str, str]) -> List[str]:
     tags: set[str] = set()
 
     # Generic rules
@@ -83,3 +123,21 @@ def compute_tags_for_video(video: Video) -> List[str]:
             tags.add("roleplay")
 
     return sorted(tags)
+
+
+def detect_language_from_title(title: str) -> str:
+    """Heuristic language detection based on Unicode ranges.
+
+    This mirrors the frontend RankingExplorer behavior so that Weekly and
+    Browse views (and the language sub-boards) stay consistent.
+    """
+    for ch in title:
+        if "\u3040" <= ch <= "\u30ff" or "\u31f0" <= ch <= "\u31ff":
+            return "ja"
+    for ch in title:
+        if "\uac00" <= ch <= "\ud7af":
+            return "ko"
+    for ch in title:
+        if "\u4e00" <= ch <= "\u9fff":
+            return "zh"
+    return "en"
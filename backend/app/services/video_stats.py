@@ -0,0 +1,189 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.models import Video as VideoModel
+from app.models import VideoStatsHistory
+
+
+@dataclass
+class RetentionPolicy:
+    """How long each resolution of stats history is kept.
+
+    Points younger than `raw_days` are kept as observed (hourly at most),
+    up to `daily_days` the last point per video per day survives, up to
+    `retention_days` the last point per ISO week, and anything older is
+    dropped.
+    """
+
+    raw_days: int = 14
+    daily_days: int = 180
+    retention_days: int = 730
+
+
+def truncate_to_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def select_stale_videos(
+    db: Session,
+    *,
+    now: datetime,
+    stale_after: timedelta,
+    limit: int,
+) -> List[str]:
+    """Return IDs of videos whose stats are due for a refresh.
+
+    Never-refreshed videos come first, then the longest-unrefreshed ones;
+    within the same refresh time the most-viewed videos win, so a capped run
+    spends its quota where growth signals matter most.
+    """
+    cutoff = now - stale_after
+    rows = (
+        db.query(VideoModel.youtube_id)
+        .filter(
+            or_(
+                VideoModel.stats_refreshed_at.is_(None),
+                VideoModel.stats_refreshed_at < cutoff,
+            )
+        )
+        .order_by(
+            VideoModel.stats_refreshed_at.isnot(None),
+            VideoModel.stats_refreshed_at.asc(),
+            VideoModel.view_count.desc(),
+        )
+        .limit(limit)
+        .all()
+    )
+    return [row.youtube_id for row in rows]
+
+
+def record_stats(
+    db: Session,
+    observations: Dict[str, Tuple[int, int]],
+    *,
+    observed_at: datetime,
+    refreshed_ids: Iterable[str] = (),
+) -> int:
+    """Append one history point per video and denormalize it onto `videos`.
+
+    `observations` maps video id -> (view_count, like_count). IDs in
+    `refreshed_ids` that have no observation (deleted or private videos)
+    still get `stats_refreshed_at` bumped so they are not re-polled on every
+    run. A second observation in the same hour replaces the first. Does not
+    commit.
+    """
+    bucket = truncate_to_hour(observed_at)
+    if observations:
+        db.query(VideoStatsHistory).filter(
+            VideoStatsHistory.observed_at == bucket,
+            VideoStatsHistory.video_id.in_(list(observations)),
+        ).delete(synchronize_session=False)
+        db.bulk_insert_mappings(
+            VideoStatsHistory,
+            [
+                {
+                    "video_id": video_id,
+                    "observed_at": bucket,
+                    "view_count": views,
+                    "like_count": likes,
+                }
+                for video_id, (views, likes) in observations.items()
+            ],
+        )
+        db.bulk_update_mappings(
+            VideoModel,
+            [
+                {
+                    "youtube_id": video_id,
+                    "view_count": views,
+                    "like_count": likes,
+                    "stats_refreshed_at": observed_at,
+                }
+                for video_id, (views, likes) in observations.items()
+            ],
+        )
+
+    missing = [video_id for video_id in refreshed_ids if video_id not in observations]
+    if missing:
+        db.query(VideoModel).filter(VideoModel.youtube_id.in_(missing)).update(
+            {VideoModel.stats_refreshed_at: observed_at},
+            synchronize_session=False,
+        )
+    return len(observations)
+
+
+def plan_downsample(
+    points: Iterable[Tuple[str, datetime]],
+    *,
+    now: datetime,
+    policy: RetentionPolicy,
+) -> List[Tuple[str, datetime]]:
+    """Return the (video_id, observed_at) keys that should be deleted.
+
+    `points` must be ordered by video_id then observed_at ascending; the last
+    point in each day/week bucket is the one kept.
+    """
+    raw_cutoff = now - timedelta(days=policy.raw_days)
+    daily_cutoff = now - timedelta(days=policy.daily_days)
+    retention_cutoff = now - timedelta(days=policy.retention_days)
+
+    doomed: List[Tuple[str, datetime]] = []
+    kept_for_bucket: Dict[object, datetime] = {}
+    current_video = None
+    for video_id, observed_at in points:
+        if video_id != current_video:
+            current_video = video_id
+            kept_for_bucket.clear()
+        if observed_at >= raw_cutoff:
+            continue
+        if observed_at < retention_cutoff:
+            doomed.append((video_id, observed_at))
+            continue
+        if observed_at >= daily_cutoff:
+            bucket: object = ("day", observed_at.date())
+        else:
+            bucket = ("week", observed_at.isocalendar()[:2])
+        previous = kept_for_bucket.get(bucket)
+        if previous is not None:
+            doomed.append((video_id, previous))
+        kept_for_bucket[bucket] = observed_at
+    return doomed
+
+
+def downsample_history(
+    db: Session,
+    *,
+    now: datetime,
+    policy: Optional[RetentionPolicy] = None,
+    chunk_size: int = 500,
+) -> int:
+    """Apply `policy` to everything older than the raw window. Commits."""
+    policy = policy or RetentionPolicy()
+    raw_cutoff = now - timedelta(days=policy.raw_days)
+    points = (
+        db.query(VideoStatsHistory.video_id, VideoStatsHistory.observed_at)
+        .filter(VideoStatsHistory.observed_at < raw_cutoff)
+        .order_by(VideoStatsHistory.video_id, VideoStatsHistory.observed_at)
+        .yield_per(chunk_size)
+    )
+    doomed = plan_downsample(points, now=now, policy=policy)
+
+    for start in range(0, len(doomed), chunk_size):
+        chunk = doomed[start : start + chunk_size]
+        db.query(VideoStatsHistory).filter(
+            or_(
+                *[
+                    and_(
+                        VideoStatsHistory.video_id == video_id,
+                        VideoStatsHistory.observed_at == observed_at,
+                    )
+                    for video_id, observed_at in chunk
+                ]
+            )
+        ).delete(synchronize_session=False)
+        db.commit()
+    return len(doomed)
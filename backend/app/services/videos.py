@@ -1,30 +1,27 @@
-from typing import List, Optional, Sequence, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.db.routing import READ_ONLY
 from app.models import Video as VideoModel
 from app.schemas.video import VideoBase
+from app.services.result_cache import (
+    ALL_CHANNELS_TAG,
+    CATALOG_TAG,
+    ResultCache,
+    channel_tag,
+    tag_tag,
+    video_tag,
+)
+from app.services.single_flight import flights, freeze
 from app.services.tag_feedback import build_effective_tags, get_user_tags_map
-from app.services.tagging import compute_tags_for_video
-from app.services.tag_votes import get_tag_vote_scores
+from app.services.tagging import compute_tags, detect_language_from_title
+from app.services.tag_votes import get_tag_vote_scores_map
 
 
-def _detect_language_from_title(title: str) -> str:
-  """Heuristic language detection based on Unicode ranges.
-
-  This mirrors the frontend RankingExplorer behavior so that Weekly and
-  Browse views stay consistent.
-  """
-  for ch in title:
-      if "\u3040" <= ch <= "\u30ff" or "\u31f0" <= ch <= "\u31ff":
-          return "ja"
-  for ch in title:
-      if "\uac00" <= ch <= "\ud7af":
-          return "ko"
-  for ch in title:
-      if "\u4e00" <= ch <= "\u9fff":
-          return "zh"
-  return "en"
+DURATION_BUCKETS = ("short", "medium", "long")
+SORT_KEYS = ("published_desc", "views_desc", "likes_desc")
 
 
 def browse_videos(
@@ -39,7 +36,9 @@ def browse_videos(
     language: Optional[str] = None,
     sort: Optional[str] = None,
     exclude_tags: Optional[Sequence[str]] = None,
-) -> Tuple[List[VideoBase], int]:
+    fields: Optional[Sequence[str]] = None,
+    cache: Optional[ResultCache] = None,
+) -> Tuple[List[Dict[str, Any]], int]:
     """Simple paginated browse over the videos catalog.
 
     Supports:
@@ -47,18 +46,166 @@ def browse_videos(
     - optional filtering by channel_id
     - optional duration_bucket: "short" (2-5 min), "medium" (5-15 min), "long" (>=15 min)
     - optional tags: list of internal computed tag ids (e.g. ["tapping", "no_talking"]).
+    - optional fields: projection from `parse_fields` (compact default).
+    - optional cache: results are cached under the normalized filters
+      (`browse_signature`) and invalidated by the tags from `browse_cache_tags`.
+
+    Concurrent calls with the same normalized filters share one computation
+    (and one cache lookup).
 
     For now tag filtering is applied in Python after computing computed_tags,
     which is acceptable for modest result sizes. We can move this into SQL later
     by persisting computed_tags on the Video model.
     """
+    signature = browse_signature(
+        page=page,
+        page_size=page_size,
+        channel_id=channel_id,
+        channel_ids=channel_ids,
+        duration_bucket=duration_bucket,
+        tags=tags,
+        language=language,
+        sort=sort,
+        exclude_tags=exclude_tags,
+        fields=fields,
+    )
+    if cache is None:
+        return flights.do(
+            "browse_videos", freeze(signature), lambda: _browse_videos(db, **signature)
+        )
+
+    items, total = flights.do(
+        "browse_videos",
+        freeze(signature),
+        lambda: cache.fetch(
+            "browse",
+            signature,
+            browse_cache_tags(signature),
+            lambda: list(_browse_videos(db, **signature)),
+            result_tags=_browse_result_tags(signature),
+        ),
+    )
+    return items, total
+
+
+async def browse_videos_async(
+    db: AsyncSession,
+    *,
+    page: int = 1,
+    page_size: int = 50,
+    channel_id: Optional[str] = None,
+    channel_ids: Optional[Sequence[str]] = None,
+    duration_bucket: Optional[str] = None,
+    tags: Optional[Sequence[str]] = None,
+    language: Optional[str] = None,
+    sort: Optional[str] = None,
+    exclude_tags: Optional[Sequence[str]] = None,
+    fields: Optional[Sequence[str]] = None,
+    cache: Optional[ResultCache] = None,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """`browse_videos` on an async session, with the same caching and coalescing."""
+    signature = browse_signature(
+        page=page,
+        page_size=page_size,
+        channel_id=channel_id,
+        channel_ids=channel_ids,
+        duration_bucket=duration_bucket,
+        tags=tags,
+        language=language,
+        sort=sort,
+        exclude_tags=exclude_tags,
+        fields=fields,
+    )
+
+    async def compute() -> List[Any]:
+        return list(await db.run_sync(_browse_videos, **signature))
+
+    if cache is None:
+        items, total = await flights.do_async("browse_videos", freeze(signature), compute)
+        return items, total
+
+    items, total = await flights.do_async(
+        "browse_videos",
+        freeze(signature),
+        lambda: cache.fetch_async(
+            "browse",
+            signature,
+            browse_cache_tags(signature),
+            compute,
+            result_tags=_browse_result_tags(signature),
+        ),
+    )
+    return items, total
+
+
+def browse_signature(
+    *,
+    page: int = 1,
+    page_size: int = 50,
+    channel_id: Optional[str] = None,
+    channel_ids: Optional[Sequence[str]] = None,
+    duration_bucket: Optional[str] = None,
+    tags: Optional[Sequence[str]] = None,
+    language: Optional[str] = None,
+    sort: Optional[str] = None,
+    exclude_tags: Optional[Sequence[str]] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Dict[str, Any]:
+    """Browse arguments with equivalent spellings collapsed.
+
+    List filters become sorted, de-duplicated lists; unknown sort keys and
+    duration buckets become the values `_browse_videos` falls back to.
+    """
+    return {
+        "page": page if page >= 1 else 1,
+        "page_size": page_size if page_size >= 1 else 50,
+        "channel_id": channel_id or None,
+        "channel_ids": sorted(set(channel_ids or [])),
+        "duration_bucket": duration_bucket if duration_bucket in DURATION_BUCKETS else None,
+        "tags": sorted(set(tags or [])),
+        "language": language or None,
+        "sort": sort if sort in SORT_KEYS else "published_desc",
+        "exclude_tags": sorted(set(exclude_tags or [])),
+        "fields": list(fields or DEFAULT_LIST_FIELDS),
+    }
+
+
+def browse_cache_tags(signature: Dict[str, Any]) -> List[str]:
+    """Invalidation tags of a browse result (see `app.services.result_cache`)."""
+    cache_tags = [CATALOG_TAG]
+    channels = set(signature["channel_ids"])
+    if signature["channel_id"]:
+        channels.add(signature["channel_id"])
+    if channels:
+        cache_tags.extend(channel_tag(channel) for channel in channels)
+    else:
+        cache_tags.append(ALL_CHANNELS_TAG)
+    cache_tags.extend(tag_tag(tag) for tag in signature["tags"] + signature["exclude_tags"])
+    return cache_tags
+
 
-    if page < 1:
-        page = 1
-    if page_size < 1:
-        page_size = 50
+def _browse_result_tags(signature: Dict[str, Any]) -> Callable[[Any], List[str]]:
+    # Pages that show computed_tags also depend on each listed video's feedback.
+    if "computed_tags" not in signature["fields"]:
+        return lambda result: []
+    return lambda result: [video_tag(item["youtube_id"]) for item in result[0]]
 
-    query = db.query(VideoModel)
+
+def _browse_videos(
+    db: Session,
+    *,
+    page: int,
+    page_size: int,
+    channel_id: Optional[str],
+    channel_ids: List[str],
+    duration_bucket: Optional[str],
+    tags: List[str],
+    language: Optional[str],
+    sort: str,
+    exclude_tags: List[str],
+    fields: List[str],
+) -> Tuple[List[Dict[str, Any]], int]:
+    query = db.query(*video_columns(fields))
     # Backwards-compatible single-channel filter.
     if channel_id:
         query = query.filter(VideoModel.channel_id == channel_id)
@@ -101,7 +248,7 @@ def browse_videos(
             .limit(page_size)
             .all()
         )
-        return _serialize_video_rows(db, rows), total
+        return video_rows_to_dicts(db, rows, fields), total
 
     # NOTE: language and tag filters are applied in Python so that we can reuse
     # the same heuristics as the frontend. To keep pagination consistent when
@@ -111,23 +258,26 @@ def browse_videos(
 
     tag_set = set(tags or [])
     exclude_set = set(exclude_tags or [])
-    filtered: List[VideoBase] = []
-    for payload in _serialize_video_rows(db, rows):
+    # The filters below read computed_tags even when the client did not ask
+    # for them; they are dropped again after filtering.
+    filter_fields = fields if "computed_tags" in fields else fields + ["computed_tags"]
+    filtered: List[Dict[str, Any]] = []
+    for row, payload in zip(rows, video_rows_to_dicts(db, rows, filter_fields)):
 
         # Optional language filter using the same heuristic as the frontend
         # (RankingExplorer) so that classification stays consistent.
         if language:
-            detected = _detect_language_from_title(payload.title or "")
+            detected = detect_language_from_title(row.title or "")
             if detected != language:
                 continue
 
         # Exclude videos that contain any of the excluded tags.
-        if exclude_set and any(tag in payload.computed_tags for tag in exclude_set):
+        if exclude_set and any(tag in payload["computed_tags"] for tag in exclude_set):
             continue
 
         if tag_set:
             # Require at least one overlap between requested tags and computed_tags.
-            if not any(tag in payload.computed_tags for tag in tag_set):
+            if not any(tag in payload["computed_tags"] for tag in tag_set):
                 continue
         filtered.append(payload)
 
@@ -135,35 +285,112 @@ def browse_videos(
     start = (page - 1) * page_size
     end = start + page_size
     items = filtered[start:end]
+    if filter_fields is not fields:
+        for payload in items:
+            payload.pop("computed_tags", None)
 
     return items, total
 
 
-def _serialize_video_rows(db: Session, rows: Sequence[VideoModel]) -> List[VideoBase]:
-    computed_tags_updated = False
-    user_tags_by_video = get_user_tags_map(db, [video.youtube_id for video in rows])
-    payloads: List[VideoBase] = []
+# All `VideoBase` fields, in schema order.
+VIDEO_FIELDS = list(VideoBase.__fields__)
+# List endpoints leave the (unbounded) description out unless asked for it;
+# only the detail endpoint returns it by default.
+DEFAULT_LIST_FIELDS = [name for name in VIDEO_FIELDS if name != "description"]
+# Always selected: the key, plus what tagging and the Python-side filters read.
+_REQUIRED_COLUMNS = ("youtube_id", "title", "tags", "computed_tags")
+
+
+def parse_fields(raw: Optional[str]) -> List[str]:
+    """Parse a `fields=` value into known field names, in schema order.
+
+    `None`/empty selects the compact default, `*` selects every field, and
+    `youtube_id` is always included. Raises ValueError on unknown names.
+    """
+    if not raw or not raw.strip():
+        return list(DEFAULT_LIST_FIELDS)
+    if raw.strip() == "*":
+        return list(VIDEO_FIELDS)
+    requested = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = requested.difference(VIDEO_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    requested.add("youtube_id")
+    return [name for name in VIDEO_FIELDS if name in requested]
+
 
-    for video in rows:
-        payload = VideoBase.from_orm(video)
+def video_columns(fields: Sequence[str]) -> List[Any]:
+    """Columns to select for a projection; `description` only when requested."""
+    names = [name for name in VIDEO_FIELDS if name in fields or name in _REQUIRED_COLUMNS]
+    return [getattr(VideoModel, name) for name in names]
 
-        if video.computed_tags:
-            auto_tags = list(video.computed_tags)
+
+def video_rows_to_dicts(
+    db: Session,
+    rows: Sequence[Any],
+    fields: Sequence[str] = DEFAULT_LIST_FIELDS,
+) -> List[Dict[str, Any]]:
+    """Build `VideoBase`-shaped dicts, restricted to `fields`, from rows
+    selected with `video_columns(fields)`.
+
+    This is the list endpoints' fast path: no ORM objects and no per-row
+    pydantic validation. Rows without persisted computed_tags are tagged once
+    and written back in a single bulk update (skipped on read-only replica
+    sessions, where the tags are only computed).
+    """
+    with_tags = "computed_tags" in fields
+    video_ids = [row.youtube_id for row in rows] if with_tags else []
+    user_tags_by_video = get_user_tags_map(db, video_ids)
+    vote_scores_by_video = get_tag_vote_scores_map(db, video_ids)
+    untagged = [row.youtube_id for row in rows if with_tags and not row.computed_tags]
+    descriptions: Dict[str, Optional[str]] = {}
+    if untagged and "description" not in fields:
+        # Tagging reads the description; fetch it only for the rows that need it.
+        descriptions = dict(
+            db.query(VideoModel.youtube_id, VideoModel.description)
+            .filter(VideoModel.youtube_id.in_(untagged))
+            .all()
+        )
+
+    backfilled: List[Dict[str, Any]] = []
+    payloads: List[Dict[str, Any]] = []
+    for row in rows:
+        payload = {name: getattr(row, name) for name in fields if name != "computed_tags"}
+        if "tags" in payload:
+            payload["tags"] = payload["tags"] or []
+
+        payloads.append(payload)
+        if not with_tags:
+            continue
+
+        if row.computed_tags:
+            auto_tags = list(row.computed_tags)
         else:
-            auto_tags = compute_tags_for_video(video)
-            video.computed_tags = auto_tags
-            db.add(video)
-            computed_tags_updated = True
+            description = descriptions.get(row.youtube_id, getattr(row, "description", None))
+            auto_tags = compute_tags(row.title, description, row.tags)
+            backfilled.append({"youtube_id": row.youtube_id, "computed_tags": auto_tags})
 
-        payload.computed_tags = build_effective_tags(
+        payload["computed_tags"] = build_effective_tags(
             auto_tags=auto_tags,
-            vote_scores=get_tag_vote_scores(db, video.youtube_id),
-            user_tags=user_tags_by_video.get(video.youtube_id, []),
+            vote_scores=vote_scores_by_video.get(row.youtube_id, {}),
+            user_tags=user_tags_by_video.get(row.youtube_id, []),
         )
-        payloads.append(payload)
 
-    if computed_tags_updated:
+    if backfilled and not db.info.get(READ_ONLY):
+        db.bulk_update_mappings(VideoModel, backfilled)
         db.commit()
 
     return payloads
 
+
+def fetch_video_detail(db: Session, video_id: str) -> Optional[Dict[str, Any]]:
+    """Full `VideoBase` payload for one video, description included."""
+    fields = list(VIDEO_FIELDS)
+    row = db.query(*video_columns(fields)).filter(VideoModel.youtube_id == video_id).first()
+    if row is None:
+        return None
+    return video_rows_to_dicts(db, [row], fields)[0]
+
+
+async def fetch_video_detail_async(db: AsyncSession, video_id: str) -> Optional[Dict[str, Any]]:
+    return await db.run_sync(fetch_video_detail, video_id)
@@ -0,0 +1 @@
+"""Service-level microbenchmarks over a seeded synthetic catalog (see `benchmarks.run`)."""
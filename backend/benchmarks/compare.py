@@ -0,0 +1,63 @@
+"""Compare two benchmark result files.
+
+    python -m benchmarks.compare OLD.json NEW.json [--threshold 10]
+
+Prints each benchmark's median in both runs and the change. Exits with
+status 1 when any benchmark's median got slower by more than `--threshold`
+percent, so CI can gate on it. Comparing runs on different databases or
+catalog sizes is allowed but flagged.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+
+def load(path: str) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], threshold: float) -> Tuple[List[str], List[str]]:
+    """(report lines, names of benchmarks that regressed past `threshold` %)."""
+    lines = []
+    for key in ("dialect", "catalog"):
+        if old["meta"].get(key) != new["meta"].get(key):
+            lines.append(f"warning: {key} differs: {old['meta'].get(key)} vs {new['meta'].get(key)}")
+
+    regressions = []
+    lines.append(f"{'benchmark':<44} {'old ms':>10} {'new ms':>10} {'change':>8}")
+    for name in sorted(set(old["results"]) | set(new["results"])):
+        before = old["results"].get(name)
+        after = new["results"].get(name)
+        if before is None or after is None:
+            lines.append(f"{name:<44} {'only in ' + ('new' if before is None else 'old'):>30}")
+            continue
+        change = (after["median_ms"] - before["median_ms"]) / before["median_ms"] * 100 if before["median_ms"] else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        lines.append(f"{name:<44} {before['median_ms']:>10.3f} {after['median_ms']:>10.3f} {change:>+7.1f}%{flag}")
+    return lines, regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed slowdown of a median, in percent")
+    args = parser.parse_args()
+
+    old, new = load(args.old), load(args.new)
+    print(f"old: {old['meta'].get('commit')}  new: {new['meta'].get('commit')}")
+    lines, regressions = compare(old, new, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower by more than {args.threshold:g}%", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""HTTP load generator for a running API, with latency percentiles per route.
+
+Usage (from backend/), against an app started separately, e.g. on a
+synthetic catalog:
+
+    python -m benchmarks.run --generate-only --videos 50000 --database-url sqlite:///bench.db
+    DATABASE_URL=sqlite:///bench.db uvicorn app.main:app --workers 2
+
+    python -m benchmarks.load --base-url http://127.0.0.1:8000 \
+        --concurrency 32 --duration 60 \
+        --mix weekly=30,browse=10,browse_deep=10,browse_filtered=25,vote=10,channels=15
+
+Each of `--concurrency` workers sends requests back to back, picking a
+scenario by the `--mix` weights, for `--duration` seconds or until
+`--requests` have been sent. Requests during the first `--warmup` seconds
+are not recorded. IDs for votes and channel filters are discovered from
+the API first.
+
+The report gives, per scenario and overall, p50/p95/p99/max latency,
+throughput and error rate (any status >= 400 or a failed connection). It
+prints as a table; `--json` writes it to a file too.
+
+CI mode: any budget (`--max-p95-ms`, `--max-p99-ms`, `--max-error-rate`,
+`--min-rps`, or a `--budget` JSON file with per-scenario overrides) makes
+the run exit 1 when a scenario exceeds it:
+
+    {"default": {"p95_ms": 250, "error_rate": 0.01},
+     "scenarios": {"vote": {"p95_ms": 500}, "weekly": {"throughput_rps": 50}}}
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import requests
+
+
+DEFAULT_MIX = "weekly=30,browse=10,browse_deep=10,browse_filtered=25,vote=10,channels=15"
+FILTER_TAGS = ["tapping", "whisper", "no_talking", "binaural", "mouth_sounds", "roleplay"]
+VOTE_TAGS = ["tapping", "whisper", "no_talking", "binaural", "roleplay"]
+# Budget keys that are upper bounds; everything else (throughput) is a lower bound.
+MAX_BUDGETS = ("p50_ms", "p95_ms", "p99_ms", "error_rate")
+
+Request = Tuple[str, str, Optional[Dict[str, Any]], Dict[str, str]]
+
+
+@dataclass
+class Targets:
+    video_ids: List[str]
+    channel_ids: List[str]
+
+
+def _weekly(rng: random.Random, targets: Targets) -> Request:
+    return "GET", "/api/rankings/weekly", None, {}
+
+
+def _browse(rng: random.Random, targets: Targets) -> Request:
+    return "GET", "/api/videos?page=1", None, {}
+
+
+def _browse_deep(rng: random.Random, targets: Targets) -> Request:
+    return "GET", f"/api/videos?page={rng.randint(20, 200)}", None, {}
+
+
+def _browse_filtered(rng: random.Random, targets: Targets) -> Request:
+    params = [f"tags={rng.choice(FILTER_TAGS)}"]
+    if rng.random() < 0.5:
+        params.append(f"duration_bucket={rng.choice(['short', 'medium', 'long'])}")
+    if rng.random() < 0.3:
+        params.append(f"language={rng.choice(['en', 'ja', 'ko', 'zh'])}")
+    if targets.channel_ids and rng.random() < 0.3:
+        params.append(f"channels={','.join(rng.sample(targets.channel_ids, min(3, len(targets.channel_ids))))}")
+    if rng.random() < 0.3:
+        params.append(f"sort={rng.choice(['views_desc', 'likes_desc'])}")
+    return "GET", f"/api/videos?{'&'.join(params)}", None, {}
+
+
+def _vote(rng: random.Random, targets: Targets) -> Request:
+    video_id = rng.choice(targets.video_ids)
+    headers = {"X-User-Fingerprint": f"load-{rng.randrange(10_000)}"}
+    return "POST", f"/api/videos/{video_id}/tags/{rng.choice(VOTE_TAGS)}/vote", {"vote": rng.choice((1, -1))}, headers
+
+
+def _channels(rng: random.Random, targets: Targets) -> Request:
+    return "GET", "/api/channels/popular", None, {}
+
+
+SCENARIOS: Dict[str, Callable[[random.Random, Targets], Request]] = {
+    "weekly": _weekly,
+    "browse": _browse,
+    "browse_deep": _browse_deep,
+    "browse_filtered": _browse_filtered,
+    "vote": _vote,
+    "channels": _channels,
+}
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """`name=weight,...` -> {name: weight}; raises ValueError on unknown names."""
+    mix: Dict[str, float] = {}
+    for part in spec.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {name!r}; known: {', '.join(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+
+def discover_targets(session: requests.Session, base_url: str) -> Targets:
+    videos = session.get(f"{base_url}/api/videos", params={"page_size": 100, "fields": "youtube_id"})
+    videos.raise_for_status()
+    channels = session.get(f"{base_url}/api/channels/popular", params={"limit": 20})
+    channels.raise_for_status()
+    return Targets(
+        video_ids=[item["youtube_id"] for item in videos.json()["items"]],
+        channel_ids=[item["channel_id"] for item in channels.json()],
+    )
+
+
+@dataclass
+class ScenarioStats:
+    latencies: List[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: int = 0
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.stats: Dict[str, ScenarioStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, scenario: str, seconds: float, status: int) -> None:
+        with self._lock:
+            stats = self.stats.setdefault(scenario, ScenarioStats())
+            stats.latencies.append(seconds * 1000)
+            stats.statuses[status] += 1
+            if status == 0 or status >= 400:
+                stats.errors += 1
+
+
+def _percentile(ordered: Sequence[float], fraction: float) -> float:
+    # Nearest rank.
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+def summarize(stats: ScenarioStats, elapsed: float) -> Dict[str, Any]:
+    ordered = sorted(stats.latencies)
+    count = len(ordered)
+    return {
+        "requests": count,
+        "errors": stats.errors,
+        "error_rate": round(stats.errors / count, 4) if count else 0.0,
+        "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(ordered) / count, 2) if count else None,
+        "p50_ms": round(_percentile(ordered, 0.50), 2) if count else None,
+        "p95_ms": round(_percentile(ordered, 0.95), 2) if count else None,
+        "p99_ms": round(_percentile(ordered, 0.99), 2) if count else None,
+        "max_ms": round(ordered[-1], 2) if count else None,
+        "statuses": {str(status): n for status, n in sorted(stats.statuses.items())},
+    }
+
+
+def run_load(
+    session_factory: Callable[[], requests.Session],
+    base_url: str,
+    mix: Dict[str, float],
+    *,
+    concurrency: int = 8,
+    duration: Optional[float] = None,
+    max_requests: Optional[int] = None,
+    warmup: float = 0.0,
+    seed: int = 42,
+    timeout: float = 30.0,
+    targets: Optional[Targets] = None,
+) -> Dict[str, Any]:
+    """Drive `base_url` with `mix` and return the report (see module docs)."""
+    if duration is None and max_requests is None:
+        raise ValueError("Give a duration or a request count")
+    base_url = base_url.rstrip("/")
+    if targets is None:
+        targets = discover_targets(session_factory(), base_url)
+    if "vote" in mix and not targets.video_ids:
+        raise ValueError("The vote scenario needs at least one video in the catalog")
+
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    recorder = Recorder()
+    budget = threading.Semaphore(max_requests) if max_requests is not None else None
+    started = time.perf_counter()
+    record_from = started + warmup
+    deadline = record_from + duration if duration is not None else None
+
+    def worker(index: int) -> None:
+        rng = random.Random(seed + index)
+        session = session_factory()
+        while deadline is None or time.perf_counter() < deadline:
+            if budget is not None and not budget.acquire(blocking=False):
+                return
+            name = rng.choices(names, weights)[0]
+            method, path, body, headers = SCENARIOS[name](rng, targets)
+            sent = time.perf_counter()
+            try:
+                status = session.request(method, base_url + path, json=body, headers=headers, timeout=timeout).status_code
+            except requests.RequestException:
+                status = 0
+            if sent >= record_from:
+                recorder.record(name, time.perf_counter() - sent, status)
+
+    threads = [threading.Thread(target=worker, args=(n,), daemon=True) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - record_from
+
+    total = ScenarioStats()
+    for stats in recorder.stats.values():
+        total.latencies.extend(stats.latencies)
+        total.statuses.update(stats.statuses)
+        total.errors += stats.errors
+    return {
+        "meta": {
+            "base_url": base_url,
+            "mix": mix,
+            "concurrency": concurrency,
+            "duration_seconds": round(elapsed, 2),
+            "warmup_seconds": warmup,
+            "seed": seed,
+        },
+        "scenarios": {name: summarize(stats, elapsed) for name, stats in sorted(recorder.stats.items())},
+        "total": summarize(total, elapsed),
+    }
+
+
+def check_budgets(report: Dict[str, Any], budgets: Dict[str, Any]) -> List[str]:
+    """Violations of `budgets` ({"default": {...}, "scenarios": {name: {...}}})."""
+    violations = []
+    for name, stats in report["scenarios"].items():
+        limits = {**budgets.get("default", {}), **budgets.get("scenarios", {}).get(name, {})}
+        for key, limit in limits.items():
+            value = stats.get(key)
+            if value is None:
+                continue
+            if key in MAX_BUDGETS and value > limit:
+                violations.append(f"{name}: {key} {value} > {limit}")
+            elif key not in MAX_BUDGETS and value < limit:
+                violations.append(f"{name}: {key} {value} < {limit}")
+    return violations
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    columns = ("requests", "throughput_rps", "error_rate", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+    lines = [f"{'scenario':<18}" + "".join(f"{column:>16}" for column in columns)]
+    for name, stats in [*report["scenarios"].items(), ("TOTAL", report["total"])]:
+        lines.append(f"{name:<18}" + "".join(f"{str(stats[column]):>16}" for column in columns))
+    return "\n".join(lines)
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load-test a running TingleRadar API.")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Scenario weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, help="Seconds to record (default 30 unless --requests)")
+    parser.add_argument("--requests", type=int, help="Stop after this many requests")
+    parser.add_argument("--warmup", type=float, default=0.0, help="Unrecorded seconds before --duration")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="Also write the report to this file")
+    parser.add_argument("--budget", help="JSON file of per-scenario budgets")
+    parser.add_argument("--max-p95-ms", type=float)
+    parser.add_argument("--max-p99-ms", type=float)
+    parser.add_argument("--max-error-rate", type=float)
+    parser.add_argument("--min-rps", type=float, help="Minimum throughput per scenario")
+    args = parser.parse_args()
+    if args.duration is None and args.requests is None:
+        args.duration = 30.0
+    return args
+
+
+def main() -> None:
+    args = parse_arguments()
+    budgets: Dict[str, Any] = {}
+    if args.budget:
+        with open(args.budget, encoding="utf-8") as budget_file:
+            budgets = json.load(budget_file)
+    for key, value in (
+        ("p95_ms", args.max_p95_ms),
+        ("p99_ms", args.max_p99_ms),
+        ("error_rate", args.max_error_rate),
+        ("throughput_rps", args.min_rps),
+    ):
+        if value is not None:
+            budgets.setdefault("default", {})[key] = value
+
+    report = run_load(
+        requests.Session,
+        args.base_url,
+        parse_mix(args.mix),
+        concurrency=args.concurrency,
+        duration=args.duration,
+        max_requests=args.requests,
+        warmup=args.warmup,
+        seed=args.seed,
+    )
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as output:
+            json.dump({**report, "budgets": budgets}, output, indent=2)
+
+    violations = check_budgets(report, budgets)
+    if violations:
+        print("Budget exceeded:\n  " + "\n  ".join(violations), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,578 @@
+"""Record the ingestion pipeline's API traffic once, then replay it offline.
+
+Usage (from backend/):
+
+    # Run fetch_rankings and fetch_channel_videos against the real YouTube
+    # API and save every response. Writes never leave a scratch SQLite file.
+    YOUTUBE_API_KEY=... python -m benchmarks.replay record benchmarks/fixtures/weekly.jsonl.gz
+
+    # Run the same pipeline from the fixture: no network, no Supabase
+    python -m benchmarks.replay replay benchmarks/fixtures/weekly.jsonl.gz --repeat 5
+
+    # With 80±20 ms per response and 2% of responses failing with a 503
+    python -m benchmarks.replay replay benchmarks/fixtures/weekly.jsonl.gz \
+        --latency-ms 80 --jitter-ms 20 --error-rate 0.02 --error-on supabase
+
+    python -m benchmarks.compare benchmarks/results/<old>.json benchmarks/results/<new>.json
+
+Both scripts run as subprocesses, exactly as in production, with
+`YOUTUBE_API_BASE_URL` and `SUPABASE_URL` pointing at an `IngestionStub`
+and `DATABASE_URL` at a fresh SQLite file per run. The stub answers:
+
+* YouTube (`/youtube/v3/...`): forwarded to the real API and recorded, or
+  served from the fixture on replay. A request the fixture has no response
+  for gets a 404 and is reported as a miss.
+* Supabase (`/rest/v1/...`): the video upserts and RPCs the scripts call
+  are emulated on the SQLite file. When recording with `SUPABASE_URL` and
+  `SUPABASE_SERVICE_ROLE_KEY` set, reads (community tag votes) are forwarded
+  there and recorded too; writes never are.
+
+The fixture is gzipped JSON lines: a header with the recording time, the
+creator watchlist and each script's arguments, then one line per response.
+API keys are never stored. Replays pin the scripts' clock to the recording
+time (`INGESTION_NOW`), so every replay sends the same requests and builds
+the same boards. The report has the same shape as `benchmarks.run`'s.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import re
+import shlex
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, deque
+from datetime import date, datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+import requests
+
+# The app's settings are read at import time; the stub only uses the SQLite
+# file it is given, and the scripts get their settings from the environment.
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "benchmark")
+
+from sqlalchemy import create_engine, func  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+import app.models  # noqa: E402,F401  (registers every table on Base)
+from app.db.base import Base  # noqa: E402
+from app.models import CreatorWatchlist, RankingItem, RankingList, Video, VideoTagVote  # noqa: E402
+from app.services.invalidation import bump_versions  # noqa: E402
+from benchmarks.run import RESULTS_DIR, git_revision  # noqa: E402
+
+
+FIXTURE_VERSION = 1
+YOUTUBE_UPSTREAM = "https://www.googleapis.com"
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+REPO_ROOT = BACKEND_DIR.parent
+STAGES = ("fetch_rankings", "fetch_channel_videos")
+DEFAULT_STAGE_ARGS = {
+    "fetch_rankings": ["--top", "60", "--per-query", "40"],
+    "fetch_channel_videos": ["--days", "365", "--per-channel", "20"],
+}
+# Query parameters left out of fixture keys and never written to a fixture.
+SECRET_PARAMS = {"key"}
+# Columns of the `videos` upsert `fetch_rankings` sends.
+VIDEO_COLUMNS = (
+    "youtube_id", "title", "description", "channel_title", "channel_id", "published_at",
+    "view_count", "like_count", "duration", "tags", "thumbnail_url",
+)
+STUB_COUNTERS = (
+    "requests", "youtube", "supabase", "replayed", "forwarded", "emulated", "misses", "injected_errors",
+)
+LABEL_DATE = re.compile(r"(\d{4}-\d{2}-\d{2})$")
+
+
+def request_key(method: str, path: str, query: str) -> str:
+    """How a request is matched to a recorded response: method, path and
+    sorted query parameters, without the API key."""
+    params = sorted(
+        (name, value)
+        for name, value in parse_qsl(query, keep_blank_values=True)
+        if name not in SECRET_PARAMS
+    )
+    return f"{method} {path}?{urlencode(params)}"
+
+
+def save_fixture(path: str, meta: Dict[str, Any], exchanges: List[Dict[str, Any]]) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(path, "wt", encoding="utf-8") as handle:
+        handle.write(json.dumps({**meta, "version": FIXTURE_VERSION, "exchanges": len(exchanges)}) + "\n")
+        for exchange in exchanges:
+            handle.write(json.dumps(exchange, separators=(",", ":")) + "\n")
+
+
+def load_fixture(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """(header, exchanges); each exchange is {key, status, body, elapsed_ms}."""
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        meta = json.loads(handle.readline())
+        if meta.get("version") != FIXTURE_VERSION:
+            raise ValueError(f"{path}: unsupported fixture version {meta.get('version')!r}")
+        return meta, [json.loads(line) for line in handle if line.strip()]
+
+
+def upsert_videos(db: Session, videos: List[Dict[str, Any]]) -> None:
+    """A `videos?on_conflict=youtube_id` merge-duplicates upsert. Does not commit."""
+    for row in videos:
+        values = {column: row[column] for column in VIDEO_COLUMNS if column in row}
+        values["published_at"] = datetime.fromisoformat(values["published_at"])
+        db.merge(Video(**values))
+
+
+def persist_ranking_boards(db: Session, boards: List[Dict[str, Any]]) -> Dict[str, int]:
+    """SQLAlchemy version of the `persist_ranking_boards` Postgres function:
+    replaces each (name, board) list's items."""
+    list_ids = {}
+    for board in boards:
+        ranking = (
+            db.query(RankingList)
+            .filter(RankingList.name == board["name"], RankingList.board == board["board"])
+            .order_by(RankingList.id.desc())
+            .first()
+        )
+        if ranking is None:
+            # The label_date trigger takes the date from the list name.
+            match = LABEL_DATE.search(board["name"])
+            ranking = RankingList(
+                name=board["name"],
+                board=board["board"],
+                description=board["description"],
+                label_date=date.fromisoformat(match.group(1)) if match else datetime.utcnow().date(),
+            )
+            db.add(ranking)
+            db.flush()
+        else:
+            ranking.description = board["description"]
+            db.query(RankingItem).filter(RankingItem.ranking_list_id == ranking.id).delete()
+        for item in board["items"]:
+            db.add(
+                RankingItem(
+                    ranking_list_id=ranking.id,
+                    video_id=item["video_id"],
+                    position=item["position"],
+                    score=item.get("score"),
+                    score_components=item.get("score_components"),
+                )
+            )
+        list_ids[board["board"]] = ranking.id
+    db.commit()
+    return list_ids
+
+
+class IngestionStub:
+    """Local stand-in for YouTube and Supabase during one record or replay run.
+
+    `exchanges` are a fixture's recorded responses. A key recorded several
+    times is answered in recording order, repeating the last response once
+    they run out. With `upstream` set, YouTube requests the fixture cannot
+    answer are forwarded there and recorded in `recorded` instead.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        *,
+        exchanges: Iterable[Dict[str, Any]] = (),
+        upstream: Optional[str] = None,
+        supabase_upstream: Optional[Tuple[str, str]] = None,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        recorded_latency: bool = False,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        error_on: str = "all",
+        seed: int = 42,
+    ) -> None:
+        self.engine = engine
+        self.upstream = upstream
+        self.supabase_upstream = supabase_upstream
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.recorded_latency = recorded_latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.error_on = error_on
+        self.responses: Dict[str, Deque[Dict[str, Any]]] = {}
+        for exchange in exchanges:
+            self.responses.setdefault(exchange["key"], deque()).append(exchange)
+        self.recorded: List[Dict[str, Any]] = []
+        self.missed: List[str] = []
+        self.counts: Counter = Counter(dict.fromkeys(STUB_COUNTERS, 0))
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        # SQLite takes one writer at a time; so does the emulation.
+        self._db_lock = threading.Lock()
+        self._http = requests.Session()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "IngestionStub":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._http.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counts, "missed": list(self.missed)}
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                stub._dispatch(self)
+
+            def do_POST(self) -> None:
+                stub._dispatch(self)
+
+        return Handler
+
+    def _dispatch(self, handler: BaseHTTPRequestHandler) -> None:
+        parsed = urlparse(handler.path)
+        length = int(handler.headers.get("Content-Length") or 0)
+        raw = handler.rfile.read(length) if length else b""
+        if handler.headers.get("Content-Encoding") == "gzip":
+            raw = gzip.decompress(raw)
+        service = "supabase" if parsed.path.startswith("/rest/v1/") else "youtube"
+        key = request_key(handler.command, parsed.path, parsed.query)
+
+        with self._lock:
+            self.counts["requests"] += 1
+            self.counts[service] += 1
+            inject = self.error_on in ("all", service) and self._rng.random() < self.error_rate
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+
+        if inject:
+            with self._lock:
+                self.counts["injected_errors"] += 1
+            status, body, elapsed_ms = self.error_status, {"message": "injected failure"}, self.latency_ms
+        else:
+            status, body, elapsed_ms = self._respond(service, key, handler, parsed.query, raw)
+        delay_ms = (elapsed_ms if self.recorded_latency else self.latency_ms) + jitter
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+        encoded = json.dumps(body).encode("utf-8") if body is not None else b""
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(encoded)))
+        handler.end_headers()
+        handler.wfile.write(encoded)
+
+    def _respond(
+        self, service: str, key: str, handler: BaseHTTPRequestHandler, query: str, raw: bytes
+    ) -> Tuple[int, Any, float]:
+        with self._lock:
+            queue = self.responses.get(key)
+            recorded = (queue.popleft() if len(queue) > 1 else queue[0]) if queue else None
+            if recorded is not None:
+                self.counts["replayed"] += 1
+        if recorded is not None:
+            return recorded["status"], recorded["body"], recorded.get("elapsed_ms", 0.0)
+
+        path = urlparse(handler.path).path
+        if service == "youtube" and self.upstream:
+            return self._forward(key, f"{self.upstream}{path}", query, {})
+        if service == "supabase" and handler.command == "GET" and self.supabase_upstream:
+            url, service_key = self.supabase_upstream
+            headers = {"apikey": service_key, "Authorization": f"Bearer {service_key}"}
+            return self._forward(key, f"{url.rstrip('/')}{path}", query, headers)
+        if service == "youtube":
+            with self._lock:
+                self.counts["misses"] += 1
+                self.missed.append(key)
+            return 404, {"error": {"code": 404, "message": f"no recorded response for {key}"}}, 0.0
+
+        with self._lock:
+            self.counts["emulated"] += 1
+        params = dict(parse_qsl(query, keep_blank_values=True))
+        payload = json.loads(raw) if raw else None
+        with self._db_lock:
+            status, body = self._emulate_supabase(handler.command, path[len("/rest/v1/"):], params, payload)
+        return status, body, 0.0
+
+    def _forward(self, key: str, url: str, query: str, headers: Dict[str, str]) -> Tuple[int, Any, float]:
+        started = time.perf_counter()
+        response = self._http.get(url, params=parse_qsl(query, keep_blank_values=True), headers=headers, timeout=30)
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        body = response.json() if response.content else None
+        with self._lock:
+            self.counts["forwarded"] += 1
+            self.recorded.append({"key": key, "status": response.status_code, "body": body, "elapsed_ms": elapsed_ms})
+        return response.status_code, body, 0.0
+
+    def _emulate_supabase(self, method: str, path: str, params: Dict[str, str], payload: Any) -> Tuple[int, Any]:
+        """The PostgREST calls `fetch_rankings` makes, on the SQLite file."""
+        if method == "GET" and path == "video_tag_votes":
+            video_ids = params.get("video_id", "")
+            video_ids = video_ids[4:-1].split(",") if video_ids.startswith("in.(") else []
+            with Session(self.engine, future=True) as db:
+                rows = db.query(VideoTagVote.video_id, VideoTagVote.vote).filter(VideoTagVote.video_id.in_(video_ids))
+                return 200, [{"video_id": video_id, "vote": vote} for video_id, vote in rows]
+        if method == "POST" and path == "videos" and params.get("on_conflict") == "youtube_id":
+            with Session(self.engine, future=True) as db:
+                upsert_videos(db, payload)
+                db.commit()
+            return 201, None
+        if method == "POST" and path == "rpc/persist_ranking_boards":
+            with Session(self.engine, future=True) as db:
+                return 200, persist_ranking_boards(db, payload["p_boards"])
+        if method == "POST" and path == "rpc/bump_cache_versions":
+            with self.engine.begin() as connection:
+                return 200, bump_versions(connection, payload["p_tags"])
+        return 404, {"message": f"{method} {path} is not emulated"}
+
+
+def prepare_database(path: str, watchlist: List[Dict[str, Any]]) -> Engine:
+    engine = create_engine(f"sqlite:///{path}", future=True)
+    Base.metadata.create_all(engine)
+    with Session(engine, future=True) as db:
+        for creator in watchlist:
+            db.add(CreatorWatchlist(**creator, is_active=True))
+        db.commit()
+    return engine
+
+
+def run_stage(stage: str, args: List[str], env: Dict[str, str]) -> Dict[str, Any]:
+    """Run one ingestion script as the weekly job does; wall time includes
+    interpreter start-up and imports."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-m", f"backend.scripts.{stage}", *args],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    outcome = {"returncode": result.returncode, "seconds": round(time.perf_counter() - started, 3)}
+    if result.returncode:
+        outcome["stderr_tail"] = result.stderr.strip().splitlines()[-20:]
+    return outcome
+
+
+def stage_environment(stub: IngestionStub, database_path: str, api_key: str, now: str) -> Dict[str, str]:
+    return {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([str(BACKEND_DIR), str(REPO_ROOT)]),
+        "DATABASE_URL": f"sqlite:///{database_path}",
+        # Anything from .env that would reach a real service.
+        "ASYNC_DATABASE_URL": "",
+        "REPLICA_DATABASE_URL": "",
+        "RESULT_CACHE_URL": "",
+        "SUPABASE_URL": stub.url,
+        "SUPABASE_SERVICE_ROLE_KEY": "replay",
+        "YOUTUBE_API_BASE_URL": stub.url,
+        "YOUTUBE_API_KEY": api_key,
+        "INGESTION_NOW": now,
+    }
+
+
+def run_pipeline(
+    stub_options: Dict[str, Any],
+    *,
+    watchlist: List[Dict[str, Any]],
+    stages: Dict[str, List[str]],
+    api_key: str,
+    now: str,
+) -> Tuple[Dict[str, Any], IngestionStub]:
+    """One pass of every stage on a fresh SQLite file; (run report, stub)."""
+    handle, database_path = tempfile.mkstemp(suffix=".db", prefix="tingleradar-replay-")
+    os.close(handle)
+    engine = prepare_database(database_path, watchlist)
+    stub = IngestionStub(engine, **stub_options).start()
+    try:
+        env = stage_environment(stub, database_path, api_key, now)
+        outcomes = {stage: run_stage(stage, stages[stage], env) for stage in STAGES}
+        with Session(engine, future=True) as db:
+            rows = {
+                "videos": db.query(func.count(Video.youtube_id)).scalar(),
+                "ranking_lists": db.query(func.count(RankingList.id)).scalar(),
+                "ranking_items": db.query(func.count(RankingItem.id)).scalar(),
+            }
+    finally:
+        stub.stop()
+        engine.dispose()
+        os.remove(database_path)
+    return {"stages": outcomes, "rows": rows, "stub": stub.stats()}, stub
+
+
+def default_watchlist() -> List[Dict[str, Any]]:
+    from backend.scripts.seed_creators import SEED_CREATORS
+
+    return [
+        {key: creator[key] for key in ("channel_id", "channel_title", "priority")}
+        for creator in SEED_CREATORS
+    ]
+
+
+def record(args: argparse.Namespace) -> None:
+    api_key = args.api_key or os.getenv("YOUTUBE_API_KEY")
+    if not api_key:
+        sys.exit("record: set YOUTUBE_API_KEY or pass --api-key")
+    watchlist = (
+        [{"channel_id": channel_id, "channel_title": channel_id, "priority": 1} for channel_id in args.channel]
+        if args.channel
+        else default_watchlist()
+    )
+    stages = {
+        "fetch_rankings": shlex.split(args.rankings_args),
+        "fetch_channel_videos": shlex.split(args.channel_args),
+    }
+    supabase = (os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_SERVICE_ROLE_KEY"))
+    now = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+
+    run, stub = run_pipeline(
+        {"upstream": args.upstream, "supabase_upstream": supabase if all(supabase) else None},
+        watchlist=watchlist,
+        stages=stages,
+        api_key=api_key,
+        now=now,
+    )
+    for stage, outcome in run["stages"].items():
+        if outcome["returncode"]:
+            print("\n".join(outcome["stderr_tail"]), file=sys.stderr)
+            sys.exit(f"record: {stage} failed; no fixture written")
+    save_fixture(args.fixture, {"recorded_at": now, "watchlist": watchlist, "stages": stages}, stub.recorded)
+    print(f"Recorded {len(stub.recorded)} responses to {args.fixture} ({run['rows']})", file=sys.stderr)
+
+
+def summarize(samples: List[float]) -> Dict[str, Any]:
+    samples_ms = [seconds * 1000 for seconds in samples]
+    return {
+        "repeat": len(samples_ms),
+        "min_ms": round(min(samples_ms), 3),
+        "median_ms": round(statistics.median(samples_ms), 3),
+        "max_ms": round(max(samples_ms), 3),
+    }
+
+
+def replay(args: argparse.Namespace) -> None:
+    meta, exchanges = load_fixture(args.fixture)
+    stub_options = {
+        "exchanges": exchanges,
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "recorded_latency": args.recorded_latency,
+        "error_rate": args.error_rate,
+        "error_status": args.error_status,
+        "error_on": args.error_on,
+    }
+    runs = []
+    for iteration in range(args.warmup + args.repeat):
+        run, _ = run_pipeline(
+            {**stub_options, "seed": args.seed + iteration},
+            watchlist=meta["watchlist"],
+            stages=meta["stages"],
+            api_key="replay",
+            now=meta["recorded_at"],
+        )
+        if iteration >= args.warmup:
+            runs.append(run)
+        seconds = ", ".join(f"{stage} {outcome['seconds']:.2f}s" for stage, outcome in run["stages"].items())
+        print(f"  run {iteration + 1}: {seconds}, {run['stub']['misses']} misses", file=sys.stderr)
+
+    results = {
+        stage: summarize([run["stages"][stage]["seconds"] for run in runs]) for stage in STAGES
+    }
+    results["pipeline"] = summarize([sum(o["seconds"] for o in run["stages"].values()) for run in runs])
+    revision = git_revision()
+    report = {
+        "meta": {
+            **revision,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "dialect": "sqlite",
+            "fixture": args.fixture,
+            "recorded_at": meta["recorded_at"],
+            "catalog": {"exchanges": len(exchanges), "channels": len(meta["watchlist"])},
+            "stub": {key: value for key, value in stub_options.items() if key != "exchanges"},
+            "seed": args.seed,
+        },
+        "results": results,
+        "runs": runs,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / (
+        f"{revision['commit'] or 'unknown'}{'-dirty' if revision['dirty'] else ''}"
+        f"-replay-{Path(args.fixture).name.split('.')[0]}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"Wrote {output}", file=sys.stderr)
+
+    failed = [stage for run in runs for stage, outcome in run["stages"].items() if outcome["returncode"]]
+    if failed:
+        sys.exit(f"{len(failed)} stage run(s) failed: {', '.join(sorted(set(failed)))}")
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Record or replay the ingestion pipeline's API traffic.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    recorder = commands.add_parser("record", help="Run against the real YouTube API and save a fixture")
+    recorder.add_argument("fixture", help="Fixture file to write (.jsonl.gz)")
+    recorder.add_argument("--api-key", help="YouTube API key (default: YOUTUBE_API_KEY)")
+    recorder.add_argument("--upstream", default=YOUTUBE_UPSTREAM, help=argparse.SUPPRESS)
+    recorder.add_argument(
+        "--channel", action="append", help="Watchlist channel ID, repeatable (default: the seed creators)"
+    )
+    recorder.add_argument(
+        "--rankings-args",
+        default=shlex.join(DEFAULT_STAGE_ARGS["fetch_rankings"]),
+        help="Arguments for fetch_rankings",
+    )
+    recorder.add_argument(
+        "--channel-args",
+        default=shlex.join(DEFAULT_STAGE_ARGS["fetch_channel_videos"]),
+        help="Arguments for fetch_channel_videos",
+    )
+
+    player = commands.add_parser("replay", help="Run the pipeline from a fixture and time it")
+    player.add_argument("fixture")
+    player.add_argument("--repeat", type=int, default=3, help="Timed pipeline runs")
+    player.add_argument("--warmup", type=int, default=0, help="Untimed pipeline runs first")
+    player.add_argument("--latency-ms", type=float, default=0.0, help="Added to every stub response")
+    player.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform ± jitter on the latency")
+    player.add_argument(
+        "--recorded-latency", action="store_true", help="Use each response's recorded upstream latency instead"
+    )
+    player.add_argument("--error-rate", type=float, default=0.0, help="Fraction of responses to fail")
+    player.add_argument("--error-status", type=int, default=503)
+    player.add_argument("--error-on", choices=("all", "youtube", "supabase"), default="all")
+    player.add_argument("--seed", type=int, default=42, help="Seeds latency jitter and error injection")
+    player.add_argument("--output", help="Report file (default: benchmarks/results/<commit>-replay-<fixture>.json)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_arguments()
+    if args.command == "record":
+        record(args)
+    else:
+        replay(args)
+
+
+if __name__ == "__main__":
+    main()
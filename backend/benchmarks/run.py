@@ -0,0 +1,176 @@
+"""Run the service benchmarks against SQLite or a local Postgres.
+
+Usage (from backend/):
+
+    # Throwaway SQLite file, 10k videos
+    python -m benchmarks.run --videos 10000
+
+    # Local Postgres; --reset drops and recreates every table first
+    python -m benchmarks.run --videos 100000 --reset \
+        --database-url postgresql+pg8000://postgres@localhost/tingleradar_bench
+
+    # Same database again, without regenerating the catalog
+    python -m benchmarks.run --reuse --database-url postgresql+pg8000://...
+
+    # Only create the catalog, e.g. for an app under `benchmarks.load`
+    python -m benchmarks.run --generate-only --videos 50000 --database-url sqlite:///bench.db
+
+    # Compare two runs
+    python -m benchmarks.compare benchmarks/results/<old>.json benchmarks/results/<new>.json
+
+Results are written as JSON to `benchmarks/results/` (or `--output`) with
+the commit, database and catalog size they were measured on.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# The app's settings are read at import time; the benchmarks never use the
+# configured database, only the one given here.
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "benchmark")
+
+from sqlalchemy import create_engine, func, text  # noqa: E402
+from sqlalchemy.engine import Engine, make_url  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+import app.models  # noqa: E402,F401  (registers every table on Base)
+from app.db.base import Base  # noqa: E402
+from app.models import Video  # noqa: E402
+from benchmarks.suite import run_suite  # noqa: E402
+from benchmarks.synthetic import generate_catalog  # noqa: E402
+
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark TingleRadar services on a synthetic catalog.")
+    parser.add_argument("--database-url", help="Sync SQLAlchemy URL; default: a temporary SQLite file")
+    parser.add_argument("--videos", type=int, default=10_000, help="Catalog size (10k-500k)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--weeks", type=int, default=12, help="Weekly ranking lists to generate")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed iterations per benchmark")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed iterations per benchmark")
+    parser.add_argument("--only", help="Run only benchmarks whose name contains this")
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate all tables first")
+    parser.add_argument("--reuse", action="store_true", help="Benchmark the catalog already in the database")
+    parser.add_argument("--generate-only", action="store_true", help="Create the catalog and skip the benchmarks")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<commit>-<db>-<videos>.json)")
+    args = parser.parse_args()
+    if args.generate_only and not args.database_url:
+        parser.error("--generate-only needs --database-url (the default SQLite file is temporary)")
+    return args
+
+
+def git_revision() -> Dict[str, Any]:
+    def git(*args: str) -> Optional[str]:
+        try:
+            result = subprocess.run(["git", *args], capture_output=True, text=True, check=True)
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        return result.stdout.strip()
+
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {"commit": git("rev-parse", "--short", "HEAD"), "dirty": bool(status)}
+
+
+def prepare_database(engine: Engine, args: argparse.Namespace) -> Dict[str, Any]:
+    """Create (or check) the schema and the catalog; returns what was generated."""
+    if args.reset:
+        Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    sessions = sessionmaker(bind=engine, future=True)
+
+    with sessions() as db:
+        existing = db.query(func.count(Video.youtube_id)).scalar()
+        if args.reuse:
+            if not existing:
+                sys.exit("--reuse: the database holds no videos; run once without it first")
+            return {"videos": existing, "generated": False}
+        if existing:
+            sys.exit(f"The database already holds {existing} videos; pass --reset or --reuse")
+
+        started = time.perf_counter()
+        counts = generate_catalog(db, videos=args.videos, seed=args.seed, weeks=args.weeks)
+        generate_seconds = time.perf_counter() - started
+
+    with engine.begin() as conn:
+        # Fresh tables have no planner statistics yet.
+        conn.execute(text("ANALYZE"))
+    return {**counts, "generated": True, "generate_seconds": round(generate_seconds, 2)}
+
+
+def main() -> None:
+    args = parse_arguments()
+    scratch = None
+    url = args.database_url
+    if url is None:
+        handle, scratch = tempfile.mkstemp(suffix=".db", prefix="tingleradar-bench-")
+        os.close(handle)
+        url = f"sqlite:///{scratch}"
+
+    engine = create_engine(url, future=True)
+    try:
+        catalog = prepare_database(engine, args)
+        videos = catalog["videos"]
+        if args.generate_only:
+            print(f"Generated {catalog} in {url}", file=sys.stderr)
+            return
+        print(f"Benchmarking {engine.dialect.name} with {videos} videos", file=sys.stderr)
+
+        def progress(name: str, stats: Dict[str, Any]) -> None:
+            print(f"  {name:<42} median {stats['median_ms']:>10.3f} ms", file=sys.stderr)
+
+        results = run_suite(
+            sessionmaker(bind=engine, future=True),
+            videos=videos,
+            seed=args.seed,
+            repeat=args.repeat,
+            warmup=args.warmup,
+            only=args.only,
+            progress=progress,
+        )
+        server_version = ".".join(str(part) for part in engine.dialect.server_version_info or ())
+    finally:
+        engine.dispose()
+        if scratch is not None:
+            os.remove(scratch)
+
+    revision = git_revision()
+    report = {
+        "meta": {
+            **revision,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": make_url(url).render_as_string(hide_password=True),
+            "dialect": engine.dialect.name,
+            "server_version": server_version,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+            "catalog": catalog,
+        },
+        "results": results,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / (
+        f"{revision['commit'] or 'unknown'}{'-dirty' if revision['dirty'] else ''}"
+        f"-{engine.dialect.name}-{videos}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"Wrote {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""The service-level benchmarks and their timing loop.
+
+Every benchmark is a function of a fresh `Session` (and the iteration
+number) that does one unit of work; `run_suite` runs each one `warmup`
+times untimed, then `repeat` times timed, and reports wall-clock stats in
+milliseconds. `ops` is how many calls one iteration makes, so `per_op_us`
+compares across catalog sizes.
+"""
+
+import random
+import statistics
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy.orm import Session, sessionmaker, undefer
+
+from app.models import RankingList, Video
+from app.services.boards import MAIN_BOARD
+from app.services.channels import list_top_channels
+from app.services.rankings import _build_ranking_payload
+from app.services.tag_votes import record_tag_vote
+from app.services.tagging import compute_tags_for_video
+from app.services.videos import VIDEO_FIELDS, browse_videos
+from benchmarks.synthetic import VOTE_TAGS, sample_video_ids
+
+
+TAGGED_VIDEOS = 1000
+
+
+class Benchmark(NamedTuple):
+    name: str
+    run: Callable[[Session, int], Any]
+    ops: int = 1
+
+
+def browse_cases(top_channels: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+    """`browse_videos` arguments per filter combination."""
+    return {
+        "default": {},
+        "deep_page": {"page": 200},
+        "all_fields": {"fields": list(VIDEO_FIELDS)},
+        "channel": {"channel_id": top_channels[0]},
+        "channels": {"channel_ids": list(top_channels[:5])},
+        "duration_short": {"duration_bucket": "short"},
+        "duration_medium": {"duration_bucket": "medium"},
+        "duration_long": {"duration_bucket": "long"},
+        "sort_views": {"sort": "views_desc"},
+        "sort_likes": {"sort": "likes_desc"},
+        "tag": {"tags": ["tapping"]},
+        "tags_any": {"tags": ["whisper", "binaural", "mouth_sounds"]},
+        "exclude_tag": {"exclude_tags": ["roleplay"]},
+        "language": {"language": "ja"},
+        "language_tag_duration": {"language": "en", "tags": ["tapping"], "duration_bucket": "long"},
+        "channel_tag_sort": {"channel_id": top_channels[0], "tags": ["whisper"], "sort": "views_desc"},
+    }
+
+
+def build_benchmarks(sessions: sessionmaker, *, videos: int, seed: int) -> List[Benchmark]:
+    with sessions() as db:
+        top_channels = [channel_id for channel_id, _, _ in list_top_channels(db, limit=5)]
+        ranking_id = (
+            db.query(RankingList.id)
+            .filter(RankingList.board == MAIN_BOARD)
+            .order_by(RankingList.label_date.desc())
+            .limit(1)
+            .scalar()
+        )
+        tagged_ids = sample_video_ids(videos, TAGGED_VIDEOS, seed)
+        tagged = db.query(Video).options(undefer(Video.description)).filter(Video.youtube_id.in_(tagged_ids)).all()
+        db.expunge_all()
+
+    vote_targets = sample_video_ids(videos, 200, seed + 7)
+    rng = random.Random(seed)
+
+    def tag_all(db: Session, _: int) -> None:
+        for video in tagged:
+            compute_tags_for_video(video)
+
+    def build_ranking(db: Session, _: int) -> None:
+        ranking = db.get(RankingList, ranking_id)
+        _build_ranking_payload(db, ranking)
+
+    def vote(db: Session, iteration: int) -> None:
+        # Half the votes hit an existing (video, tag, user) and update it.
+        record_tag_vote(
+            db,
+            video_id=rng.choice(vote_targets),
+            tag=rng.choice(VOTE_TAGS),
+            user_fingerprint=f"bench{iteration % 2}",
+            vote=rng.choice((1, -1)),
+        )
+
+    benchmarks = [
+        Benchmark("compute_tags_for_video", tag_all, ops=len(tagged)),
+        Benchmark("build_ranking_payload", build_ranking),
+        Benchmark("record_tag_vote", vote),
+        Benchmark("list_top_channels", lambda db, _: list_top_channels(db)),
+    ]
+    for case, arguments in browse_cases(top_channels).items():
+        benchmarks.append(
+            Benchmark(f"browse_videos[{case}]", lambda db, _, arguments=arguments: browse_videos(db, **arguments))
+        )
+    return benchmarks
+
+
+def _percentile(samples: Sequence[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def time_benchmark(sessions: sessionmaker, benchmark: Benchmark, *, repeat: int, warmup: int) -> Dict[str, Any]:
+    samples: List[float] = []
+    for iteration in range(warmup + repeat):
+        with sessions() as db:
+            started = time.perf_counter()
+            benchmark.run(db, iteration)
+            elapsed = time.perf_counter() - started
+        if iteration >= warmup:
+            samples.append(elapsed * 1000)
+    median = statistics.median(samples)
+    return {
+        "ops": benchmark.ops,
+        "repeat": repeat,
+        "min_ms": round(min(samples), 3),
+        "median_ms": round(median, 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p95_ms": round(_percentile(samples, 0.95), 3),
+        "max_ms": round(max(samples), 3),
+        "per_op_us": round(median * 1000 / benchmark.ops, 3),
+    }
+
+
+def run_suite(
+    sessions: sessionmaker,
+    *,
+    videos: int,
+    seed: int,
+    repeat: int = 5,
+    warmup: int = 1,
+    only: Optional[str] = None,
+    progress: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """{benchmark name: timing stats}; `only` keeps names containing it."""
+    results: Dict[str, Dict[str, Any]] = {}
+    for benchmark in build_benchmarks(sessions, videos=videos, seed=seed):
+        if only and only not in benchmark.name:
+            continue
+        results[benchmark.name] = time_benchmark(sessions, benchmark, repeat=repeat, warmup=warmup)
+        if progress is not None:
+            progress(benchmark.name, results[benchmark.name])
+    return results
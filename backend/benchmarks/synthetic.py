@@ -0,0 +1,223 @@
+"""Seeded synthetic catalog for the benchmarks.
+
+`generate_catalog(db, videos=N, seed=S)` fills an empty database with the
+same rows for the same (N, seed), on any backend:
+
+- `videos` spread over `N // 40` channels with a long-tailed size
+  distribution (a few big creators, many small ones);
+- titles in English, Japanese, Korean and Chinese (roughly 55/20/10/15)
+  built from the trigger keywords `app.services.tagging` knows, so tag and
+  language filters match realistic fractions of the catalog;
+- durations across the short/medium/long browse buckets, view and like
+  counts, YouTube tags and persisted `computed_tags`;
+- tag votes (about one per two videos, on a small set of popular videos
+  more often) and user tags (about one per ten videos);
+- `weeks` weekly main-board ranking lists of `ranking_size` items each.
+
+Rows are inserted with executemany in chunks, so a 500k catalog takes
+minutes, not hours.
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Sequence
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models import RankingItem, RankingList, UserTag, Video, VideoTagVote
+from app.services.boards import MAIN_BOARD
+from app.services.tagging import compute_tags
+
+
+EPOCH = datetime(2026, 1, 5)
+CHUNK_SIZE = 5000
+
+TRIGGERS = {
+    "en": [
+        "tapping",
+        "scratching",
+        "crinkling",
+        "brushing",
+        "ear cleaning",
+        "mouth sounds",
+        "rain sounds",
+        "binaural",
+        "hand movements",
+        "layered sounds",
+    ],
+    "ja": ["耳かき", "タッピング", "囁き", "咀嚼音", "雨音", "耳ふー"],
+    "ko": ["속삭임", "태핑", "귀청소", "팅글", "빗소리"],
+    "zh": ["耳语", "敲击", "包装袋", "耳朵清洁", "雨声", "口腔音"],
+}
+STYLES = {
+    "en": ["whisper", "soft spoken", "no talking", "whispering", ""],
+    "ja": ["囁き", "ささやき", "睡眠用", ""],
+    "ko": ["한국어", "노토킹", "수면", ""],
+    "zh": ["中文", "不讲话", "助眠", ""],
+}
+SCENES = ["haircut roleplay", "dentist roleplay", "cranial nerve exam", "doctor roleplay", "girlfriend roleplay"]
+LANGUAGE_WEIGHTS = (("en", 55), ("ja", 20), ("ko", 10), ("zh", 15))
+VOTE_TAGS = ["whisper", "tapping", "no_talking", "roleplay", "binaural", "mouth_sounds", "ja", "zh"]
+USER_TAGS = ["sleep", "tingly", "slow", "fast", "unintelligible", "layered", "visual_asmr"]
+
+
+def video_id(n: int) -> str:
+    return f"syn{n:07d}"
+
+
+def _title(rng: random.Random, language: str, n: int) -> str:
+    trigger = rng.choice(TRIGGERS[language])
+    second = rng.choice(TRIGGERS[language])
+    style = rng.choice(STYLES[language])
+    title = f"ASMR {trigger} & {second} {style} #{n}".replace("  ", " ")
+    if language == "en" and rng.random() < 0.08:
+        title += f" | {rng.choice(SCENES)}"
+    return title
+
+
+def _duration(rng: random.Random) -> int:
+    bucket = rng.random()
+    if bucket < 0.1:
+        return rng.randint(30, 119)
+    if bucket < 0.3:
+        return rng.randint(120, 299)
+    if bucket < 0.6:
+        return rng.randint(300, 899)
+    return rng.randint(900, 3 * 3600)
+
+
+def _channel_weights(rng: random.Random, videos: int) -> List[float]:
+    channels = max(1, videos // 40)
+    weights = [1 / (rank + 1) ** 0.8 for rank in range(channels)]
+    rng.shuffle(weights)
+    return weights
+
+
+def iter_videos(videos: int, seed: int) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed)
+    channel_weights = _channel_weights(rng, videos)
+    channel_ids = list(range(len(channel_weights)))
+    languages = [language for language, _ in LANGUAGE_WEIGHTS]
+    language_weights = [weight for _, weight in LANGUAGE_WEIGHTS]
+    span_seconds = 365 * 24 * 3600
+
+    for n in range(videos):
+        channel = rng.choices(channel_ids, channel_weights)[0]
+        language = rng.choices(languages, language_weights)[0]
+        title = _title(rng, language, n)
+        tags = rng.sample(TRIGGERS[language], 2) + ["asmr"]
+        description = f"{title}\nRelax and sleep. Timestamps and credits below." if rng.random() < 0.7 else None
+        views = int(rng.paretovariate(1.2) * 500)
+        yield {
+            "youtube_id": video_id(n),
+            "title": title,
+            "description": description,
+            "channel_title": f"Synthetic Channel {channel}",
+            "channel_id": f"UCsyn{channel:06d}",
+            "published_at": EPOCH + timedelta(seconds=rng.randrange(span_seconds)),
+            "view_count": views,
+            "like_count": int(views * rng.uniform(0.005, 0.08)),
+            "duration": _duration(rng),
+            "tags": tags,
+            "computed_tags": compute_tags(title, description, tags),
+            "thumbnail_url": f"https://i.ytimg.com/vi/{video_id(n)}/hqdefault.jpg",
+            "is_active": True,
+        }
+
+
+def _insert_chunks(db: Session, table: Any, rows: Iterator[Dict[str, Any]]) -> int:
+    chunk: List[Dict[str, Any]] = []
+    count = 0
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= CHUNK_SIZE:
+            db.execute(insert(table), chunk)
+            count += len(chunk)
+            chunk = []
+    if chunk:
+        db.execute(insert(table), chunk)
+        count += len(chunk)
+    return count
+
+
+def _iter_votes(rng: random.Random, videos: int) -> Iterator[Dict[str, Any]]:
+    seen = set()
+    # A few popular videos collect most votes, enough to flip their tags.
+    popular = max(1, videos // 100)
+    for _ in range(videos // 2):
+        n = rng.randrange(popular) if rng.random() < 0.3 else rng.randrange(videos)
+        key = (n, rng.choice(VOTE_TAGS), f"fp{rng.randrange(videos):07d}")
+        if key in seen:
+            continue
+        seen.add(key)
+        yield {
+            "video_id": video_id(key[0]),
+            "tag": key[1],
+            "user_fingerprint": key[2],
+            "vote": 1 if rng.random() < 0.8 else -1,
+            "created_at": EPOCH,
+        }
+
+
+def _iter_user_tags(rng: random.Random, videos: int) -> Iterator[Dict[str, Any]]:
+    seen = set()
+    for _ in range(videos // 10):
+        key = (rng.randrange(videos), rng.choice(USER_TAGS))
+        if key in seen:
+            continue
+        seen.add(key)
+        yield {"video_id": video_id(key[0]), "tag": key[1], "source": "user", "created_at": EPOCH}
+
+
+def _add_rankings(db: Session, rng: random.Random, videos: int, weeks: int, ranking_size: int) -> None:
+    for week in range(weeks):
+        label = EPOCH + timedelta(weeks=week)
+        ranking = RankingList(
+            name=f"ASMR Weekly Pulse {label:%Y-%m-%d}",
+            board=MAIN_BOARD,
+            created_at=label,
+            label_date=label.date(),
+        )
+        db.add(ranking)
+        db.flush()
+        picks = rng.sample(range(videos), min(ranking_size, videos))
+        db.execute(
+            insert(RankingItem.__table__),
+            [
+                {
+                    "ranking_list_id": ranking.id,
+                    "video_id": video_id(n),
+                    "position": position,
+                    "score": 10000 - position * 37,
+                    "score_components": {"velocity": 6000, "like_ratio": 2500, "tag_quality": 1500},
+                }
+                for position, n in enumerate(picks, start=1)
+            ],
+        )
+
+
+def generate_catalog(
+    db: Session,
+    *,
+    videos: int,
+    seed: int = 42,
+    weeks: int = 12,
+    ranking_size: int = 100,
+) -> Dict[str, int]:
+    """Insert the synthetic catalog into `db` (which should be empty) and commit."""
+    rng = random.Random(seed + 1)
+    counts = {
+        "videos": _insert_chunks(db, Video.__table__, iter_videos(videos, seed)),
+        "tag_votes": _insert_chunks(db, VideoTagVote.__table__, _iter_votes(rng, videos)),
+        "user_tags": _insert_chunks(db, UserTag.__table__, _iter_user_tags(rng, videos)),
+    }
+    _add_rankings(db, rng, videos, weeks, ranking_size)
+    counts["ranking_weeks"] = weeks
+    db.commit()
+    return counts
+
+
+def sample_video_ids(videos: int, count: int, seed: int) -> Sequence[str]:
+    rng = random.Random(seed + 2)
+    return [video_id(n) for n in rng.sample(range(videos), min(count, videos))]
@@ -0,0 +1,89 @@
+"""Compact old ranking weeks into compressed `ranking_archives` rows.
+
+Every list labelled more than `--keep-weeks` weeks ago (except the newest
+week of each board) has its `ranking_items` packed into a single
+zlib-compressed row and the item rows deleted. History endpoints decode
+archived weeks transparently. `--restore` unpacks archives back into
+`ranking_items` (run it before downgrading past the archive migration).
+
+Usage:
+
+    PYTHONPATH=backend python -m backend.scripts.archive_rankings --keep-weeks 12
+"""
+
+import argparse
+import logging
+from datetime import datetime
+
+from app.db.session import SessionLocal
+from app.services.ranking_archive import archive_old_weeks, restore_archives
+
+logger = logging.getLogger("archive_rankings")
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Archive ranking weeks older than the retention window.",
+    )
+    parser.add_argument(
+        "--keep-weeks",
+        type=int,
+        default=12,
+        help="Keep this many recent weeks as hot ranking_items rows.",
+    )
+    parser.add_argument(
+        "--board",
+        default=None,
+        help="Only archive this board (default: every board).",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Archive at most this many lists in this run.",
+    )
+    parser.add_argument(
+        "--restore",
+        action="store_true",
+        help="Unpack every archive back into ranking_items instead.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report what would be archived without writing anything.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_arguments()
+    session = SessionLocal()
+    try:
+        if args.restore:
+            restored = restore_archives(session)
+            logger.info("Restored %s archived ranking lists.", restored)
+            return
+
+        result = archive_old_weeks(
+            session,
+            now=datetime.utcnow(),
+            keep_weeks=args.keep_weeks,
+            board=args.board,
+            limit=args.limit,
+            dry_run=args.dry_run,
+        )
+        logger.info(
+            "%s %s lists (%s items): %.1f KiB of items stored as %.1f KiB.",
+            "Would archive" if args.dry_run else "Archived",
+            result.lists,
+            result.items,
+            result.raw_bytes / 1024,
+            result.stored_bytes / 1024,
+        )
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
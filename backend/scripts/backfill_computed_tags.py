@@ -10,21 +10,30 @@ Usage:
   cd backend && python scripts/backfill_computed_tags.py
 """
 
+from sqlalchemy.orm import undefer
+
 from app.db.session import SessionLocal
 from app.models.video import Video
+from app.services.result_cache import get_result_cache
 from app.services.tagging import compute_tags_for_video
 
 
 def main() -> None:
     db = SessionLocal()
     try:
-        videos = db.query(Video).filter(Video.computed_tags.is_(None)).all()
+        videos = (
+            db.query(Video)
+            .options(undefer(Video.description))
+            .filter(Video.computed_tags.is_(None))
+            .all()
+        )
         print(f"Found {len(videos)} videos without computed_tags")
         for video in videos:
             tags = compute_tags_for_video(video)
             video.computed_tags = tags
             db.add(video)
         db.commit()
+        get_result_cache().invalidate_catalog()
         print("Backfill complete")
     finally:
         db.close()
@@ -18,18 +18,18 @@ Usage examples:
 
 import argparse
 import logging
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Iterable, List, Optional
-
-import requests
+from datetime import timedelta
+from typing import Any, Dict, List
 
 from app.core.config import Settings
+from app.core.metrics import JOB_ITEMS, track_job
 from app.db.session import SessionLocal
 from app.models import CreatorWatchlist, Video
-from backend.scripts.fetch_rankings import (
-    YOUTUBE_VIDEOS_URL,
-    chunked,
-    normalize_video_payload,
+from app.services.result_cache import get_result_cache
+from backend.scripts.fetch_rankings import normalize_video_payload, utc_now
+from backend.scripts.youtube_client import (
+    YOUTUBE_SEARCH_URL,
+    VideoDetailsBatcher,
     youtube_request,
 )
 
@@ -37,9 +37,6 @@ logger = logging.getLogger("fetch_channel_videos")
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 
 
-YOUTUBE_SEARCH_URL = "https://www.googleapis.com/youtube/v3/search"
-
-
 def parse_arguments() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Ingest videos for tracked ASMR creators into the videos table.",
@@ -107,19 +104,6 @@ def fetch_channel_video_ids(
     ]
 
 
-def fetch_video_details(api_key: str, video_ids: List[str]) -> List[Dict[str, Any]]:
-    details: List[Dict[str, Any]] = []
-    for batch in chunked(video_ids, 50):
-        payload = youtube_request(
-            YOUTUBE_VIDEOS_URL,
-            api_key,
-            part="snippet,statistics,contentDetails",
-            id=",".join(batch),
-        )
-        details.extend(payload.get("items", []))
-    return details
-
-
 def main() -> None:
     args = parse_arguments()
     settings = Settings()
@@ -141,7 +125,7 @@ def main() -> None:
             logger.info("No active creators found in watchlist; nothing to do.")
             return
 
-        window_start = datetime.now(timezone.utc) - timedelta(days=args.days)
+        window_start = utc_now() - timedelta(days=args.days)
         published_after = window_start.strftime("%Y-%m-%dT%H:%M:%SZ")
 
         logger.info(
@@ -151,7 +135,11 @@ def main() -> None:
             args.per_channel,
         )
 
-        total_videos = 0
+        # Search every channel first and queue its IDs on a shared batcher, so
+        # videos.list calls are filled to 50 IDs across channels instead of
+        # one mostly-empty call per creator.
+        batcher = VideoDetailsBatcher(api_key)
+        pending = []
         for creator in creators:
             video_ids = fetch_channel_video_ids(
                 api_key,
@@ -162,13 +150,18 @@ def main() -> None:
             if not video_ids:
                 logger.info("Channel %s: no videos found in window.", creator.channel_title)
                 continue
+            pending.append((creator, batcher.submit(video_ids)))
+        batcher.flush()
 
-            details = fetch_video_details(api_key, video_ids)
+        total_videos = 0
+        ingested_channels = set()
+        for creator, ticket in pending:
+            details = ticket.result()
             if not details:
                 logger.info(
                     "Channel %s: no details returned for %s video IDs.",
                     creator.channel_title,
-                    len(video_ids),
+                    len(ticket.video_ids),
                 )
                 continue
 
@@ -185,13 +178,23 @@ def main() -> None:
                     # Defensive: ignore videos outside the window.
                     continue
                 session.merge(Video(**payload))
+                ingested_channels.add(payload["channel_id"])
                 total_videos += 1
 
+        logger.info(
+            "Fetched details for %s video IDs in %s videos.list requests.",
+            batcher.requested_ids,
+            batcher.request_count,
+        )
+        JOB_ITEMS.labels("fetch_channel_videos", "videos").inc(total_videos)
+        JOB_ITEMS.labels("fetch_channel_videos", "youtube_requests").inc(batcher.request_count)
+
         if args.dry_run:
             session.rollback()
             logger.info("Dry run enabled—rolled back transaction (total_videos=%s).", total_videos)
         else:
             session.commit()
+            get_result_cache().invalidate_channels(ingested_channels)
             logger.info("Committed %s videos from %s creators.", total_videos, len(creators))
 
     finally:
@@ -199,4 +202,5 @@ def main() -> None:
 
 
 if __name__ == "__main__":  # pragma: no cover
-    main()
+    with track_job("fetch_channel_videos"):
+        main()
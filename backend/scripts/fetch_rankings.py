@@ -1,19 +1,32 @@
 """YouTube-based ranking ingestion for TingleRadar."""
 
 import argparse
+import heapq
 import logging
 import os
+import time
 from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
 
-import requests
 from dotenv import load_dotenv
 from isodate import parse_duration
 
+from app.core.metrics import JOB_ITEMS, track_job
+from app.services.boards import MAIN_BOARD, sub_boards
+from app.services.result_cache import ResultCache, channel_invalidation_tags
+from app.services.scoring import ScoreWeights, score_videos
+from app.services.tagging import compute_tags, detect_language_from_title
+
+from .supabase_rest import SupabaseRestClient
+from .youtube_client import (
+    YOUTUBE_SEARCH_URL,
+    VideoDetailsBatcher,
+    youtube_request,
+)
+
 
-YOUTUBE_SEARCH_URL = "https://www.googleapis.com/youtube/v3/search"
-YOUTUBE_VIDEOS_URL = "https://www.googleapis.com/youtube/v3/videos"
 DEFAULT_QUERIES = [
     "ASMR whisper",
     "ASMR no talking",
@@ -26,6 +39,13 @@ FALLBACK_DAYS = 14
 STRICT_MIN_DURATION_SECONDS = 120
 RELAXED_MIN_DURATION_SECONDS = 60
 MIN_WEEKLY_RESULTS = 60
+# Each tier keeps this many times --top candidates (by views) for scoring, and
+# detail fetching only stops early once the strict tier's pool is full, so a
+# fast-rising upload with modest absolute views can still make the board.
+CANDIDATE_POOL_FACTOR = 5
+# Tag sub-boards are cut from the same candidate pool as the main board.
+DEFAULT_BOARD_SIZE = 30
+DEFAULT_BOARD_MIN_ITEMS = 10
 BLACKLIST_KEYWORDS = [
     "mukbang",
     "magnetic ball",
@@ -40,89 +60,18 @@ logger = logging.getLogger("fetch_rankings")
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 
 
+class ScoredVideo(NamedTuple):
+    score: int
+    components: Dict[str, int]
+
+
 class RankingPayload(NamedTuple):
     items: List[Dict[str, Any]]
     generated_at: datetime
     queries: List[str]
-
-
-class SupabaseRestClient:
-    def __init__(self, supabase_url: str, service_role_key: str) -> None:
-        self.base_url = f"{supabase_url.rstrip('/')}/rest/v1"
-        self.headers = {
-            "apikey": service_role_key,
-            "Authorization": f"Bearer {service_role_key}",
-            "Content-Type": "application/json",
-        }
-
-    def _request(
-        self,
-        method: str,
-        path: str,
-        *,
-        params: Optional[Dict[str, Any]] = None,
-        json_payload: Optional[Any] = None,
-        prefer: Optional[str] = None,
-    ) -> Any:
-        headers = dict(self.headers)
-        if prefer:
-            headers["Prefer"] = prefer
-
-        response = requests.request(
-            method,
-            f"{self.base_url}/{path.lstrip('/')}",
-            params=params,
-            json=json_payload,
-            headers=headers,
-            timeout=20,
-        )
-        if not response.ok:
-            raise RuntimeError(
-                f"Supabase REST {method} {path} failed: {response.status_code} {response.text}"
-            )
-
-        if not response.text:
-            return None
-        try:
-            return response.json()
-        except ValueError:
-            return response.text
-
-    def upsert_videos(self, videos: List[Dict[str, Any]]) -> None:
-        if not videos:
-            return
-
-        batch_size = 200
-        for i in range(0, len(videos), batch_size):
-            batch = videos[i : i + batch_size]
-            self._request(
-                "POST",
-                "videos",
-                params={"on_conflict": "youtube_id"},
-                json_payload=batch,
-                prefer="resolution=merge-duplicates,return=minimal",
-            )
-
-    def insert_ranking_list(self, name: str, description: str) -> int:
-        rows = self._request(
-            "POST",
-            "ranking_lists",
-            json_payload=[{"name": name, "description": description}],
-            prefer="return=representation",
-        )
-        if not rows or not isinstance(rows, list) or "id" not in rows[0]:
-            raise RuntimeError("Failed to insert ranking list or read generated id")
-        return int(rows[0]["id"])
-
-    def insert_ranking_items(self, items: List[Dict[str, Any]]) -> None:
-        if not items:
-            return
-        self._request(
-            "POST",
-            "ranking_items",
-            json_payload=items,
-            prefer="return=minimal",
-        )
+    scores: Dict[str, ScoredVideo] = {}
+    # Tag sub-board -> its videos, in rank order.
+    boards: Dict[str, List[Dict[str, Any]]] = {}
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -134,7 +83,10 @@ def parse_arguments() -> argparse.Namespace:
         "-q",
         nargs="+",
         default=DEFAULT_QUERIES,
-        help="Query strings to pass to YouTube search.",
+        help=(
+            "Query strings to pass to YouTube search, in priority order: "
+            "later queries are skipped once earlier ones fill the candidate pool."
+        ),
     )
     parser.add_argument(
         "--per-query",
@@ -177,16 +129,49 @@ def parse_arguments() -> argparse.Namespace:
             "For example, --days-offset 7 approximates the previous week."
         ),
     )
+    parser.add_argument(
+        "--weight-velocity",
+        type=float,
+        default=ScoreWeights.velocity,
+        help="Score weight for views per hour since publish.",
+    )
+    parser.add_argument(
+        "--weight-like-ratio",
+        type=float,
+        default=ScoreWeights.like_ratio,
+        help="Score weight for the (smoothed) like/view ratio.",
+    )
+    parser.add_argument(
+        "--weight-tag-quality",
+        type=float,
+        default=ScoreWeights.tag_quality,
+        help="Score weight for net community tag votes.",
+    )
+    parser.add_argument(
+        "--board-size",
+        type=int,
+        default=DEFAULT_BOARD_SIZE,
+        help="How many videos to keep on each tag sub-board.",
+    )
+    parser.add_argument(
+        "--board-min-items",
+        type=int,
+        default=DEFAULT_BOARD_MIN_ITEMS,
+        help="Skip a tag sub-board that would have fewer videos than this.",
+    )
+    parser.add_argument(
+        "--no-boards",
+        action="store_true",
+        help="Only publish the main board.",
+    )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="Gzip Supabase REST request bodies of 1 KiB or more (needs a gateway that accepts them).",
+    )
     return parser.parse_args()
 
 
-def youtube_request(url: str, api_key: str, **params: Any) -> Dict[str, Any]:
-    params["key"] = api_key
-    response = requests.get(url, params=params, timeout=10)
-    response.raise_for_status()
-    return response.json()
-
-
 def fetch_search_ids(api_key: str, query: str, max_results: int, published_after: str) -> List[str]:
     logger.info("Querying YouTube for %s since %s", query, published_after)
     params = {
@@ -205,33 +190,6 @@ def fetch_search_ids(api_key: str, query: str, max_results: int, published_after
     ]
 
 
-def chunked(iterable: Iterable[Any], size: int) -> Iterable[List[Any]]:
-    iterator = iter(iterable)
-    while True:
-        chunk = []
-        for _ in range(size):
-            try:
-                chunk.append(next(iterator))
-            except StopIteration:
-                break
-        if not chunk:
-            break
-        yield chunk
-
-
-def fetch_video_details(api_key: str, video_ids: List[str]) -> List[Dict[str, Any]]:
-    details = []
-    for batch in chunked(video_ids, 50):
-        payload = youtube_request(
-            YOUTUBE_VIDEOS_URL,
-            api_key,
-            part="snippet,statistics,contentDetails",
-            id=",".join(batch),
-        )
-        details.extend(payload.get("items", []))
-    return details
-
-
 def filter_video(snippet: Dict[str, Any]) -> bool:
     if not snippet:
         return False
@@ -243,6 +201,18 @@ def filter_video(snippet: Dict[str, Any]) -> bool:
     return not any(keyword in text for keyword in BLACKLIST_KEYWORDS)
 
 
+def utc_now() -> datetime:
+    """The current UTC time, or `INGESTION_NOW` (ISO 8601) when it is set.
+
+    Replays of recorded API traffic pin the clock to the recording time, so
+    publish windows and velocity scores come out the same on every run.
+    """
+    pinned = os.getenv("INGESTION_NOW")
+    if pinned:
+        return datetime.fromisoformat(pinned).astimezone(timezone.utc)
+    return datetime.now(timezone.utc)
+
+
 def parse_published_at(value: str) -> datetime:
     if value.endswith("Z"):
         value = value[:-1]
@@ -272,7 +242,7 @@ def normalize_video_payload(detail: Dict[str, Any]) -> Dict[str, Any]:
             break
 
     published_raw = snippet.get("publishedAt")
-    published_at = parse_published_at(published_raw) if published_raw else datetime.now(timezone.utc)
+    published_at = parse_published_at(published_raw) if published_raw else utc_now()
 
     return {
         "youtube_id": detail.get("id"),
@@ -289,14 +259,6 @@ def normalize_video_payload(detail: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def extract_view_count(detail: Dict[str, Any]) -> int:
-    stats = detail.get("statistics", {})
-    try:
-        return int(stats.get("viewCount", 0))
-    except (TypeError, ValueError):
-        return 0
-
-
 def is_long_video(video_payload: Dict[str, Any]) -> bool:
     duration = video_payload.get("duration")
     return duration is not None and duration >= STRICT_MIN_DURATION_SECONDS
@@ -315,90 +277,319 @@ def _serialize_video(video_payload: Dict[str, Any]) -> Dict[str, Any]:
     return row
 
 
-def _extend_unique_videos(
-    selected: List[Dict[str, Any]],
-    candidates: List[Dict[str, Any]],
-    predicate,
-    limit: int,
-) -> int:
-    existing_ids = {video["youtube_id"] for video in selected}
-    added = 0
-    for video in candidates:
-        if len(selected) >= limit:
-            break
-        video_id = video["youtube_id"]
-        if video_id in existing_ids or not predicate(video):
-            continue
-        selected.append(video)
-        existing_ids.add(video_id)
-        added += 1
-    return added
+class StageStats:
+    """Candidate count and cumulative wall time for one pipeline stage.
 
+    `seconds` includes every upstream stage, because pulling an item out of a
+    generator runs the whole chain above it; `log_stage_stats` subtracts the
+    upstream share when reporting.
+    """
 
-def persist_ranking(
-    supabase_client: SupabaseRestClient,
-    payload: RankingPayload,
-    list_name: str,
-    description: str,
-    top_n: int,
-    dry_run: bool,
-    recent_threshold: datetime,
-) -> None:
-    logger.info("Building ranking list %s with %s candidates", list_name, len(payload.items))
-    sorted_items = sorted(payload.items, key=extract_view_count, reverse=True)
-    filtered = [item for item in sorted_items if filter_video(item.get("snippet", {}))]
-    normalized_candidates = [normalize_video_payload(item) for item in filtered]
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.count = 0
+        self.seconds = 0.0
 
-    fallback_threshold = recent_threshold - timedelta(days=FALLBACK_DAYS - RECENT_DAYS)
-    target_count = min(top_n, MIN_WEEKLY_RESULTS)
 
-    selected_candidates: List[Dict[str, Any]] = []
-    stage_counts = {
-        "strict_recent_long": _extend_unique_videos(
-            selected_candidates,
-            normalized_candidates,
-            lambda video: video["published_at"] >= recent_threshold
-            and has_min_duration(video, STRICT_MIN_DURATION_SECONDS),
-            top_n,
-        )
-    }
+def instrument_stage(
+    name: str,
+    items: Iterable[Any],
+    stats: "OrderedDict[str, StageStats]",
+) -> Iterator[Any]:
+    stage = stats.setdefault(name, StageStats(name))
+    iterator = iter(items)
+    while True:
+        started = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            stage.seconds += time.perf_counter() - started
+            return
+        stage.seconds += time.perf_counter() - started
+        stage.count += 1
+        yield item
 
-    if len(selected_candidates) < target_count:
-        stage_counts["recent_short_fill"] = _extend_unique_videos(
-            selected_candidates,
-            normalized_candidates,
-            lambda video: video["published_at"] >= recent_threshold
-            and has_min_duration(video, RELAXED_MIN_DURATION_SECONDS),
-            top_n,
-        )
 
-    if len(selected_candidates) < target_count:
-        stage_counts["fallback_long_fill"] = _extend_unique_videos(
-            selected_candidates,
-            normalized_candidates,
-            lambda video: video["published_at"] >= fallback_threshold
-            and has_min_duration(video, STRICT_MIN_DURATION_SECONDS),
-            top_n,
+def log_stage_stats(stats: "OrderedDict[str, StageStats]") -> None:
+    upstream_seconds = 0.0
+    for stage in stats.values():
+        logger.info(
+            "Stage %s: %s candidates in %.3fs",
+            stage.name,
+            stage.count,
+            max(stage.seconds - upstream_seconds, 0.0),
         )
+        upstream_seconds = stage.seconds
+
+
+def iter_search_ids(
+    api_key: str,
+    queries: List[str],
+    per_query: int,
+    published_after: str,
+) -> Iterator[str]:
+    """Yield unique video IDs query by query, searching lazily.
+
+    Later queries are only issued while downstream stages keep pulling, so an
+    early stop also saves search quota.
+    """
+    seen: Set[str] = set()
+    for query in queries:
+        for video_id in fetch_search_ids(api_key, query, per_query, published_after):
+            if video_id not in seen:
+                seen.add(video_id)
+                yield video_id
+
+
+def iter_video_details(
+    batcher: VideoDetailsBatcher,
+    video_ids: Iterable[str],
+    should_stop: Callable[[], bool],
+) -> Iterator[Dict[str, Any]]:
+    """Resolve IDs one full `videos.list` batch at a time until `should_stop()`."""
+    iterator = iter(video_ids)
+    while not should_stop():
+        batch = list(islice(iterator, batcher.batch_size))
+        if not batch:
+            return
+        yield from batcher.submit(batch).result()
+    logger.info(
+        "Strict tier candidate pool is full; skipping the remaining detail batches "
+        "and any queries not searched yet."
+    )
+
+
+def iter_allowed(details: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    for detail in details:
+        if filter_video(detail.get("snippet", {})):
+            yield detail
+
+
+def iter_normalized(details: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    for detail in details:
+        yield normalize_video_payload(detail)
+
+
+class TieredSelector:
+    """Single-pass tiered selection.
+
+    Each candidate goes to the first tier it qualifies for (strict recent long
+    uploads, then the recent/fallback relaxations) and is kept in a per-tier
+    min-heap of the `pool_size` most-viewed candidates. `select()` drains the
+    tiers in order until the target is met. Without scores that gives the same
+    list as sorting every candidate by views and running one fill pass per
+    tier; with scores each tier is ordered by score instead.
+    """
+
+    def __init__(
+        self,
+        top_n: int,
+        target: int,
+        recent_threshold: datetime,
+        pool_size: Optional[int] = None,
+    ) -> None:
+        fallback_threshold = recent_threshold - timedelta(days=FALLBACK_DAYS - RECENT_DAYS)
+        self.top_n = top_n
+        self.target = target
+        self.pool_size = max(pool_size or top_n, top_n)
+        self.tiers = [
+            ("strict_recent_long", recent_threshold, STRICT_MIN_DURATION_SECONDS),
+            ("recent_short_fill", recent_threshold, RELAXED_MIN_DURATION_SECONDS),
+            ("fallback_long_fill", fallback_threshold, STRICT_MIN_DURATION_SECONDS),
+            ("fallback_short_fill", fallback_threshold, RELAXED_MIN_DURATION_SECONDS),
+        ]
+        self._heaps: List[List[Tuple[int, int, Dict[str, Any]]]] = [[] for _ in self.tiers]
+        self._seen: Set[str] = set()
+        self._sequence = 0
+
+    @property
+    def strict_pool_full(self) -> bool:
+        """The strict tier holds `pool_size` candidates; more can only displace
+        lower-view ones, which scoring would otherwise have considered."""
+        return self.top_n > 0 and len(self._heaps[0]) >= self.pool_size
+
+    def add(self, video: Dict[str, Any]) -> None:
+        video_id = video["youtube_id"]
+        if video_id in self._seen:
+            return
+        self._seen.add(video_id)
+
+        for heap, (_, published_after, min_seconds) in zip(self._heaps, self.tiers):
+            if video["published_at"] < published_after or not has_min_duration(video, min_seconds):
+                continue
+            # Earlier candidates win view-count ties, as with a stable sort.
+            entry = (video["view_count"], -self._sequence, video)
+            self._sequence += 1
+            if len(heap) < self.pool_size:
+                heapq.heappush(heap, entry)
+            elif heap and entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+            return
+
+    def candidates(self) -> List[Dict[str, Any]]:
+        return [entry[2] for heap in self._heaps for entry in heap]
+
+    def select(
+        self,
+        scores: Optional[Dict[str, ScoredVideo]] = None,
+        *,
+        include: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        """Drain the tiers in order; `include`/`limit` cut a sub-board from
+        the same pool (the limit is also its fill target)."""
+        top_n = self.top_n if limit is None else limit
+        target = self.target if limit is None else limit
+        selected: List[Dict[str, Any]] = []
+        stage_counts: Dict[str, int] = {}
+        for index, (heap, (name, _, _)) in enumerate(zip(self._heaps, self.tiers)):
+            if index > 0 and len(selected) >= target:
+                break
+            ranked = sorted(
+                (entry for entry in heap if include is None or include(entry[2])),
+                key=lambda entry: entry[:2],
+                reverse=True,
+            )
+            if scores:
+                # Stable, so equal scores keep the view-count order.
+                ranked.sort(key=lambda entry: scores[entry[2]["youtube_id"]].score, reverse=True)
+            taken = [entry[2] for entry in ranked[: max(top_n - len(selected), 0)]]
+            selected.extend(taken)
+            stage_counts[name] = len(taken)
+        return selected, stage_counts
 
-    if len(selected_candidates) < target_count:
-        stage_counts["fallback_short_fill"] = _extend_unique_videos(
-            selected_candidates,
-            normalized_candidates,
-            lambda video: video["published_at"] >= fallback_threshold
-            and has_min_duration(video, RELAXED_MIN_DURATION_SECONDS),
-            top_n,
+
+def score_candidates(
+    candidates: List[Dict[str, Any]],
+    *,
+    now: datetime,
+    weights: ScoreWeights,
+    tag_vote_totals: Optional[Dict[str, int]] = None,
+) -> Dict[str, ScoredVideo]:
+    result = score_videos(candidates, now=now, tag_vote_totals=tag_vote_totals, weights=weights)
+    return {
+        video["youtube_id"]: ScoredVideo(result.scaled(idx), result.scaled_contributions(idx))
+        for idx, video in enumerate(candidates)
+    }
+
+
+def video_board_tags(video: Dict[str, Any]) -> Set[str]:
+    tags = set(compute_tags(video.get("title"), video.get("description"), video.get("tags")))
+    tags.add(detect_language_from_title(video.get("title") or ""))
+    return tags
+
+
+def build_boards(
+    selector: TieredSelector,
+    scores: Dict[str, ScoredVideo],
+    *,
+    board_size: int,
+    min_items: int,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Cut one sub-board per tag from the already-scored candidate pool."""
+    tags_by_video = {video["youtube_id"]: video_board_tags(video) for video in selector.candidates()}
+    boards: Dict[str, List[Dict[str, Any]]] = {}
+    for board in sub_boards():
+        videos, _ = selector.select(
+            scores,
+            include=lambda video: board in tags_by_video[video["youtube_id"]],
+            limit=board_size,
         )
+        if len(videos) >= max(min_items, 1):
+            boards[board] = videos
+    return boards
 
-    truncated = selected_candidates[:top_n]
 
-    if not truncated:
-        logger.warning("No recent items survived filtering, nothing to persist.")
-        return
+def build_ranking(
+    api_key: str,
+    queries: List[str],
+    per_query: int,
+    top_n: int,
+    recent_threshold: datetime,
+    *,
+    weights: Optional[ScoreWeights] = None,
+    tag_vote_lookup: Optional[Callable[[List[str]], Dict[str, int]]] = None,
+    board_size: int = DEFAULT_BOARD_SIZE,
+    board_min_items: int = DEFAULT_BOARD_MIN_ITEMS,
+    with_boards: bool = True,
+) -> RankingPayload:
+    """Stream search -> details -> blacklist -> normalize -> tiered selection.
+
+    Candidates flow through one detail batch at a time and only the per-tier
+    heaps are retained. Detail fetching (and any remaining searches) stop as
+    soon as the strict tier alone holds its whole scoring pool (the larger
+    of `top_n` and `board_size`, times CANDIDATE_POOL_FACTOR). Search
+    results are only ordered by viewCount within each query, so the stop
+    does not skip a low-view tail: it skips whatever is left of the current
+    query and every later query, whatever their views. Earlier `queries`
+    take precedence, so list them in priority order. The retained pool is
+    scored in one vectorized pass and each tier is ordered by that score;
+    tag sub-boards are cut from that same pool without further API calls.
+    """
+    published_after = recent_threshold.strftime("%Y-%m-%dT%H:%M:%SZ")
+    target_count = min(top_n, MIN_WEEKLY_RESULTS)
+    # Sub-boards are cut from the same pool, so it must be deep enough for a
+    # full board of each tag, not just for the main board.
+    pool_base = max(top_n, board_size) if with_boards else top_n
+    selector = TieredSelector(
+        top_n, target_count, recent_threshold, pool_size=pool_base * CANDIDATE_POOL_FACTOR
+    )
+    batcher = VideoDetailsBatcher(api_key)
+    stats: "OrderedDict[str, StageStats]" = OrderedDict()
 
+    stream = instrument_stage(
+        "search", iter_search_ids(api_key, queries, per_query, published_after), stats
+    )
+    stream = instrument_stage(
+        "details", iter_video_details(batcher, stream, lambda: selector.strict_pool_full), stats
+    )
+    stream = instrument_stage("blacklist", iter_allowed(stream), stats)
+    stream = instrument_stage("normalize", iter_normalized(stream), stats)
+    selection = StageStats("select")
+    for video in stream:
+        started = time.perf_counter()
+        selector.add(video)
+        selection.seconds += time.perf_counter() - started
+
+    candidates = selector.candidates()
+    started = time.perf_counter()
+    tag_vote_totals = tag_vote_lookup([v["youtube_id"] for v in candidates]) if tag_vote_lookup else {}
+    scores = score_candidates(
+        candidates,
+        now=utc_now(),
+        weights=weights or ScoreWeights(),
+        tag_vote_totals=tag_vote_totals,
+    )
+    scoring_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    selected, stage_counts = selector.select(scores)
+    selection.seconds += time.perf_counter() - started
+    selection.count = len(selected)
+
+    boards: Dict[str, List[Dict[str, Any]]] = {}
+    started = time.perf_counter()
+    if with_boards:
+        boards = build_boards(selector, scores, board_size=board_size, min_items=board_min_items)
+    boards_seconds = time.perf_counter() - started
+
+    log_stage_stats(stats)
+    logger.info("Stage score: %s candidates in %.3fs", len(candidates), scoring_seconds)
+    logger.info("Stage select: %s candidates in %.3fs", selection.count, selection.seconds)
+    logger.info(
+        "Stage boards: %s sub-boards (%s) in %.3fs",
+        len(boards),
+        ", ".join(f"{board}={len(videos)}" for board, videos in boards.items()) or "none",
+        boards_seconds,
+    )
+    logger.info(
+        "Fetched details for %s video IDs in %s videos.list requests",
+        batcher.requested_ids,
+        batcher.request_count,
+    )
     logger.info(
         "Selected %s videos (target=%s, strict=%s, recent_short=%s, fallback_long=%s, fallback_short=%s)",
-        len(truncated),
+        len(selected),
         target_count,
         stage_counts.get("strict_recent_long", 0),
         stage_counts.get("recent_short_fill", 0),
@@ -406,37 +597,98 @@ def persist_ranking(
         stage_counts.get("fallback_short_fill", 0),
     )
 
-    preview_count = min(5, len(truncated))
-    logger.info("Top %s preview (title | channel | views):", preview_count)
-    for idx, preview_payload in enumerate(truncated[:preview_count], start=1):
+    return RankingPayload(
+        items=selected,
+        generated_at=utc_now(),
+        queries=queries,
+        scores=scores,
+        boards=boards,
+    )
+
+
+def _ranking_items(payload: RankingPayload, videos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    ranking_items = []
+    for idx, video_payload in enumerate(videos, start=1):
+        item: Dict[str, Any] = {
+            "video_id": video_payload["youtube_id"],
+            "position": idx,
+            "score": video_payload["view_count"],
+        }
+        scored = payload.scores.get(video_payload["youtube_id"])
+        if scored:
+            item["score"] = scored.score
+            item["score_components"] = scored.components
+        ranking_items.append(item)
+    return ranking_items
+
+
+def persist_ranking(
+    supabase_client: SupabaseRestClient,
+    payload: RankingPayload,
+    list_name: str,
+    description: str,
+    dry_run: bool,
+    invalidate_channels: Optional[Callable[[Iterable[str]], None]] = None,
+) -> None:
+    selected = payload.items
+    if not selected:
+        logger.warning("No recent items survived filtering, nothing to persist.")
+        return
+
+    logger.info("Building ranking list %s with %s entries", list_name, len(selected))
+
+    preview_count = min(5, len(selected))
+    logger.info("Top %s preview (title | channel | views | score):", preview_count)
+    for idx, preview_payload in enumerate(selected[:preview_count], start=1):
+        scored = payload.scores.get(preview_payload["youtube_id"])
         logger.info(
-            "#%s %s | %s | %s views",
+            "#%s %s | %s | %s views | %s",
             idx,
             preview_payload["title"],
             preview_payload["channel_title"],
             preview_payload["view_count"],
+            scored.components if scored else "-",
         )
 
     if dry_run:
         logger.info("Dry run enabled, skipping Supabase writes.")
         return
 
-    serialized_videos = [_serialize_video(v) for v in truncated]
-    supabase_client.upsert_videos(serialized_videos)
-    ranking_list_id = supabase_client.insert_ranking_list(list_name, description)
-
-    ranking_items = [
+    board_videos = {MAIN_BOARD: selected, **payload.boards}
+    boards = [
         {
-            "ranking_list_id": ranking_list_id,
-            "video_id": video_payload["youtube_id"],
-            "position": idx,
-            "score": video_payload["view_count"],
+            "board": board,
+            "name": list_name,
+            "description": description,
+            "items": _ranking_items(payload, videos),
         }
-        for idx, video_payload in enumerate(truncated, start=1)
+        for board, videos in board_videos.items()
     ]
-    supabase_client.insert_ranking_items(ranking_items)
+    videos_by_id: Dict[str, Dict[str, Any]] = {}
+    for videos in board_videos.values():
+        for video_payload in videos:
+            videos_by_id.setdefault(video_payload["youtube_id"], video_payload)
+
+    # Videos go first, in parallel byte-sized batches. The upsert is
+    # idempotent, so a failure after it leaves no partial board: the lists
+    # and their items are written together by the boards RPC.
+    supabase_client.upsert_videos([_serialize_video(v) for v in videos_by_id.values()])
+    list_ids = supabase_client.persist_ranking_boards(boards)
+    if invalidate_channels is not None:
+        # The ranking is already committed; a failed invalidation only means
+        # cached browse pages live out their TTL.
+        try:
+            invalidate_channels({video["channel_id"] for video in videos_by_id.values()})
+        except RuntimeError as exc:
+            logger.warning("Result cache invalidation failed: %s", exc)
 
-    logger.info("Persisted ranking list %s with %s entries", list_name, len(truncated))
+    logger.info(
+        "Persisted ranking list %s (id=%s) with %s entries and %s sub-boards",
+        list_name,
+        list_ids.get(MAIN_BOARD),
+        len(selected),
+        len(payload.boards),
+    )
 
 
 def main() -> None:
@@ -454,37 +706,56 @@ def main() -> None:
     if not service_role_key:
         raise RuntimeError("SUPABASE_SERVICE_ROLE_KEY is required for Supabase REST writes.")
 
-    supabase_client = SupabaseRestClient(supabase_url, service_role_key)
+    supabase_client = SupabaseRestClient(
+        supabase_url,
+        service_role_key,
+        gzip_min_bytes=1024 if args.gzip else None,
+    )
 
-    anchor = datetime.now(timezone.utc) - timedelta(days=args.days_offset)
+    anchor = utc_now() - timedelta(days=args.days_offset)
     recent_threshold = anchor - timedelta(days=RECENT_DAYS)
-    published_after = recent_threshold.strftime("%Y-%m-%dT%H:%M:%SZ")
 
-    aggregated: "OrderedDict[str, None]" = OrderedDict()
-    for query in args.queries:
-        for video_id in fetch_search_ids(api_key, query, args.per_query, published_after):
-            aggregated.setdefault(video_id, None)
-
-    payload = RankingPayload(
-        items=fetch_video_details(api_key, list(aggregated.keys())),
-        generated_at=datetime.now(timezone.utc),
-        queries=args.queries,
+    payload = build_ranking(
+        api_key,
+        args.queries,
+        args.per_query,
+        args.top,
+        recent_threshold,
+        weights=ScoreWeights(
+            velocity=args.weight_velocity,
+            like_ratio=args.weight_like_ratio,
+            tag_quality=args.weight_tag_quality,
+        ),
+        tag_vote_lookup=supabase_client.fetch_tag_vote_totals,
+        board_size=args.board_size,
+        board_min_items=args.board_min_items,
+        with_boards=not args.no_boards,
     )
+    JOB_ITEMS.labels("fetch_rankings", "videos").inc(len(payload.items))
 
     default_label_date = anchor.date()
     list_name = args.name or f"ASMR Weekly Pulse {default_label_date:%Y-%m-%d}"
     description = args.description or ""
-
-    persist_ranking(
-        supabase_client,
-        payload,
-        list_name,
-        description,
-        args.top,
-        args.dry_run,
-        recent_threshold,
-    )
+    # A shared (Redis) cache is invalidated directly; otherwise the bump goes
+    # through Postgres, which NOTIFYs every API worker's listener.
+    result_cache_url = os.getenv("RESULT_CACHE_URL")
+    if result_cache_url:
+        invalidate_channels = ResultCache.from_url(result_cache_url).invalidate_channels
+    else:
+        def invalidate_channels(channel_ids: Iterable[str]) -> None:
+            supabase_client.bump_cache_versions(channel_invalidation_tags(channel_ids))
+
+    with supabase_client:
+        persist_ranking(
+            supabase_client,
+            payload,
+            list_name,
+            description,
+            args.dry_run,
+            invalidate_channels=invalidate_channels,
+        )
 
 
 if __name__ == "__main__":
-    main()
+    with track_job("fetch_rankings"):
+        main()
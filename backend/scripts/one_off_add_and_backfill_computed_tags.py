@@ -12,6 +12,7 @@ import sys
 from pathlib import Path
 
 from sqlalchemy import create_engine, text
+from sqlalchemy.orm import undefer
 
 # Ensure `app` package is importable when running this script directly
 ROOT = Path(__file__).resolve().parents[1]
@@ -21,6 +22,7 @@ if str(ROOT) not in sys.path:
 from app.core.config import Settings  # type: ignore  # noqa: E402
 from app.db.session import SessionLocal  # type: ignore  # noqa: E402
 from app.models.video import Video  # type: ignore  # noqa: E402
+from app.services.result_cache import get_result_cache  # type: ignore  # noqa: E402
 from app.services.tagging import compute_tags_for_video  # type: ignore  # noqa: E402
 
 
@@ -36,13 +38,19 @@ def ensure_column() -> None:
 def backfill() -> None:
     db = SessionLocal()
     try:
-        videos = db.query(Video).filter(Video.computed_tags.is_(None)).all()
+        videos = (
+            db.query(Video)
+            .options(undefer(Video.description))
+            .filter(Video.computed_tags.is_(None))
+            .all()
+        )
         print(f"Found {len(videos)} videos without computed_tags")
         for video in videos:
             tags = compute_tags_for_video(video)
             video.computed_tags = tags
             db.add(video)
         db.commit()
+        get_result_cache().invalidate_catalog()
         print("Backfill complete")
     finally:
         db.close()
@@ -0,0 +1,167 @@
+"""Re-poll view/like counts for stale videos and record them as history.
+
+Each run picks the videos whose stats are oldest (never-refreshed first,
+most-viewed first within the same age), looks them up with full 50-ID
+`videos.list?part=statistics` batches, appends one `video_stats_history`
+point per video and copies the latest counts back onto `videos`. It then
+downsamples old history according to the retention policy.
+
+Usage:
+
+    PYTHONPATH=backend python -m backend.scripts.refresh_video_stats \
+        --limit 5000 --stale-hours 24
+"""
+
+import argparse
+import logging
+from datetime import datetime, timedelta
+
+from app.core.config import Settings
+from app.core.metrics import JOB_ITEMS, track_job
+from app.db.session import SessionLocal
+from app.services.result_cache import get_result_cache
+from app.services.video_stats import (
+    RetentionPolicy,
+    downsample_history,
+    record_stats,
+    select_stale_videos,
+)
+from backend.scripts.youtube_client import VideoDetailsBatcher, chunked
+
+logger = logging.getLogger("refresh_video_stats")
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Refresh view/like counts for stale videos and append stats history.",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=5000,
+        help="Maximum number of videos to refresh in this run (1 quota unit per 50).",
+    )
+    parser.add_argument(
+        "--stale-hours",
+        type=int,
+        default=24,
+        help="Only refresh videos whose stats are older than this many hours.",
+    )
+    parser.add_argument(
+        "--raw-days",
+        type=int,
+        default=RetentionPolicy.raw_days,
+        help="Keep every history point for this many days.",
+    )
+    parser.add_argument(
+        "--daily-days",
+        type=int,
+        default=RetentionPolicy.daily_days,
+        help="Keep one point per day up to this age, one per week beyond it.",
+    )
+    parser.add_argument(
+        "--retention-days",
+        type=int,
+        default=RetentionPolicy.retention_days,
+        help="Drop history points older than this many days.",
+    )
+    parser.add_argument(
+        "--api-key",
+        default=None,
+        help="Override the YouTube API key (falls back to YOUTUBE_API_KEY in env).",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Fetch stats but do not write anything to the database.",
+    )
+    return parser.parse_args()
+
+
+def parse_count(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def main() -> None:
+    args = parse_arguments()
+    settings = Settings()
+    api_key = args.api_key or settings.youtube_api_key
+    if not api_key:
+        raise RuntimeError(
+            "YouTube API key is required—set YOUTUBE_API_KEY in the .env file",
+        )
+
+    session = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        video_ids = select_stale_videos(
+            session,
+            now=now,
+            stale_after=timedelta(hours=args.stale_hours),
+            limit=args.limit,
+        )
+        if not video_ids:
+            logger.info("No stale videos; nothing to refresh.")
+        else:
+            logger.info("Refreshing stats for %s stale videos.", len(video_ids))
+
+        batcher = VideoDetailsBatcher(api_key, parts="statistics")
+        refreshed = 0
+        for batch in chunked(video_ids, batcher.batch_size):
+            details = batcher.submit(batch).result()
+            observations = {
+                detail["id"]: (
+                    parse_count(detail.get("statistics", {}).get("viewCount")),
+                    parse_count(detail.get("statistics", {}).get("likeCount")),
+                )
+                for detail in details
+            }
+            refreshed += record_stats(
+                session,
+                observations,
+                observed_at=datetime.utcnow(),
+                refreshed_ids=batch,
+            )
+            if args.dry_run:
+                session.rollback()
+            else:
+                # Commit per batch so an interrupted run keeps its progress.
+                session.commit()
+
+        logger.info(
+            "Refreshed %s of %s videos in %s videos.list requests.",
+            refreshed,
+            len(video_ids),
+            batcher.request_count,
+        )
+        JOB_ITEMS.labels("refresh_video_stats", "videos").inc(refreshed)
+        JOB_ITEMS.labels("refresh_video_stats", "youtube_requests").inc(batcher.request_count)
+
+        if args.dry_run:
+            logger.info("Dry run enabled—skipping history downsampling.")
+            return
+        if refreshed:
+            # Counts feed the views/likes sort orders of every browse page.
+            get_result_cache().invalidate_catalog()
+
+        removed = downsample_history(
+            session,
+            now=now,
+            policy=RetentionPolicy(
+                raw_days=args.raw_days,
+                daily_days=args.daily_days,
+                retention_days=args.retention_days,
+            ),
+        )
+        logger.info("Downsampled stats history, removed %s points.", removed)
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    with track_job("refresh_video_stats"):
+        main()
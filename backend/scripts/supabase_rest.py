@@ -0,0 +1,321 @@
+"""Supabase (PostgREST) REST client used by the ingestion scripts.
+
+One pooled `requests.Session` is shared by every call. Upsert batches are
+sized by encoded bytes as well as row count and sent in parallel, idempotent
+writes are retried with jittered exponential backoff so a single transient
+5xx does not fail the weekly job, and request bodies can optionally be
+gzip-compressed once they are large enough to be worth it.
+"""
+
+import gzip
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+logger = logging.getLogger("supabase_rest")
+
+
+class TransferStats:
+    """Running totals for the rows and bytes a client has written."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.rows = 0
+        self.raw_bytes = 0
+        self.sent_bytes = 0
+
+    def record(self, *, rows: int, raw_bytes: int, sent_bytes: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.rows += rows
+            self.raw_bytes += raw_bytes
+            self.sent_bytes += sent_bytes
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+
+def encode_json(payload: Any) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class SupabaseRestClient:
+    def __init__(
+        self,
+        supabase_url: str,
+        service_role_key: str,
+        *,
+        max_concurrency: int = 4,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        gzip_min_bytes: Optional[int] = None,
+        batch_max_rows: int = 200,
+        batch_max_bytes: int = 512 * 1024,
+        timeout: float = 20,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.base_url = f"{supabase_url.rstrip('/')}/rest/v1"
+        self.headers = {
+            "apikey": service_role_key,
+            "Authorization": f"Bearer {service_role_key}",
+            "Content-Type": "application/json",
+        }
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # None (the default) sends bodies uncompressed; a byte threshold gzips
+        # larger bodies, for gateways known to accept Content-Encoding: gzip.
+        self.gzip_min_bytes = gzip_min_bytes
+        self.batch_max_rows = batch_max_rows
+        self.batch_max_bytes = batch_max_bytes
+        self.timeout = timeout
+        self._sleep = sleep
+        self.stats = TransferStats()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(self.headers)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "SupabaseRestClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json_payload: Optional[Any] = None,
+        body: Optional[bytes] = None,
+        rows: int = 0,
+        prefer: Optional[str] = None,
+        idempotent: bool = False,
+    ) -> Any:
+        """Send one request, retrying transient failures when `idempotent`.
+
+        `body` lets callers pass JSON they already encoded (upsert batches are
+        encoded once while being sized); otherwise `json_payload` is encoded.
+        """
+        headers: Dict[str, str] = {}
+        if prefer:
+            headers["Prefer"] = prefer
+
+        data = body if body is not None else None
+        if data is None and json_payload is not None:
+            data = encode_json(json_payload)
+        raw_size = len(data) if data else 0
+        if data and self.gzip_min_bytes is not None and raw_size >= self.gzip_min_bytes:
+            data = gzip.compress(data, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
+
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        attempt = 0
+        while True:
+            try:
+                response = self.session.request(
+                    method,
+                    url,
+                    params=params,
+                    data=data,
+                    headers=headers,
+                    timeout=self.timeout,
+                )
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if not idempotent or attempt >= self.max_retries:
+                    raise RuntimeError(f"Supabase REST {method} {path} failed: {exc}") from exc
+                self._wait_before_retry(method, path, attempt, str(exc), None)
+                attempt += 1
+                continue
+
+            if (
+                idempotent
+                and response.status_code in RETRYABLE_STATUS_CODES
+                and attempt < self.max_retries
+            ):
+                self._wait_before_retry(
+                    method,
+                    path,
+                    attempt,
+                    f"HTTP {response.status_code}",
+                    response.headers.get("Retry-After"),
+                )
+                attempt += 1
+                continue
+
+            if not response.ok:
+                raise RuntimeError(
+                    f"Supabase REST {method} {path} failed: {response.status_code} {response.text}"
+                )
+            break
+
+        self.stats.record(rows=rows, raw_bytes=raw_size, sent_bytes=len(data) if data else 0)
+        if not response.text:
+            return None
+        try:
+            return response.json()
+        except ValueError:
+            return response.text
+
+    def _wait_before_retry(
+        self,
+        method: str,
+        path: str,
+        attempt: int,
+        reason: str,
+        retry_after: Optional[str],
+    ) -> None:
+        # Full jitter keeps parallel batches from retrying in lockstep.
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        if retry_after:
+            try:
+                delay = max(delay, min(float(retry_after), self.backoff_max))
+            except ValueError:
+                pass
+        self.stats.record_retry()
+        logger.warning(
+            "Supabase REST %s %s failed (%s), retry %s/%s in %.2fs",
+            method,
+            path,
+            reason,
+            attempt + 1,
+            self.max_retries,
+            delay,
+        )
+        self._sleep(delay)
+
+    def plan_batches(self, rows: Iterable[Dict[str, Any]]) -> Iterator[List[bytes]]:
+        """Group encoded rows so each batch stays under both size limits."""
+        batch: List[bytes] = []
+        batch_bytes = 0
+        for row in rows:
+            encoded = encode_json(row)
+            if batch and (
+                len(batch) >= self.batch_max_rows
+                or batch_bytes + len(encoded) > self.batch_max_bytes
+            ):
+                yield batch
+                batch, batch_bytes = [], 0
+            batch.append(encoded)
+            batch_bytes += len(encoded) + 1
+        if batch:
+            yield batch
+
+    def upsert_rows(self, table: str, rows: List[Dict[str, Any]], on_conflict: str) -> None:
+        """Upsert rows in byte-sized batches, up to `max_concurrency` at once.
+
+        Merge-duplicates upserts are idempotent, so every batch is retried
+        independently on transient failures.
+        """
+        if not rows:
+            return
+
+        batches = list(self.plan_batches(rows))
+        started = time.perf_counter()
+        sent_before = self.stats.sent_bytes
+
+        def send(batch: List[bytes]) -> None:
+            self._request(
+                "POST",
+                table,
+                params={"on_conflict": on_conflict},
+                body=b"[" + b",".join(batch) + b"]",
+                rows=len(batch),
+                prefer="resolution=merge-duplicates,return=minimal",
+                idempotent=True,
+            )
+
+        if len(batches) == 1 or self.max_concurrency == 1:
+            for batch in batches:
+                send(batch)
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as pool:
+                # list() re-raises the first batch failure, if any.
+                list(pool.map(send, batches))
+
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        logger.info(
+            "Upserted %s rows into %s in %s batches: %.2fs, %.0f rows/s, %.1f KiB sent",
+            len(rows),
+            table,
+            len(batches),
+            elapsed,
+            len(rows) / elapsed,
+            (self.stats.sent_bytes - sent_before) / 1024,
+        )
+
+    def upsert_videos(self, videos: List[Dict[str, Any]]) -> None:
+        self.upsert_rows("videos", videos, on_conflict="youtube_id")
+
+    def fetch_tag_vote_totals(self, video_ids: List[str], chunk_size: int = 100) -> Dict[str, int]:
+        """Return net community tag votes per video (absent ids have none).
+
+        IDs are sent in chunks to keep the `in.(...)` filter within URL limits.
+        """
+        totals: Dict[str, int] = {}
+        for start in range(0, len(video_ids), chunk_size):
+            chunk = video_ids[start : start + chunk_size]
+            rows = self._request(
+                "GET",
+                "video_tag_votes",
+                params={"select": "video_id,vote", "video_id": f"in.({','.join(chunk)})"},
+                idempotent=True,
+            )
+            for row in rows or []:
+                totals[row["video_id"]] = totals.get(row["video_id"], 0) + int(row["vote"])
+        return totals
+
+    def bump_cache_versions(self, tags: List[str]) -> Dict[str, int]:
+        """Invalidate result-cache tags on every API worker.
+
+        Goes through the `bump_cache_versions` function, which NOTIFYs the
+        workers' listeners. Returns {tag: new_version}.
+        """
+        versions = self._request(
+            "POST",
+            "rpc/bump_cache_versions",
+            json_payload={"p_tags": tags},
+            rows=len(tags),
+        )
+        return {tag: int(version) for tag, version in (versions or {}).items()}
+
+    def persist_ranking_boards(self, boards: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Write several boards (`board`, `name`, `description`, `items`) in
+        one transaction via the `persist_ranking_boards` function.
+
+        The videos the items reference must already exist (`upsert_videos`).
+        Returns the ranking list id of each board. Each (name, board) list is
+        replaced in place rather than duplicated, so the call is safe to retry.
+        """
+        list_ids = self._request(
+            "POST",
+            "rpc/persist_ranking_boards",
+            json_payload={"p_boards": boards},
+            rows=sum(len(board["items"]) + 1 for board in boards),
+            idempotent=True,
+        )
+        if not isinstance(list_ids, dict):
+            raise RuntimeError(f"persist_ranking_boards returned an unexpected payload: {list_ids!r}")
+        return {board: int(list_id) for board, list_id in list_ids.items()}
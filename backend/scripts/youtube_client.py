@@ -0,0 +1,159 @@
+"""Shared YouTube Data API helpers for the ingestion scripts.
+
+Both `fetch_rankings` and `fetch_channel_videos` need the same `videos.list`
+lookups. `videos.list` accepts up to 50 IDs per call and costs one quota unit
+regardless of how many IDs are passed, so callers should route their IDs
+through a `VideoDetailsBatcher`: it pools IDs from every producer into full
+50-ID requests, skips IDs already fetched in the current run, and hands each
+caller back just the details it asked for.
+
+`YOUTUBE_API_BASE_URL` sends every request to another origin instead of
+`https://www.googleapis.com`; `benchmarks.replay` uses it to record and
+replay the scripts' traffic through a local stub.
+"""
+
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import requests
+
+
+YOUTUBE_API_ORIGIN = "https://www.googleapis.com"
+YOUTUBE_SEARCH_URL = f"{YOUTUBE_API_ORIGIN}/youtube/v3/search"
+YOUTUBE_VIDEOS_URL = f"{YOUTUBE_API_ORIGIN}/youtube/v3/videos"
+VIDEO_DETAIL_PARTS = "snippet,statistics,contentDetails"
+MAX_IDS_PER_REQUEST = 50
+
+
+def youtube_request(url: str, api_key: str, **params: Any) -> Dict[str, Any]:
+    base_url = os.getenv("YOUTUBE_API_BASE_URL")
+    if base_url and url.startswith(YOUTUBE_API_ORIGIN):
+        url = base_url.rstrip("/") + url[len(YOUTUBE_API_ORIGIN):]
+    params["key"] = api_key
+    response = requests.get(url, params=params, timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+
+def chunked(iterable: Iterable[Any], size: int) -> Iterable[List[Any]]:
+    iterator = iter(iterable)
+    while True:
+        chunk = []
+        for _ in range(size):
+            try:
+                chunk.append(next(iterator))
+            except StopIteration:
+                break
+        if not chunk:
+            break
+        yield chunk
+
+
+def fetch_video_details_batch(
+    api_key: str,
+    video_ids: List[str],
+    parts: str = VIDEO_DETAIL_PARTS,
+) -> List[Dict[str, Any]]:
+    """Issue a single `videos.list` call for at most 50 IDs."""
+    payload = youtube_request(
+        YOUTUBE_VIDEOS_URL,
+        api_key,
+        part=parts,
+        id=",".join(video_ids),
+    )
+    return payload.get("items", [])
+
+
+class DetailsTicket:
+    """Handle returned by `VideoDetailsBatcher.submit` for one caller's IDs."""
+
+    def __init__(self, batcher: "VideoDetailsBatcher", video_ids: List[str]) -> None:
+        self._batcher = batcher
+        self.video_ids = video_ids
+
+    def result(self) -> List[Dict[str, Any]]:
+        """Return details for this ticket's IDs, in submission order.
+
+        Flushes any still-pending IDs first. IDs that YouTube did not return
+        (deleted or private videos) are simply absent from the result.
+        """
+        return self._batcher.collect(self.video_ids)
+
+
+class VideoDetailsBatcher:
+    """Coalesce `videos.list` lookups from many producers into full batches.
+
+    Producers call `submit()` with whatever IDs they have; a request is only
+    sent once 50 distinct, not-yet-fetched IDs are pending (or on `flush()`).
+    Every detail fetched during the run is kept, so the same ID submitted by
+    two channels or two search queries costs nothing the second time.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        batch_size: int = MAX_IDS_PER_REQUEST,
+        parts: str = VIDEO_DETAIL_PARTS,
+        fetch_batch: Optional[Callable[[str, List[str], str], List[Dict[str, Any]]]] = None,
+    ) -> None:
+        if not 1 <= batch_size <= MAX_IDS_PER_REQUEST:
+            raise ValueError(f"batch_size must be between 1 and {MAX_IDS_PER_REQUEST}")
+        self.api_key = api_key
+        self.batch_size = batch_size
+        self.parts = parts
+        self._fetch_batch = fetch_batch or fetch_video_details_batch
+        # Insertion-ordered set of IDs waiting for the next request.
+        self._pending: Dict[str, None] = {}
+        # Every ID already sent to YouTube in this run; None marks IDs the
+        # API did not return so we don't ask for them again.
+        self._fetched: Dict[str, Optional[Dict[str, Any]]] = {}
+        self.request_count = 0
+        self.requested_ids = 0
+
+    def submit(self, video_ids: Iterable[str]) -> DetailsTicket:
+        ids = list(dict.fromkeys(video_ids))
+        for video_id in ids:
+            if video_id in self._fetched or video_id in self._pending:
+                continue
+            self._pending[video_id] = None
+            if len(self._pending) >= self.batch_size:
+                self._send(self._take(self.batch_size))
+        return DetailsTicket(self, ids)
+
+    def flush(self) -> None:
+        """Send whatever is pending, even if it does not fill a batch."""
+        while self._pending:
+            self._send(self._take(self.batch_size))
+
+    def collect(self, video_ids: List[str]) -> List[Dict[str, Any]]:
+        if any(video_id in self._pending for video_id in video_ids):
+            self.flush()
+        return [
+            self._fetched[video_id]
+            for video_id in video_ids
+            if self._fetched.get(video_id) is not None
+        ]
+
+    def _take(self, count: int) -> List[str]:
+        batch = []
+        for video_id in list(self._pending)[:count]:
+            del self._pending[video_id]
+            batch.append(video_id)
+        return batch
+
+    def _send(self, batch: List[str]) -> None:
+        items = self._fetch_batch(self.api_key, batch, self.parts)
+        self.request_count += 1
+        self.requested_ids += len(batch)
+        for video_id in batch:
+            self._fetched.setdefault(video_id, None)
+        for item in items:
+            video_id = item.get("id")
+            if video_id:
+                self._fetched[video_id] = item
+
+
+def fetch_video_details(api_key: str, video_ids: List[str]) -> List[Dict[str, Any]]:
+    batcher = VideoDetailsBatcher(api_key)
+    return batcher.submit(video_ids).result()
@@ -0,0 +1,104 @@
+"""In-process API client backed by a throwaway SQLite database.
+
+`app.main` reads its settings (and `app.db.session` builds its engines) at
+import time, so placeholder values are set before the import; every request
+then goes through `get_db`/`get_async_db` overrides bound to a fresh SQLite
+file (sync and aiosqlite engines on the same file), and a fresh in-process
+result cache so cached pages never leak between tests. Read-only endpoints
+use the same file unless a second database is passed as the replica. The
+admin endpoints accept `ADMIN_HEADERS`.
+"""
+
+import os
+import tempfile
+from typing import List, Optional, Tuple
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "test-key")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
+
+from app.api.dependencies import get_admin_token, get_async_db, get_db, get_db_router  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.routing import READ_ONLY, ReplicaRouter  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.result_cache import LRUBackend, ResultCache, get_result_cache  # noqa: E402
+
+
+ADMIN_TOKEN = "test-admin-token"
+ADMIN_HEADERS = {"X-Admin-Token": ADMIN_TOKEN}
+
+_database_files: List[str] = []
+
+
+def make_database(*, read_only: bool = False) -> Tuple[sessionmaker, sessionmaker]:
+    """(sync, async) session factories over one fresh SQLite file."""
+    handle, path = tempfile.mkstemp(suffix=".db")
+    os.close(handle)
+    _database_files.append(path)
+    engine = create_engine(
+        f"sqlite:///{path}",
+        future=True,
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    # Unpooled: the test client runs each request on an event loop of its own.
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    async_session_factory = sessionmaker(
+        bind=async_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+        info={READ_ONLY: read_only},
+    )
+    return session_factory, async_session_factory
+
+
+def make_client(
+    result_cache: Optional[ResultCache] = None,
+    router: Optional[ReplicaRouter] = None,
+):
+    """Return (TestClient, sessionmaker) sharing one database.
+
+    `router` replaces the default primary-only routing of read-only
+    endpoints; its primary is pointed at this client's database.
+    """
+    session_factory, async_session_factory = make_database()
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with async_session_factory() as db:
+            yield db
+
+    cache = result_cache or ResultCache(LRUBackend())
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    if router is None:
+        router = ReplicaRouter(async_session_factory)
+    else:
+        router.primary = async_session_factory
+    app.dependency_overrides[get_db_router] = lambda: router
+    app.dependency_overrides[get_result_cache] = lambda: cache
+    app.dependency_overrides[get_admin_token] = lambda: ADMIN_TOKEN
+    return TestClient(app), session_factory
+
+
+def reset_client() -> None:
+    app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_async_db, None)
+    app.dependency_overrides.pop(get_db_router, None)
+    app.dependency_overrides.pop(get_result_cache, None)
+    app.dependency_overrides.pop(get_admin_token, None)
+    while _database_files:
+        os.remove(_database_files.pop())
@@ -0,0 +1,167 @@
+"""Minimal in-process PostgREST stand-in for exercising the REST clients.
+
+It understands just enough of the PostgREST surface the ingestion scripts
+use: `POST /rest/v1/<table>` inserts (optionally `on_conflict` upserts with
+`Prefer: resolution=merge-duplicates`), `return=representation`, simple
+`GET` reads, and gzip request bodies. Tests can queue failures to exercise
+retries.
+"""
+
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+class RecordedRequest:
+    def __init__(
+        self,
+        method: str,
+        path: str,
+        params: Dict[str, str],
+        headers: Dict[str, str],
+        payload: Any,
+    ) -> None:
+        self.method = method
+        self.path = path
+        self.params = params
+        self.headers = headers
+        self.payload = payload
+
+
+class PostgrestStub:
+    def __init__(self) -> None:
+        self.tables: Dict[str, List[Dict[str, Any]]] = {}
+        self.requests: List[RecordedRequest] = []
+        self.rpc_handlers: Dict[str, Callable[[Any], Any]] = {}
+        self._failures: List[int] = []
+        self._next_ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Seconds each request is held open, to make concurrency observable.
+        self.delay = 0.0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "PostgrestStub":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def fail_next(self, count: int, status: int = 503) -> None:
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                stub._dispatch(self)
+
+            def do_POST(self) -> None:
+                stub._dispatch(self)
+
+        return Handler
+
+    def _dispatch(self, handler: BaseHTTPRequestHandler) -> None:
+        with self._lock:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            status, body = self._handle(handler)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        encoded = json.dumps(body).encode("utf-8") if body is not None else b""
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(encoded)))
+        handler.end_headers()
+        handler.wfile.write(encoded)
+
+    def _handle(self, handler: BaseHTTPRequestHandler):
+        parsed = urlparse(handler.path)
+        params = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        length = int(handler.headers.get("Content-Length") or 0)
+        raw = handler.rfile.read(length) if length else b""
+        if handler.headers.get("Content-Encoding") == "gzip":
+            raw = gzip.decompress(raw)
+        payload = json.loads(raw) if raw else None
+        path = parsed.path[len("/rest/v1/"):]
+        self.requests.append(
+            RecordedRequest(handler.command, path, params, dict(handler.headers), payload)
+        )
+
+        with self._lock:
+            failure = self._failures.pop(0) if self._failures else None
+        if failure:
+            return failure, {"message": "injected failure"}
+
+        if path.startswith("rpc/"):
+            rpc = self.rpc_handlers.get(path[len("rpc/"):])
+            if rpc is None:
+                return 404, {"message": f"function {path} not found"}
+            return 200, rpc(payload)
+        if handler.command == "GET":
+            return 200, self._select(path, params)
+        return self._insert(path, params, handler.headers.get("Prefer") or "", payload)
+
+    def _select(self, table: str, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Apply `col=in.(a,b)` filters; other operators are not modelled."""
+        rows = list(self.tables.get(table, []))
+        for column, value in params.items():
+            if value.startswith("in.(") and value.endswith(")"):
+                allowed = set(value[4:-1].split(","))
+                rows = [row for row in rows if str(row.get(column)) in allowed]
+        return rows
+
+    def _insert(self, table: str, params: Dict[str, str], prefer: str, payload: Any):
+        rows = payload if isinstance(payload, list) else [payload]
+        conflict_key: Optional[str] = params.get("on_conflict")
+        merge = "resolution=merge-duplicates" in prefer
+        with self._lock:
+            stored = self.tables.setdefault(table, [])
+            inserted = []
+            for row in rows:
+                row = dict(row)
+                existing = None
+                if conflict_key:
+                    existing = next(
+                        (item for item in stored if item.get(conflict_key) == row.get(conflict_key)),
+                        None,
+                    )
+                if existing is not None:
+                    if not merge:
+                        return 409, {"message": "duplicate key value violates unique constraint"}
+                    existing.update(row)
+                    inserted.append(existing)
+                    continue
+                if "id" not in row and not conflict_key:
+                    next_id = self._next_ids.get(table, 1)
+                    self._next_ids[table] = next_id + 1
+                    row["id"] = next_id
+                stored.append(row)
+                inserted.append(row)
+        if "return=representation" in prefer:
+            return 201, inserted
+        return 201, None
@@ -0,0 +1,47 @@
+"""N+1 detection for API endpoints, from their `Server-Timing` header.
+
+`assert_queries_do_not_scale` grows the data behind an endpoint and fails
+the test when the number of SQL statements a request runs grows with it.
+The request must not be served from a cache; invalidate it in `grow`.
+"""
+
+import re
+import unittest
+from typing import Callable, Dict, Sequence
+
+from requests import Response
+
+
+_DB_TIMING = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+def query_count(response: Response) -> int:
+    match = _DB_TIMING.search(response.headers.get("server-timing", ""))
+    if match is None:
+        raise AssertionError("Response has no db Server-Timing entry")
+    return int(match.group(1))
+
+
+def assert_queries_do_not_scale(
+    test: unittest.TestCase,
+    *,
+    grow: Callable[[int], None],
+    request: Callable[[], Response],
+    sizes: Sequence[int] = (1, 5, 20),
+) -> Dict[int, int]:
+    """Call `grow(n)` to reach each size in turn, then `request()`.
+
+    Returns {size: query count}; fails unless all counts are equal.
+    """
+    counts: Dict[int, int] = {}
+    current = 0
+    for size in sizes:
+        grow(size - current)
+        current = size
+        response = request()
+        test.assertEqual(response.status_code, 200, response.text)
+        counts[size] = query_count(response)
+    test.assertEqual(
+        len(set(counts.values())), 1, f"Query count grows with result size: {counts}"
+    )
+    return counts
@@ -0,0 +1,126 @@
+"""Minimal in-process Redis stand-in speaking RESP2 over TCP.
+
+It implements the commands `RedisBackend` uses (GET, SET with EX, MGET,
+INCR) plus PING, SELECT, AUTH, DEL and FLUSHDB. Keys live in one dict per
+logical database; expiry is checked on read. `stop()` closes every client
+connection, so tests can simulate the server going away.
+"""
+
+import socket
+import socketserver
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class RespStub:
+    def __init__(self) -> None:
+        self.databases: Dict[int, Dict[bytes, Tuple[bytes, Optional[float]]]] = {}
+        self.commands: List[List[bytes]] = []
+        self._lock = threading.Lock()
+        self._connections: List[socket.socket] = []
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"redis://{host}:{port}/0"
+
+    def start(self) -> "RespStub":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        with self._lock:
+            for connection in self._connections:
+                try:
+                    connection.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+                connection.close()
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                with stub._lock:
+                    stub._connections.append(self.connection)
+                db = 0
+                while True:
+                    try:
+                        command = _read_command(self.rfile)
+                    except (OSError, ValueError):
+                        return
+                    if command is None:
+                        return
+                    if command[0].upper() == b"SELECT":
+                        db = int(command[1])
+                    self.wfile.write(stub._execute(db, command))
+                    self.wfile.flush()
+
+        return Handler
+
+    def _execute(self, db: int, command: List[bytes]) -> bytes:
+        name = command[0].upper().decode("ascii")
+        args = command[1:]
+        with self._lock:
+            self.commands.append(command)
+            store = self.databases.setdefault(db, {})
+            if name in ("PING", "SELECT", "AUTH"):
+                return b"+OK\r\n" if name != "PING" else b"+PONG\r\n"
+            if name == "GET":
+                return _bulk(self._get(store, args[0]))
+            if name == "MGET":
+                return b"*%d\r\n" % len(args) + b"".join(_bulk(self._get(store, key)) for key in args)
+            if name == "SET":
+                expires_at = None
+                if len(args) >= 4 and args[2].upper() == b"EX":
+                    expires_at = time.monotonic() + int(args[3])
+                store[args[0]] = (args[1], expires_at)
+                return b"+OK\r\n"
+            if name == "INCR":
+                value = int(self._get(store, args[0]) or 0) + 1
+                store[args[0]] = (str(value).encode("ascii"), None)
+                return b":%d\r\n" % value
+            if name == "DEL":
+                removed = sum(1 for key in args if store.pop(key, None) is not None)
+                return b":%d\r\n" % removed
+            if name == "FLUSHDB":
+                store.clear()
+                return b"+OK\r\n"
+        return b"-ERR unknown command '%s'\r\n" % name.encode("ascii")
+
+    @staticmethod
+    def _get(store: Dict[bytes, Tuple[bytes, Optional[float]]], key: bytes) -> Optional[bytes]:
+        entry = store.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del store[key]
+            return None
+        return value
+
+
+def _bulk(value: Optional[bytes]) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+def _read_command(reader: Any) -> Optional[List[bytes]]:
+    line = reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        raise ValueError("Only RESP arrays are supported")
+    parts = []
+    for _ in range(int(line[1:-2])):
+        length = int(reader.readline()[1:-2])
+        parts.append(reader.read(length + 2)[:-2])
+    return parts
@@ -0,0 +1,188 @@
+"""The orjson fast paths must return exactly what the pydantic paths did."""
+
+import json
+import unittest
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models import RankingItem, RankingList, UserTag, Video, VideoTagVote
+from app.schemas.ranking import RankingItem as RankingItemSchema
+from app.schemas.ranking import RankingList as RankingListSchema
+from app.schemas.video import VideoBase
+from app.services.channels import list_top_channels
+from app.services.tag_feedback import build_effective_tags, get_user_tags_map
+from app.services.tag_votes import get_tag_vote_scores
+from app.services.tagging import compute_tags_for_video
+from tests.api_client import make_client, reset_client
+
+
+NOW = datetime(2026, 10, 19, 12, 0, 0, 123456)
+
+
+def legacy_video(db, video: Video) -> VideoBase:
+    # Serialization as it was before the fast path.
+    payload = VideoBase.from_orm(video)
+    auto_tags = list(video.computed_tags) if video.computed_tags else compute_tags_for_video(video)
+    payload.computed_tags = build_effective_tags(
+        auto_tags=auto_tags,
+        vote_scores=get_tag_vote_scores(db, video.youtube_id),
+        user_tags=get_user_tags_map(db, [video.youtube_id]).get(video.youtube_id, []),
+    )
+    return payload
+
+
+def as_json(value):
+    return json.loads(json.dumps(jsonable_encoder(value)))
+
+
+class FastPathParityTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client, self.sessions = make_client()
+        self.addCleanup(reset_client)
+        db = self.sessions()
+        self.addCleanup(db.close)
+        self.db = db
+        titles = ["ASMR whisper tapping", "ASMR 耳かき", "No talking crinkles", "Brushing"]
+        for n, title in enumerate(titles):
+            db.add(
+                Video(
+                    youtube_id=f"v{n}",
+                    title=title,
+                    description=None if n % 2 else "soft spoken binaural",
+                    channel_title=f"Channel {n % 2}",
+                    channel_id=f"UC{n % 2}",
+                    published_at=NOW - timedelta(days=n, microseconds=n),
+                    view_count=1000 * n,
+                    like_count=10 * n,
+                    duration=None if n == 3 else 600,
+                    tags=None if n == 2 else ["asmr"],
+                    thumbnail_url=None,
+                    # Leave some rows untagged to exercise the backfill.
+                    computed_tags=["whisper"] if n == 0 else None,
+                )
+            )
+        db.add(UserTag(video_id="v1", tag="ja", source="user"))
+        for fingerprint in ["a", "b", "c"]:
+            db.add(VideoTagVote(video_id="v0", tag="whisper", user_fingerprint=fingerprint, vote=-1))
+        ranking = RankingList(
+            name="ASMR Weekly Pulse 2026-10-19",
+            description=None,
+            created_at=NOW,
+        )
+        ranking.ranking_items = [
+            RankingItem(video_id="v2", position=1, score=9000, score_components={"velocity": 9000}),
+            RankingItem(video_id="v0", position=2, score=None),
+            RankingItem(video_id="missing", position=3, score=1),
+        ]
+        db.add(ranking)
+        db.commit()
+
+    def test_videos_page_matches_pydantic_output(self) -> None:
+        rows = self.db.query(Video).order_by(Video.view_count.desc()).all()
+        expected = {
+            "items": [legacy_video(self.db, row) for row in rows[:3]],
+            "total": 4,
+            "page": 1,
+            "page_size": 3,
+        }
+
+        response = self.client.get(
+            "/api/videos", params={"sort": "views_desc", "page_size": 3, "fields": "*"}
+        )
+
+        self.assertEqual(response.headers["content-type"], "application/json")
+        self.assertEqual(response.json(), as_json(expected))
+
+    def test_weekly_ranking_matches_pydantic_output(self) -> None:
+        ranking = self.db.query(RankingList).one()
+        items = []
+        for item in sorted(ranking.ranking_items, key=lambda i: i.position):
+            video = self.db.get(Video, item.video_id)
+            if video:
+                items.append(
+                    RankingItemSchema(
+                        rank=item.position,
+                        video=legacy_video(self.db, video),
+                        score=item.score or 0,
+                        score_components=item.score_components,
+                    )
+                )
+        expected = [
+            RankingListSchema(
+                id=ranking.id,
+                name=ranking.name,
+                description="",
+                published_at="2026-10-19T00:00:00",
+                items=items,
+            )
+        ]
+
+        response = self.client.get("/api/rankings/weekly", params={"fields": "*"})
+
+        self.assertEqual(response.json(), as_json(expected))
+
+    def test_popular_channels_match(self) -> None:
+        expected = [
+            {"channel_id": cid, "channel_title": title, "video_count": count}
+            for cid, title, count in list_top_channels(self.db, limit=30)
+        ]
+
+        self.assertEqual(self.client.get("/api/channels/popular").json(), expected)
+
+
+class SparseFieldsetTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client, self.sessions = make_client()
+        self.addCleanup(reset_client)
+        db = self.sessions()
+        self.addCleanup(db.close)
+        db.add(
+            Video(
+                youtube_id="v1",
+                title="ASMR whisper",
+                description="long description " * 200,
+                channel_title="Channel",
+                channel_id="UC1",
+                published_at=NOW,
+                view_count=10,
+                like_count=1,
+                tags=["asmr"],
+            )
+        )
+        db.commit()
+
+    def test_lists_leave_out_description_by_default(self) -> None:
+        [item] = self.client.get("/api/videos").json()["items"]
+
+        self.assertNotIn("description", item)
+        # Tagging still saw the description while backfilling computed_tags.
+        self.assertEqual(item["computed_tags"], ["whisper"])
+
+    def test_fields_selects_a_projection(self) -> None:
+        response = self.client.get("/api/videos", params={"fields": "view_count,title"})
+
+        self.assertEqual(
+            response.json()["items"],
+            [{"youtube_id": "v1", "title": "ASMR whisper", "view_count": 10}],
+        )
+
+    def test_projection_applies_with_python_side_filters(self) -> None:
+        response = self.client.get("/api/videos", params={"fields": "title", "tags": "whisper"})
+
+        self.assertEqual(response.json()["items"], [{"youtube_id": "v1", "title": "ASMR whisper"}])
+
+    def test_unknown_fields_are_rejected(self) -> None:
+        response = self.client.get("/api/videos", params={"fields": "title,secret"})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_detail_view_includes_description(self) -> None:
+        response = self.client.get("/api/videos/v1")
+
+        self.assertEqual(response.json()["description"], "long description " * 200)
+        self.assertEqual(self.client.get("/api/videos/nope").status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import copy
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+import tests.api_client  # noqa: F401  (settings placeholders)
+from app.db.base import Base
+from app.models import RankingList, Video
+from app.services.tagging import detect_language_from_title
+from benchmarks.compare import compare
+from benchmarks.suite import run_suite
+from benchmarks.synthetic import generate_catalog, iter_videos
+
+
+class SyntheticCatalogTests(unittest.TestCase):
+    def test_same_seed_same_catalog(self) -> None:
+        self.assertEqual(list(iter_videos(50, seed=7)), list(iter_videos(50, seed=7)))
+        self.assertNotEqual(list(iter_videos(50, seed=7)), list(iter_videos(50, seed=8)))
+
+    def test_titles_cover_every_language(self) -> None:
+        languages = {detect_language_from_title(video["title"]) for video in iter_videos(500, seed=1)}
+        self.assertEqual(languages, {"en", "ja", "ko", "zh"})
+
+
+class SuiteTests(unittest.TestCase):
+    def setUp(self) -> None:
+        handle, path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+        engine = create_engine(f"sqlite:///{path}", future=True)
+        self.addCleanup(engine.dispose)
+        Base.metadata.create_all(engine)
+        self.sessions = sessionmaker(bind=engine, future=True)
+
+    def test_runs_every_benchmark_on_a_small_catalog(self) -> None:
+        with self.sessions() as db:
+            counts = generate_catalog(db, videos=300, seed=3, weeks=2, ranking_size=20)
+            self.assertEqual(db.query(func.count(Video.youtube_id)).scalar(), 300)
+            self.assertEqual(db.query(func.count(RankingList.id)).scalar(), 2)
+        self.assertEqual(counts["videos"], 300)
+
+        results = run_suite(self.sessions, videos=300, seed=3, repeat=1, warmup=0)
+
+        for name in ("compute_tags_for_video", "build_ranking_payload", "record_tag_vote", "list_top_channels"):
+            self.assertIn(name, results)
+        self.assertIn("browse_videos[language_tag_duration]", results)
+        self.assertEqual(results["compute_tags_for_video"]["ops"], 300)
+        self.assertGreater(results["browse_videos[default]"]["median_ms"], 0)
+
+
+class CompareTests(unittest.TestCase):
+    def test_flags_regressions_past_the_threshold(self) -> None:
+        old = {
+            "meta": {"dialect": "sqlite", "catalog": {"videos": 10}},
+            "results": {"fast": {"median_ms": 10.0}, "slow": {"median_ms": 10.0}},
+        }
+        new = copy.deepcopy(old)
+        new["results"]["fast"]["median_ms"] = 10.5
+        new["results"]["slow"]["median_ms"] = 13.0
+
+        _, regressions = compare(old, new, threshold=10)
+
+        self.assertEqual(regressions, ["slow"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import gzip
+import unittest
+from datetime import datetime, timedelta
+
+import brotli
+
+from app.api import compression
+from app.api.compression import negotiate_encoding
+from app.models import RankingItem, RankingList, Video
+from tests.api_client import app, make_client, reset_client
+
+
+NOW = datetime(2026, 10, 19, 12, 0, 0)
+
+
+def compression_cache():
+    middleware = app.middleware_stack
+    while not isinstance(middleware, compression.CompressionMiddleware):
+        middleware = middleware.app
+    return middleware.cache
+
+
+def raw_body(response) -> bytes:
+    # The test client decodes gzip/br transparently; the tests want the
+    # bytes that went over the wire.
+    return response.raw.read(decode_content=False)
+
+
+class NegotiateEncodingTests(unittest.TestCase):
+    def test_prefers_brotli_then_gzip(self) -> None:
+        self.assertEqual(negotiate_encoding("gzip, deflate, br"), "br")
+        self.assertEqual(negotiate_encoding("gzip, deflate"), "gzip")
+        self.assertIsNone(negotiate_encoding("deflate"))
+        self.assertIsNone(negotiate_encoding(""))
+
+    def test_q_values_and_wildcard(self) -> None:
+        self.assertEqual(negotiate_encoding("br;q=0.5, gzip;q=0.8"), "gzip")
+        self.assertEqual(negotiate_encoding("br;q=0, *"), "gzip")
+        self.assertIsNone(negotiate_encoding("*;q=0"))
+
+    def test_gzip_only_without_brotli_package(self) -> None:
+        original = compression.brotli
+        compression.brotli = None
+        try:
+            self.assertEqual(negotiate_encoding("br, gzip"), "gzip")
+        finally:
+            compression.brotli = original
+
+
+class CompressionMiddlewareTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client, self.sessions = make_client()
+        self.addCleanup(reset_client)
+        db = self.sessions()
+        ranking = RankingList(name="ASMR Weekly Pulse 2026-10-19", created_at=NOW)
+        for n in range(40):
+            db.add(
+                Video(
+                    youtube_id=f"v{n}",
+                    title=f"ASMR whisper tapping {n}",
+                    description="soft spoken binaural " * 20,
+                    channel_title="Channel",
+                    channel_id="UC1",
+                    published_at=NOW - timedelta(days=1),
+                    view_count=1000 - n,
+                    computed_tags=["whisper"],
+                )
+            )
+            ranking.ranking_items.append(RankingItem(video_id=f"v{n}", position=n + 1, score=n))
+        db.add(ranking)
+        db.commit()
+        db.close()
+        self.client.get("/healthz")
+        compression_cache().clear()
+
+    def test_weekly_ranking_is_compressed_per_accept_encoding(self) -> None:
+        plain = self.client.get("/api/rankings/weekly", headers={"Accept-Encoding": "identity"})
+        self.assertNotIn("content-encoding", plain.headers)
+        self.assertEqual(plain.headers["vary"], "Accept-Encoding")
+
+        for encoding, decompress in (("br", brotli.decompress), ("gzip", gzip.decompress)):
+            response = self.client.get(
+                "/api/rankings/weekly", headers={"Accept-Encoding": encoding}, stream=True
+            )
+            self.assertEqual(response.headers["content-encoding"], encoding)
+            body = raw_body(response)
+            self.assertLess(len(body), len(plain.content))
+            self.assertEqual(decompress(body), plain.content)
+            self.assertEqual(response.headers["etag"], plain.headers["etag"][:-1] + f'-{encoding}"')
+
+    def test_snapshot_bodies_are_compressed_once_per_version(self) -> None:
+        cache = compression_cache()
+        for _ in range(3):
+            self.client.get("/api/rankings/weekly", headers={"Accept-Encoding": "br"})
+        self.assertEqual((cache.misses, cache.hits), (1, 2))
+
+        db = self.sessions()
+        db.query(Video).filter(Video.youtube_id == "v0").update({Video.title: "ASMR renamed"})
+        db.commit()
+        db.close()
+        self.client.get("/api/rankings/weekly", headers={"Accept-Encoding": "br"})
+        self.assertEqual((cache.misses, cache.hits), (2, 2))
+
+    def test_if_none_match_returns_not_modified(self) -> None:
+        first = self.client.get("/api/rankings/weekly", headers={"Accept-Encoding": "gzip"})
+
+        second = self.client.get(
+            "/api/rankings/weekly",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]},
+        )
+
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b"")
+        self.assertEqual(second.headers["etag"], first.headers["etag"])
+
+    def test_small_and_error_responses_pass_through(self) -> None:
+        health = self.client.get("/healthz", headers={"Accept-Encoding": "gzip"})
+        self.assertNotIn("content-encoding", health.headers)
+
+        missing = self.client.get("/api/rankings/weekly/999", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(missing.status_code, 404)
+        self.assertNotIn("content-encoding", missing.headers)
+
+    def test_dynamic_lists_are_compressed_without_caching(self) -> None:
+        response = self.client.get("/api/videos", headers={"Accept-Encoding": "gzip"})
+
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertNotIn("etag", response.headers)
+        self.assertEqual(len(compression_cache()), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+import os
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from scripts import fetch_rankings
+from scripts.fetch_rankings import TieredSelector
+
+
+NOW = datetime(2026, 3, 2, tzinfo=timezone.utc)
+RECENT = NOW - timedelta(days=7)
+
+
+def make_video(
+    video_id: str, views: int, *, age_days: float = 1, duration: int = 600, title: str = ""
+) -> dict:
+    return {
+        "youtube_id": video_id,
+        "title": title or f"ASMR {video_id}",
+        "view_count": views,
+        "published_at": NOW - timedelta(days=age_days),
+        "duration": duration,
+    }
+
+
+def make_detail(video_id: str, views: int, *, age_days: float = 1, title: str = "") -> dict:
+    return {
+        "id": video_id,
+        "snippet": {
+            "title": title or f"ASMR {video_id}",
+            "channelTitle": "Channel",
+            "channelId": "UC1",
+            "publishedAt": (NOW - timedelta(days=age_days)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        },
+        "statistics": {"viewCount": str(views)},
+        "contentDetails": {"duration": "PT10M"},
+    }
+
+
+class TieredSelectorTests(unittest.TestCase):
+    def test_strict_tier_is_ranked_by_views_and_capped(self) -> None:
+        selector = TieredSelector(top_n=2, target=2, recent_threshold=RECENT)
+        for video in [make_video("a", 10), make_video("b", 30), make_video("c", 20)]:
+            selector.add(video)
+
+        selected, counts = selector.select()
+
+        self.assertEqual([v["youtube_id"] for v in selected], ["b", "c"])
+        self.assertEqual(counts, {"strict_recent_long": 2})
+
+    def test_relaxed_tiers_only_fill_up_to_target(self) -> None:
+        selector = TieredSelector(top_n=5, target=3, recent_threshold=RECENT)
+        for video in [
+            make_video("long", 5),
+            make_video("short", 50, duration=90),
+            make_video("old", 90, age_days=10),
+            make_video("tiny", 99, duration=30),
+        ]:
+            selector.add(video)
+
+        selected, counts = selector.select()
+
+        self.assertEqual([v["youtube_id"] for v in selected], ["long", "short", "old"])
+        self.assertEqual(
+            counts,
+            {"strict_recent_long": 1, "recent_short_fill": 1, "fallback_long_fill": 1},
+        )
+
+    def test_scores_reorder_within_a_tier_from_the_wider_pool(self) -> None:
+        selector = TieredSelector(top_n=2, target=2, recent_threshold=RECENT, pool_size=4)
+        for video in [make_video("a", 40), make_video("b", 30), make_video("c", 20)]:
+            selector.add(video)
+        scores = {
+            "a": fetch_rankings.ScoredVideo(10, {}),
+            "b": fetch_rankings.ScoredVideo(50, {}),
+            "c": fetch_rankings.ScoredVideo(90, {}),
+        }
+
+        selected, _ = selector.select(scores)
+
+        self.assertEqual([v["youtube_id"] for v in selected], ["c", "b"])
+
+
+class BuildBoardsTests(unittest.TestCase):
+    def test_sub_boards_are_cut_from_the_scored_pool(self) -> None:
+        selector = TieredSelector(top_n=2, target=2, recent_threshold=RECENT, pool_size=10)
+        for video in [
+            make_video("w1", 10, title="ASMR whisper tapping"),
+            make_video("w2", 30, title="ASMR whispering"),
+            make_video("t1", 50, title="ASMR tapping"),
+            make_video("ja", 20, title="ASMR 耳かき ささやき"),
+        ]:
+            selector.add(video)
+        scores = {
+            video_id: fetch_rankings.ScoredVideo(score, {})
+            for video_id, score in {"w1": 90, "w2": 40, "t1": 10, "ja": 20}.items()
+        }
+
+        boards = fetch_rankings.build_boards(selector, scores, board_size=5, min_items=2)
+
+        self.assertEqual([v["youtube_id"] for v in boards["whisper"]], ["w1", "w2"])
+        self.assertEqual([v["youtube_id"] for v in boards["tapping"]], ["w1", "t1"])
+        self.assertEqual([v["youtube_id"] for v in boards["en"]], ["w1", "w2", "t1"])
+        # A single Japanese upload is below min_items.
+        self.assertNotIn("ja", boards)
+
+
+class BuildRankingTests(unittest.TestCase):
+    def build(self, search_results, details, *, top_n, **options):
+        """Run build_ranking on fake searches; returns (payload, searched queries, videos.list batches)."""
+        searched = []
+        fetched = []
+
+        def fake_search(api_key, query, max_results, published_after):
+            searched.append(query)
+            return search_results[query]
+
+        def fake_videos_list(api_key, video_ids, parts):
+            fetched.append(list(video_ids))
+            return [details[video_id] for video_id in video_ids]
+
+        with mock.patch.object(fetch_rankings, "fetch_search_ids", fake_search), mock.patch(
+            "scripts.youtube_client.fetch_video_details_batch", fake_videos_list
+        ), mock.patch.dict(os.environ, {"INGESTION_NOW": NOW.isoformat()}):
+            payload = fetch_rankings.build_ranking(
+                "key", list(search_results), 50, top_n, RECENT, **options
+            )
+        return payload, searched, fetched
+
+    def test_fast_riser_after_the_first_top_n_can_make_the_board(self) -> None:
+        slow = {f"s{n}": make_detail(f"s{n}", 1000 - n, age_days=6) for n in range(50)}
+        fast = {"fast": make_detail("fast", 600, age_days=0.1)}
+
+        payload, searched, fetched = self.build(
+            {"q1": list(slow), "q2": list(fast)}, {**slow, **fast}, top_n=20
+        )
+
+        # 50 strict candidates are more than --top but less than the 5x pool,
+        # so the second query is still searched and its upload scored.
+        self.assertEqual(searched, ["q1", "q2"])
+        self.assertEqual(len(fetched), 2)
+        self.assertEqual(payload.items[0]["youtube_id"], "fast")
+        self.assertEqual(len(payload.items), 20)
+
+    def test_sub_boards_fill_from_the_whole_pool(self) -> None:
+        tapping = {
+            f"t{n}": make_detail(f"t{n}", 5000 - n, title=f"ASMR tapping t{n}") for n in range(60)
+        }
+        whisper = {
+            f"w{n}": make_detail(f"w{n}", 3000 - n, title=f"ASMR whisper w{n}") for n in range(40)
+        }
+
+        payload, searched, _ = self.build(
+            {"tapping": list(tapping), "whisper": list(whisper)},
+            {**tapping, **whisper},
+            top_n=10,
+            board_size=20,
+            board_min_items=10,
+            with_boards=False,
+        )
+        self.assertEqual(searched, ["tapping"])
+
+        payload, searched, _ = self.build(
+            {"tapping": list(tapping), "whisper": list(whisper)},
+            {**tapping, **whisper},
+            top_n=10,
+            board_size=20,
+            board_min_items=10,
+        )
+
+        # The pool is sized for a 20-video board, so the second query is
+        # still fetched after --top 10 tapping videos fill the main board.
+        self.assertEqual(searched, ["tapping", "whisper"])
+        self.assertEqual(len(payload.boards["whisper"]), 20)
+        self.assertEqual(len(payload.boards["tapping"]), 20)
+        self.assertTrue(all(v["youtube_id"].startswith("w") for v in payload.boards["whisper"]))
+
+    def test_detail_fetching_stops_once_strict_pool_is_full(self) -> None:
+        search_results = {
+            "q1": [f"a{n}" for n in range(50)],
+            "q2": [f"b{n}" for n in range(50)],
+        }
+        details = {
+            video_id: make_detail(video_id, 100 - n)
+            for ids in search_results.values()
+            for n, video_id in enumerate(ids)
+        }
+
+        # --top 10 without boards gives a pool of 50, which the first batch fills.
+        payload, searched, fetched = self.build(search_results, details, top_n=10, with_boards=False)
+
+        self.assertEqual(len(payload.items), 10)
+        # Same age and likes, so velocity (views) still decides the order.
+        self.assertEqual(payload.items[0]["youtube_id"], "a0")
+        self.assertEqual(set(payload.scores), {f"a{n}" for n in range(50)})
+        self.assertEqual(len(fetched), 1)
+        self.assertEqual(searched, ["q1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+
+from app.db.base import Base
+from app.models import CacheVersion
+from app.services.invalidation import InvalidationBus, bump_versions
+from app.services.result_cache import LRUBackend, ResultCache
+
+
+class Counter:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return ["page"]
+
+
+class InvalidationBusTests(unittest.TestCase):
+    def setUp(self) -> None:
+        # A file, so each "worker" can have an engine of its own on it.
+        handle, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+        self.url = f"sqlite:///{self.path}"
+        Base.metadata.create_all(self.engine(), tables=[CacheVersion.__table__])
+
+    def engine(self):
+        engine = create_engine(self.url, future=True)
+        self.addCleanup(engine.dispose)
+        return engine
+
+    def worker(self, **kwargs):
+        bus = InvalidationBus(self.engine(), **kwargs)
+        self.addCleanup(bus.stop)
+        bus.poll()
+        return ResultCache(LRUBackend(), bus=bus), bus
+
+    def test_bump_versions_increments_and_advances_seq(self) -> None:
+        engine = self.engine()
+        with engine.begin() as connection:
+            self.assertEqual(bump_versions(connection, ["tag:a", "catalog"]), {"catalog": 1, "tag:a": 1})
+        with engine.begin() as connection:
+            self.assertEqual(bump_versions(connection, ["tag:a", "tag:a"]), {"tag:a": 2})
+            rows = connection.execute(
+                CacheVersion.__table__.select().order_by(CacheVersion.seq)
+            ).all()
+        self.assertEqual([(row.tag, row.version, row.seq) for row in rows], [("catalog", 1, 1), ("tag:a", 2, 3)])
+
+    def test_invalidation_reaches_other_workers_on_poll(self) -> None:
+        api_a, _ = self.worker()
+        api_b, bus_b = self.worker()
+        compute = Counter()
+        for cache in (api_a, api_b):
+            cache.fetch("browse", {}, ["tag:whisper"], compute)
+        self.assertEqual(compute.calls, 2)
+
+        api_a.invalidate_video_tags("v1", ["whisper"])
+        # Worker A applied its own bump synchronously; B has not polled yet.
+        api_a.fetch("browse", {}, ["tag:whisper"], compute)
+        api_b.fetch("browse", {}, ["tag:whisper"], compute)
+        self.assertEqual(compute.calls, 3)
+
+        self.assertEqual(bus_b.poll(), {"feedback": 1, "tag:whisper": 1, "video:v1": 1})
+        api_b.fetch("browse", {}, ["tag:whisper"], compute)
+        self.assertEqual(compute.calls, 4)
+
+        # Versions a worker has already seen are not delivered again.
+        self.assertEqual(bus_b.poll(), {})
+        api_b.fetch("browse", {}, ["tag:whisper"], compute)
+        self.assertEqual(compute.calls, 4)
+
+    def test_listener_thread_converges_without_explicit_polls(self) -> None:
+        api_a, _ = self.worker()
+        api_b, bus_b = self.worker(poll_interval=0.01)
+        bus_b.start()
+        compute = Counter()
+        api_b.fetch("browse", {}, ["channel:*"], compute)
+
+        api_a.invalidate_channels(["UC1"])
+
+        deadline = time.monotonic() + 5
+        while compute.calls == 1 and time.monotonic() < deadline:
+            api_b.fetch("browse", {}, ["channel:*"], compute)
+            time.sleep(0.01)
+        self.assertEqual(compute.calls, 2)
+
+    def test_publish_failure_still_invalidates_locally(self) -> None:
+        cache, bus = self.worker()
+        compute = Counter()
+        cache.fetch("browse", {}, ["catalog"], compute)
+
+        error = OperationalError("UPDATE", {}, Exception("database is locked"))
+        with mock.patch.object(bus, "publish", side_effect=error):
+            cache.invalidate_catalog()
+        cache.fetch("browse", {}, ["catalog"], compute)
+
+        self.assertEqual(compute.calls, 2)
+        # A later shared bump of the same tag still invalidates.
+        bus.publish(["catalog"])
+        cache.fetch("browse", {}, ["catalog"], compute)
+        self.assertEqual(compute.calls, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
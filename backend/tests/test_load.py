@@ -0,0 +1,72 @@
+import unittest
+from datetime import datetime, timedelta
+
+from tests.api_client import make_client, reset_client
+from app.models import RankingItem, RankingList, Video
+from benchmarks.load import check_budgets, parse_mix, run_load
+
+
+NOW = datetime(2026, 10, 19, 12, 0, 0)
+
+
+class LoadHarnessTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client, self.sessions = make_client()
+        self.addCleanup(reset_client)
+        db = self.sessions()
+        ranking = RankingList(name="ASMR Weekly Pulse 2026-10-19", created_at=NOW)
+        db.add(ranking)
+        db.flush()
+        for n in range(10):
+            db.add(
+                Video(
+                    youtube_id=f"v{n}",
+                    title=f"ASMR whisper tapping {n}",
+                    channel_title=f"Channel {n % 3}",
+                    channel_id=f"UC{n % 3}",
+                    published_at=NOW - timedelta(hours=n),
+                    duration=60 * (n + 2),
+                )
+            )
+            db.add(RankingItem(ranking_list_id=ranking.id, video_id=f"v{n}", position=n + 1, score=100 - n))
+        db.commit()
+
+    def test_reports_every_scenario_in_the_mix(self) -> None:
+        mix = parse_mix("weekly=1,browse=1,browse_deep=1,browse_filtered=1,vote=1,channels=1")
+
+        report = run_load(lambda: self.client, "http://testserver", mix, concurrency=2, max_requests=60, seed=1)
+
+        self.assertEqual(report["total"]["requests"], 60)
+        self.assertEqual(report["total"]["errors"], 0)
+        self.assertEqual(set(report["scenarios"]), set(mix))
+        weekly = report["scenarios"]["weekly"]
+        self.assertLessEqual(weekly["p50_ms"], weekly["p95_ms"])
+        self.assertLessEqual(weekly["p95_ms"], weekly["p99_ms"])
+        self.assertEqual(weekly["statuses"], {"200": weekly["requests"]})
+
+    def test_unknown_scenario(self) -> None:
+        with self.assertRaises(ValueError):
+            parse_mix("weekly=1,search=2")
+
+
+class BudgetTests(unittest.TestCase):
+    def test_per_scenario_overrides_and_lower_bounds(self) -> None:
+        report = {
+            "scenarios": {
+                "weekly": {"p95_ms": 120.0, "error_rate": 0.0, "throughput_rps": 40.0},
+                "vote": {"p95_ms": 300.0, "error_rate": 0.02, "throughput_rps": 5.0},
+            }
+        }
+        budgets = {
+            "default": {"p95_ms": 200, "error_rate": 0.01},
+            "scenarios": {"vote": {"p95_ms": 400}, "weekly": {"throughput_rps": 50}},
+        }
+
+        self.assertEqual(
+            check_budgets(report, budgets),
+            ["weekly: throughput_rps 40.0 < 50", "vote: error_rate 0.02 > 0.01"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
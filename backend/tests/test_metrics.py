@@ -0,0 +1,120 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from prometheus_client import REGISTRY
+
+from tests.api_client import make_client, reset_client
+from app.core.metrics import ingestion_registry, track_job
+from app.models import Video
+from app.services.result_cache import LRUBackend, ResultCache
+
+
+NOW = datetime(2026, 10, 19, 12, 0, 0)
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def sample(name: str, registry=REGISTRY, **labels) -> float:
+    return registry.get_sample_value(name, labels) or 0.0
+
+
+class MetricsEndpointTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client, self.sessions = make_client(ResultCache(LRUBackend()))
+        self.addCleanup(reset_client)
+        db = self.sessions()
+        db.add(
+            Video(
+                youtube_id="v1",
+                title="ASMR whisper",
+                channel_title="Channel",
+                channel_id="UC1",
+                published_at=NOW,
+            )
+        )
+        db.commit()
+
+    def test_requests_are_labelled_by_route_template(self) -> None:
+        route = "/api/videos/{video_id}"
+        labels = {"method": "GET", "route": route}
+        before = sample("tingleradar_http_request_duration_seconds_count", **labels)
+        before_404 = sample("tingleradar_http_requests_total", status="404", **labels)
+
+        self.assertEqual(self.client.get("/api/videos/v1").status_code, 200)
+        self.assertEqual(self.client.get("/api/videos/missing").status_code, 404)
+
+        self.assertEqual(sample("tingleradar_http_request_duration_seconds_count", **labels), before + 2)
+        self.assertEqual(sample("tingleradar_http_requests_total", status="404", **labels), before_404 + 1)
+        self.assertGreater(sample("tingleradar_http_request_db_queries_sum", **labels), 0)
+        self.assertGreater(sample("tingleradar_http_response_size_bytes_sum", **labels), 0)
+
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("text/plain", response.headers["content-type"])
+        self.assertIn(f'route="{route}"', response.text)
+        self.assertNotIn('route="/api/videos/v1"', response.text)
+
+    def test_result_cache_hits_and_misses(self) -> None:
+        hits = sample("tingleradar_cache_lookups_total", cache="browse", result="hit")
+        misses = sample("tingleradar_cache_lookups_total", cache="browse", result="miss")
+
+        self.client.get("/api/videos")
+        self.client.get("/api/videos")
+
+        self.assertEqual(sample("tingleradar_cache_lookups_total", cache="browse", result="miss"), misses + 1)
+        self.assertEqual(sample("tingleradar_cache_lookups_total", cache="browse", result="hit"), hits + 1)
+
+
+class TrackJobTests(unittest.TestCase):
+    def test_counts_runs_by_outcome(self) -> None:
+        def runs(outcome: str) -> float:
+            return sample("tingleradar_ingestion_runs_total", ingestion_registry, job="test_job", outcome=outcome)
+
+        with track_job("test_job"):
+            pass
+        with self.assertRaises(RuntimeError):
+            with track_job("test_job"):
+                raise RuntimeError("quota exceeded")
+
+        self.assertEqual(runs("success"), 1)
+        self.assertEqual(runs("failure"), 1)
+        self.assertIsNotNone(
+            sample("tingleradar_ingestion_last_success_timestamp_seconds", ingestion_registry, job="test_job")
+        )
+
+
+class MultiprocessTests(unittest.TestCase):
+    def run_python(self, multiproc_dir: str, code: str) -> str:
+        env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=multiproc_dir, PYTHONPATH=str(BACKEND_DIR))
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            env=env,
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return result.stdout
+
+    def test_scrape_aggregates_all_workers(self) -> None:
+        with tempfile.TemporaryDirectory() as multiproc_dir:
+            for _ in range(2):
+                self.run_python(
+                    multiproc_dir,
+                    "from app.core.metrics import cache_lookup_counters\n"
+                    "cache_lookup_counters('browse')[0].inc(3)\n",
+                )
+            output = self.run_python(
+                multiproc_dir,
+                "from app.core.metrics import render_metrics\n"
+                "print(render_metrics()[0].decode())\n",
+            )
+        self.assertIn('tingleradar_cache_lookups_total{cache="browse",result="hit"} 6.0', output)
+
+
+if __name__ == "__main__":
+    unittest.main()
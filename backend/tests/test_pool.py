@@ -0,0 +1,105 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from sqlalchemy import create_engine, exc
+from sqlalchemy.pool import QueuePool
+
+from tests.api_client import ADMIN_HEADERS, make_client, reset_client
+from app.core.config import Settings
+from app.db.pool import PoolMonitor, monitored_pool_class, pool_monitors, pool_options
+
+
+class MonitoredPoolTests(unittest.TestCase):
+    def make_engine(self, monitor: PoolMonitor, *, timeout: float):
+        handle, path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+        engine = create_engine(
+            f"sqlite:///{path}",
+            future=True,
+            poolclass=monitored_pool_class(QueuePool, monitor),
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=timeout,
+            connect_args={"check_same_thread": False},
+        )
+        self.addCleanup(engine.dispose)
+        return engine
+
+    def test_checkouts_and_timeouts_are_recorded(self) -> None:
+        monitor = PoolMonitor("test")
+        engine = self.make_engine(monitor, timeout=0.05)
+        held = engine.connect()
+        self.addCleanup(held.close)
+
+        with self.assertRaises(exc.TimeoutError):
+            engine.connect()
+
+        stats = monitor.stats()
+        self.assertEqual((stats["checked_out"], stats["checkouts"], stats["timeouts"]), (1, 1, 1))
+        self.assertEqual(sum(stats["checkout_seconds_histogram"].values()), 1)
+        self.assertEqual(stats["waiting"], 0)
+
+    def test_saturated_pool_refuses_new_waiters_immediately(self) -> None:
+        monitor = PoolMonitor("test", max_waiters=1)
+        engine = self.make_engine(monitor, timeout=5)
+        held = engine.connect()
+        waiter_got = []
+        waiter = threading.Thread(target=lambda: waiter_got.append(engine.connect().close()))
+        waiter.start()
+        deadline = time.monotonic() + 5
+        while monitor.waiting < 1 and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+        started = time.monotonic()
+        with self.assertRaises(exc.TimeoutError):
+            engine.connect()
+        self.assertLess(time.monotonic() - started, 1)
+
+        held.close()
+        waiter.join(5)
+        self.assertEqual(len(waiter_got), 1)
+        stats = monitor.stats()
+        self.assertEqual((stats["rejected"], stats["max_waiting"], stats["checkouts"]), (1, 1, 2))
+
+    def test_pool_options_follow_settings(self) -> None:
+        settings = Settings(db_pool_size=3, db_max_overflow=2, db_pool_timeout_seconds=1.5)
+        self.addCleanup(pool_monitors.pop, "test", None)
+
+        self.assertEqual(pool_options("sqlite:///x.db", settings, name="test"), {})
+        options = pool_options("postgresql+pg8000://u:p@localhost/db", settings, name="test")
+        engine = create_engine("postgresql+pg8000://u:p@localhost/db", future=True, **options)
+
+        self.assertIs(engine.pool.monitor, pool_monitors["test"])
+        self.assertEqual((engine.pool.size(), engine.pool._max_overflow, engine.pool._timeout), (3, 2, 1.5))
+
+
+class PoolApiTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client, _ = make_client()
+        self.addCleanup(reset_client)
+
+    def test_pool_timeouts_become_503(self) -> None:
+        busy = exc.TimeoutError("QueuePool limit of size 5 overflow 5 reached")
+        with mock.patch("app.api.endpoints.channels.list_top_channels_async", side_effect=busy):
+            response = self.client.get("/api/channels/popular")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["retry-after"], "1")
+
+    def test_admin_endpoint_lists_monitored_pools(self) -> None:
+        pool_monitors["test"] = PoolMonitor("test")
+        self.addCleanup(pool_monitors.pop, "test", None)
+
+        stats = self.client.get("/api/admin/pools", headers=ADMIN_HEADERS).json()
+
+        self.assertEqual(stats["test"]["checkouts"], 0)
+        self.assertEqual(stats["test"]["checkout_seconds_histogram"]["+Inf"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import glob
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.profiling import ProfilingMiddleware, profile_token, valid_token
+
+
+SECRET = "test-secret"
+
+
+def burn_cpu(seconds: float) -> int:
+    deadline = time.perf_counter() + seconds
+    n = 0
+    while time.perf_counter() < deadline:
+        n += 1
+    return n
+
+
+def make_app(directory: str, **options) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/api/videos/{video_id}")
+    async def video(video_id: str) -> dict:
+        return {"id": video_id, "spins": burn_cpu(0.1)}
+
+    app.add_middleware(ProfilingMiddleware, directory=directory, interval_ms=1, **options)
+    return TestClient(app)
+
+
+def wait_for_profiles(directory: str, count: int = 1) -> list:
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        paths = sorted(glob.glob(os.path.join(directory, "*.json")))
+        if len(paths) >= count:
+            return paths
+        time.sleep(0.01)
+    return sorted(glob.glob(os.path.join(directory, "*.json")))
+
+
+class TokenTests(unittest.TestCase):
+    def test_signed_tokens_expire(self) -> None:
+        token = profile_token(SECRET, 2_000)
+        self.assertTrue(valid_token(SECRET, token, now=1_000))
+        self.assertFalse(valid_token(SECRET, token, now=3_000))
+        self.assertFalse(valid_token("other-secret", token, now=1_000))
+        self.assertFalse(valid_token(SECRET, "2000.deadbeef", now=1_000))
+        self.assertFalse(valid_token(SECRET, "garbage", now=1_000))
+
+
+class ProfilingMiddlewareTests(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_signed_request_writes_collapsed_stacks(self) -> None:
+        client = make_app(self.directory, secret=SECRET)
+        token = profile_token(SECRET, int(time.time()) + 60)
+
+        response = client.get("/api/videos/v1", headers={"X-Profile": token})
+        self.assertEqual(response.status_code, 200)
+
+        [meta_path] = wait_for_profiles(self.directory)
+        with open(meta_path, encoding="utf-8") as meta:
+            metadata = json.load(meta)
+        self.assertEqual(metadata["route"], "/api/videos/{video_id}")
+        self.assertEqual(metadata["status"], 200)
+        self.assertGreaterEqual(metadata["duration_ms"], 100)
+        self.assertGreater(metadata["samples"], 0)
+        self.assertIn("_GET_api-videos-video_id_", os.path.basename(meta_path))
+
+        with open(meta_path[: -len(".json")] + ".folded", encoding="utf-8") as folded:
+            lines = folded.read().splitlines()
+        self.assertTrue(lines)
+        self.assertTrue(all(line.rsplit(" ", 1)[1].isdigit() for line in lines))
+        self.assertTrue(any("burn_cpu (test_profiling.py:" in line for line in lines))
+
+    def test_unsigned_or_forged_requests_are_not_profiled(self) -> None:
+        client = make_app(self.directory, secret=SECRET)
+
+        client.get("/api/videos/v1")
+        client.get("/api/videos/v1", headers={"X-Profile": profile_token("guess", int(time.time()) + 60)})
+        client.get("/api/videos/v1", headers={"X-Profile": profile_token(SECRET, int(time.time()) - 1)})
+
+        time.sleep(0.1)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_sample_rate_profiles_without_a_header(self) -> None:
+        client = make_app(self.directory, sample_rate=1.0)
+
+        client.get("/api/videos/v1")
+        client.get("/api/videos/v2")
+
+        self.assertEqual(len(wait_for_profiles(self.directory, 2)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
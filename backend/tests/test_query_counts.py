@@ -0,0 +1,80 @@
+import unittest
+from datetime import datetime, timedelta
+from itertools import count
+
+from tests.api_client import make_client, reset_client
+from app.models import RankingItem, RankingList, UserTag, Video, VideoTagVote
+from app.services.result_cache import LRUBackend, ResultCache
+from tests.query_counts import assert_queries_do_not_scale, query_count
+
+
+NOW = datetime(2026, 10, 19, 12, 0, 0)
+
+
+class QueryCountTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = ResultCache(LRUBackend())
+        self.client, self.sessions = make_client(self.cache)
+        self.addCleanup(reset_client)
+        self.ids = count()
+
+    def add_videos(self, n: int, ranking: RankingList = None) -> None:
+        db = self.sessions()
+        for _ in range(n):
+            number = next(self.ids)
+            video_id = f"v{number}"
+            db.add(
+                Video(
+                    youtube_id=video_id,
+                    title=f"ASMR tapping {number}",
+                    channel_title="Channel",
+                    channel_id="UC1",
+                    published_at=NOW - timedelta(minutes=number),
+                    computed_tags=["tapping"],
+                )
+            )
+            db.add(VideoTagVote(video_id=video_id, tag="whisper", user_fingerprint="fp", vote=1))
+            db.add(UserTag(video_id=video_id, tag="crinkles", source="user"))
+            if ranking is not None:
+                db.add(RankingItem(ranking_list_id=ranking.id, video_id=video_id, position=number + 1, score=1))
+        db.commit()
+        db.close()
+        self.cache.invalidate_catalog()
+
+    def test_browse_queries_do_not_grow_with_the_page(self) -> None:
+        counts = assert_queries_do_not_scale(
+            self,
+            grow=self.add_videos,
+            request=lambda: self.client.get("/api/videos", params={"page_size": 100}),
+        )
+        self.assertGreater(counts[1], 0)
+
+    def test_weekly_board_queries_do_not_grow_with_the_board(self) -> None:
+        db = self.sessions()
+        ranking = RankingList(name="ASMR Weekly Pulse 2026-10-19", board="main", description="", created_at=NOW)
+        db.add(ranking)
+        db.commit()
+        db.refresh(ranking)
+        db.close()
+
+        assert_queries_do_not_scale(
+            self,
+            grow=lambda n: self.add_videos(n, ranking),
+            request=lambda: self.client.get("/api/rankings/weekly"),
+        )
+
+    def test_requests_report_server_timing_and_log_their_cost(self) -> None:
+        self.add_videos(2)
+
+        with self.assertLogs("app.requests", level="INFO") as logs:
+            response = self.client.get("/api/videos/v1")
+
+        self.assertRegex(response.headers["server-timing"], r'^db;dur=[\d.]+;desc="\d+ queries", app;dur=[\d.]+$')
+        record = logs.records[0]
+        self.assertEqual((record.method, record.route, record.status), ("GET", "/api/videos/{video_id}", 200))
+        self.assertEqual(record.db_queries, query_count(response))
+        self.assertGreater(record.db_queries, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
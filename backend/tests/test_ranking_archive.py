@@ -0,0 +1,124 @@
+import unittest
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.models import RankingArchive, RankingItem, RankingList, Video
+from app.services.rank_history import fetch_ranking_history, fetch_video_rank_history
+from app.services.ranking_archive import (
+    StoredItem,
+    archive_old_weeks,
+    decode_items,
+    encode_items,
+    restore_archives,
+)
+from app.services.rankings import fetch_ranking_by_id
+
+
+NOW = datetime(2026, 10, 19, 12, 0)
+FIRST_WEEK = date(2026, 8, 3)
+
+
+class RankingArchiveTests(unittest.TestCase):
+    def setUp(self) -> None:
+        engine = create_engine("sqlite://", future=True)
+        Base.metadata.create_all(engine)
+        self.db = sessionmaker(bind=engine)()
+        self.addCleanup(self.db.close)
+        for video_id in ["a", "b", "c"]:
+            self.db.add(
+                Video(
+                    youtube_id=video_id,
+                    title=f"ASMR {video_id}",
+                    channel_title="Channel",
+                    channel_id="UC1",
+                    published_at=NOW,
+                    computed_tags=[],
+                )
+            )
+        # Eleven weekly boards; "a" climbs from 3rd to 1st.
+        self.lists = []
+        for week in range(11):
+            order = ["b", "c", "a"] if week < 5 else ["a", "b", "c"]
+            self.lists.append(self.add_week(FIRST_WEEK + timedelta(weeks=week), order))
+
+    def add_week(self, label: date, order) -> RankingList:
+        ranking = RankingList(
+            name=f"ASMR Weekly Pulse {label.isoformat()}",
+            label_date=label,
+            created_at=NOW,
+        )
+        ranking.ranking_items = [
+            RankingItem(
+                video_id=video_id,
+                position=position,
+                score=100 - position,
+                score_components={"velocity": 100 - position},
+            )
+            for position, video_id in enumerate(order, start=1)
+        ]
+        self.db.add(ranking)
+        self.db.commit()
+        return ranking
+
+    def test_codec_round_trips_items(self) -> None:
+        items = [
+            StoredItem("b", 2, 5, None),
+            StoredItem("a", 1, 9, {"velocity": 6000, "like_ratio": 3000}),
+        ]
+
+        self.assertEqual(decode_items(encode_items(items)), sorted(items, key=lambda i: i.position))
+
+    def test_old_weeks_are_compacted_and_hot_rows_deleted(self) -> None:
+        result = archive_old_weeks(self.db, now=NOW, keep_weeks=4)
+
+        # Labels up to 2026-09-14 are more than four weeks before NOW.
+        self.assertEqual(result.lists, 7)
+        self.assertEqual(result.items, 21)
+        self.assertEqual(self.db.query(RankingArchive).count(), 7)
+        self.assertEqual(self.db.query(RankingItem).count(), 12)
+        self.assertEqual(archive_old_weeks(self.db, now=NOW, keep_weeks=4).lists, 0)
+
+    def test_newest_week_is_never_archived(self) -> None:
+        archive_old_weeks(self.db, now=NOW + timedelta(weeks=52), keep_weeks=1)
+
+        latest_id = self.lists[-1].id
+        self.assertEqual(
+            self.db.query(RankingItem).filter(RankingItem.ranking_list_id == latest_id).count(), 3
+        )
+
+    def test_item_less_newer_list_does_not_count_as_the_newest_week(self) -> None:
+        self.add_week(FIRST_WEEK + timedelta(weeks=11), [])
+
+        archive_old_weeks(self.db, now=NOW + timedelta(weeks=52), keep_weeks=1)
+
+        latest_id = self.lists[-1].id
+        self.assertEqual(
+            self.db.query(RankingItem).filter(RankingItem.ranking_list_id == latest_id).count(), 3
+        )
+
+    def test_history_reads_archived_weeks_transparently(self) -> None:
+        before_board = fetch_ranking_history(self.db, board="main", weeks=11, limit=3)
+        before_video = fetch_video_rank_history(self.db, "a", board="main", weeks=11)
+        before_list = fetch_ranking_by_id(self.db, self.lists[0].id)
+
+        archive_old_weeks(self.db, now=NOW, keep_weeks=4)
+
+        self.assertEqual(fetch_ranking_history(self.db, board="main", weeks=11, limit=3), before_board)
+        self.assertEqual(fetch_video_rank_history(self.db, "a", board="main", weeks=11), before_video)
+        self.assertEqual(fetch_ranking_by_id(self.db, self.lists[0].id), before_list)
+        self.assertEqual(before_video.ranks, [3, 0, 0, 0, 0, -2, 0, 0, 0, 0, 0])
+
+    def test_restore_unpacks_archives(self) -> None:
+        archive_old_weeks(self.db, now=NOW, keep_weeks=4)
+
+        self.assertEqual(restore_archives(self.db), 7)
+
+        self.assertEqual(self.db.query(RankingArchive).count(), 0)
+        self.assertEqual(self.db.query(RankingItem).count(), 33)
+
+
+if __name__ == "__main__":
+    unittest.main()
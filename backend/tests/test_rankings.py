@@ -0,0 +1,158 @@
+import unittest
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.models import RankingItem, RankingList, Video
+from app.services.rank_history import (
+    delta_decode,
+    delta_encode,
+    fetch_ranking_history,
+    fetch_video_rank_history,
+)
+from app.services.rankings import fetch_weekly_rankings
+
+
+NOW = datetime(2026, 10, 19, 12, 0)
+
+
+class WeeklyBoardTests(unittest.TestCase):
+    def setUp(self) -> None:
+        engine = create_engine("sqlite://", future=True)
+        Base.metadata.create_all(engine)
+        self.db = sessionmaker(bind=engine)()
+        self.addCleanup(self.db.close)
+        self.db.add(
+            Video(
+                youtube_id="v1",
+                title="ASMR whisper",
+                channel_title="Channel",
+                channel_id="UC1",
+                published_at=NOW,
+                view_count=100,
+                like_count=1,
+                computed_tags=["whisper"],
+            )
+        )
+
+    def add_list(self, name: str, board: str, created_at: datetime) -> RankingList:
+        ranking = RankingList(name=name, board=board, description="", created_at=created_at)
+        ranking.ranking_items = [RankingItem(video_id="v1", position=1, score=1)]
+        self.db.add(ranking)
+        self.db.commit()
+        return ranking
+
+    def test_sub_board_comes_from_the_latest_main_snapshot(self) -> None:
+        self.add_list("ASMR Weekly Pulse 2026-10-12", "main", NOW - timedelta(days=7))
+        old_whisper = self.add_list("ASMR Weekly Pulse 2026-10-12", "whisper", NOW - timedelta(days=7))
+        main = self.add_list("ASMR Weekly Pulse 2026-10-19", "main", NOW)
+        whisper = self.add_list("ASMR Weekly Pulse 2026-10-19", "whisper", NOW)
+
+        self.assertEqual(fetch_weekly_rankings(self.db)[0]["id"], main.id)
+        [board] = fetch_weekly_rankings(self.db, board="whisper")
+        self.assertEqual((board["id"], board["board"]), (whisper.id, "whisper"))
+        self.assertNotEqual(board["id"], old_whisper.id)
+
+    def test_sub_board_missing_this_week_is_not_served_stale(self) -> None:
+        self.add_list("ASMR Weekly Pulse 2026-10-12", "main", NOW - timedelta(days=7))
+        self.add_list("ASMR Weekly Pulse 2026-10-12", "ja", NOW - timedelta(days=7))
+        self.add_list("ASMR Weekly Pulse 2026-10-19", "main", NOW)
+
+        self.assertEqual(fetch_weekly_rankings(self.db, board="ja"), [])
+
+
+class RankHistoryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        engine = create_engine("sqlite://", future=True)
+        Base.metadata.create_all(engine)
+        self.db = sessionmaker(bind=engine)()
+        self.addCleanup(self.db.close)
+
+    def add_week(self, label: date, video_ids, board: str = "main") -> RankingList:
+        for video_id in video_ids:
+            if not self.db.get(Video, video_id):
+                self.db.add(
+                    Video(
+                        youtube_id=video_id,
+                        title=video_id,
+                        channel_title="Channel",
+                        channel_id="UC1",
+                        published_at=NOW,
+                    )
+                )
+        ranking = RankingList(
+            name=f"ASMR Weekly Pulse {label.isoformat()}",
+            board=board,
+            label_date=label,
+            created_at=NOW,
+        )
+        ranking.ranking_items = [
+            RankingItem(video_id=video_id, position=position, score=0)
+            for position, video_id in enumerate(video_ids, start=1)
+        ]
+        self.db.add(ranking)
+        self.db.commit()
+        return ranking
+
+    def test_delta_encoding_round_trips_through_gaps(self) -> None:
+        ranks = [5, 3, None, None, 8, 1]
+
+        encoded = delta_encode(ranks)
+
+        self.assertEqual(encoded, [5, -2, None, None, 5, -7])
+        self.assertEqual(delta_decode(encoded), ranks)
+
+    def test_board_history_tracks_latest_videos_across_weeks(self) -> None:
+        first = date(2026, 10, 5)
+        self.add_week(first, ["a", "b", "c"])
+        self.add_week(first + timedelta(days=7), ["b", "a"])
+        self.add_week(first + timedelta(days=14), ["c", "a", "d"])
+        self.add_week(first + timedelta(days=14), ["c"], board="whisper")
+
+        history = fetch_ranking_history(self.db, board="main", weeks=3, limit=2)
+
+        self.assertEqual(history.start, "2026-10-05")
+        self.assertEqual(history.week_gaps, [7, 7])
+        self.assertEqual(
+            {track.video_id: delta_decode(track.ranks) for track in history.videos},
+            {"c": [3, None, 1], "a": [1, 2, 2]},
+        )
+        self.assertEqual([track.video_id for track in history.videos], ["c", "a"])
+
+    def test_board_history_is_one_query_and_skips_item_less_lists(self) -> None:
+        first = date(2026, 10, 5)
+        self.add_week(first, ["a", "b"])
+        self.add_week(first + timedelta(days=7), ["b", "a"])
+        # An aborted write: the newest label, but no items.
+        self.add_week(first + timedelta(days=14), [])
+        statements = []
+        engine = self.db.get_bind()
+
+        def listener(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", listener)
+        self.addCleanup(event.remove, engine, "before_cursor_execute", listener)
+
+        history = fetch_ranking_history(self.db, board="main", weeks=3, limit=2)
+
+        self.assertEqual(len(statements), 1)
+        self.assertEqual(history.start, "2026-10-05")
+        self.assertEqual(history.week_gaps, [7])
+        self.assertEqual([track.video_id for track in history.videos], ["b", "a"])
+
+    def test_video_history_only_covers_the_requested_window(self) -> None:
+        first = date(2026, 9, 28)
+        for offset, ids in enumerate([["a"], ["b", "a"], ["b"], ["a", "b"]]):
+            self.add_week(first + timedelta(days=7 * offset), ids)
+
+        history = fetch_video_rank_history(self.db, "a", board="main", weeks=3)
+
+        self.assertEqual(history.start, "2026-10-05")
+        self.assertEqual(history.ranks, [2, None, -1])
+
+
+if __name__ == "__main__":
+    unittest.main()
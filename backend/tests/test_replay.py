@@ -0,0 +1,208 @@
+import argparse
+import gzip
+import json
+import os
+import re
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from sqlalchemy.orm import Session
+
+import tests.api_client  # noqa: F401  (settings placeholders)
+from app.models import RankingItem, RankingList
+from benchmarks.replay import (
+    IngestionStub,
+    load_fixture,
+    persist_ranking_boards,
+    prepare_database,
+    record,
+    replay,
+    request_key,
+    upsert_videos,
+)
+
+
+PUBLISHED_AT = (datetime.now(timezone.utc) - timedelta(days=2)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def fake_youtube(path: str, params: Dict[str, str]) -> Dict[str, Any]:
+    """Three videos per search; details for any ID."""
+    if path.endswith("/search"):
+        prefix = re.sub(r"\W", "", params.get("q") or params["channelId"])[:10]
+        return {"items": [{"id": {"videoId": f"{prefix}{n}"}} for n in range(3)]}
+    return {
+        "items": [
+            {
+                "id": video_id,
+                "snippet": {
+                    "title": f"ASMR whisper {video_id}",
+                    "channelId": f"UC{video_id[:4]}",
+                    "channelTitle": f"Channel {video_id[:4]}",
+                    "publishedAt": PUBLISHED_AT,
+                },
+                "statistics": {"viewCount": str(1000 + len(video_id)), "likeCount": "50"},
+                "contentDetails": {"duration": "PT20M"},
+            }
+            for video_id in params["id"].split(",")
+        ]
+    }
+
+
+class FakeYouTube:
+    def __init__(self) -> None:
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                parsed = urlparse(self.path)
+                params = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+                body = json.dumps(fake_youtube(parsed.path, params)).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        host, port = self._server.server_address[:2]
+        self.url = f"http://{host}:{port}"
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class FixtureTests(unittest.TestCase):
+    def test_key_ignores_parameter_order_and_the_api_key(self) -> None:
+        self.assertEqual(
+            request_key("GET", "/youtube/v3/videos", "id=a,b&part=snippet&key=secret"),
+            request_key("GET", "/youtube/v3/videos", "part=snippet&id=a,b&key=other"),
+        )
+        self.assertNotIn("secret", request_key("GET", "/youtube/v3/videos", "key=secret"))
+
+
+class StubTests(unittest.TestCase):
+    def setUp(self) -> None:
+        handle, path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+        self.engine = prepare_database(path, [])
+        self.addCleanup(self.engine.dispose)
+
+    def start(self, **options: Any) -> IngestionStub:
+        stub = IngestionStub(self.engine, **options).start()
+        self.addCleanup(stub.stop)
+        return stub
+
+    def test_replays_in_order_and_counts_misses(self) -> None:
+        key = request_key("GET", "/youtube/v3/search", "q=asmr")
+        stub = self.start(
+            exchanges=[
+                {"key": key, "status": 200, "body": {"page": 1}},
+                {"key": key, "status": 200, "body": {"page": 2}},
+            ]
+        )
+
+        pages = [requests.get(f"{stub.url}/youtube/v3/search?q=asmr&key=x").json()["page"] for _ in range(3)]
+        missing = requests.get(f"{stub.url}/youtube/v3/search?q=other")
+
+        self.assertEqual(pages, [1, 2, 2])
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(stub.stats()["misses"], 1)
+
+    def test_injects_errors_on_the_chosen_service(self) -> None:
+        stub = self.start(error_rate=1.0, error_status=502, error_on="supabase")
+
+        failed = requests.get(f"{stub.url}/rest/v1/video_tag_votes?video_id=in.(a)")
+        missed = requests.get(f"{stub.url}/youtube/v3/search?q=asmr")
+
+        self.assertEqual(failed.status_code, 502)
+        self.assertEqual(missed.status_code, 404)
+        self.assertEqual(stub.stats()["injected_errors"], 1)
+
+    def test_persist_ranking_boards_replaces_a_list_in_place(self) -> None:
+        video = {
+            "youtube_id": "v1",
+            "title": "ASMR",
+            "channel_title": "Channel",
+            "channel_id": "UC1",
+            "published_at": "2026-10-18T10:00:00+00:00",
+            "language": "en",
+        }
+        board = {"board": "main", "name": "ASMR Weekly Pulse 2026-10-19", "description": "", "items": []}
+        with Session(self.engine, future=True) as db:
+            upsert_videos(db, [video])
+            first = persist_ranking_boards(db, [{**board, "items": [{"video_id": "v1", "position": 1}]}])
+            second = persist_ranking_boards(db, [{**board, "items": [{"video_id": "v1", "position": 2}]}])
+
+            self.assertEqual(first, second)
+            ranking = db.get(RankingList, first["main"])
+            self.assertEqual(str(ranking.label_date), "2026-10-19")
+            self.assertEqual([item.position for item in db.query(RankingItem)], [2])
+
+
+class RecordReplayTests(unittest.TestCase):
+    def test_replay_runs_the_pipeline_from_a_recording(self) -> None:
+        upstream = FakeYouTube()
+        self.addCleanup(upstream.stop)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        fixture = os.path.join(directory.name, "pipeline.jsonl.gz")
+        output = os.path.join(directory.name, "report.json")
+
+        record(
+            argparse.Namespace(
+                fixture=fixture,
+                api_key="secret-api-key",
+                upstream=upstream.url,
+                channel=["UCreplayA", "UCreplayB"],
+                rankings_args="--queries 'ASMR whisper' 'ASMR tapping' --top 5 --per-query 3",
+                channel_args="--days 30 --per-channel 3",
+            )
+        )
+        meta, exchanges = load_fixture(fixture)
+        with gzip.open(fixture, "rt", encoding="utf-8") as handle:
+            self.assertNotIn("secret-api-key", handle.read())
+        self.assertEqual(len(meta["watchlist"]), 2)
+        # Two searches and one videos.list call per script.
+        self.assertEqual(len(exchanges), 6)
+
+        upstream.stop()
+        replay(
+            argparse.Namespace(
+                fixture=fixture,
+                repeat=2,
+                warmup=0,
+                latency_ms=1.0,
+                jitter_ms=0.5,
+                recorded_latency=False,
+                error_rate=0.0,
+                error_status=503,
+                error_on="all",
+                seed=1,
+                output=output,
+            )
+        )
+
+        with open(output, encoding="utf-8") as handle:
+            report = json.load(handle)
+        self.assertEqual(set(report["results"]), {"fetch_rankings", "fetch_channel_videos", "pipeline"})
+        first, second = report["runs"]
+        self.assertEqual(first["rows"], second["rows"])
+        # The five ranked videos plus three per watched channel.
+        self.assertEqual(first["rows"]["videos"], 11)
+        self.assertEqual(first["rows"]["ranking_items"], 5)
+        self.assertEqual(first["stub"]["misses"], 0)
+        self.assertEqual(first["stub"]["replayed"], 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
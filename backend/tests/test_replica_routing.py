@@ -0,0 +1,106 @@
+import unittest
+from datetime import datetime
+
+from tests.api_client import ADMIN_HEADERS, make_client, make_database, reset_client
+from app.db.routing import ReplicaRouter
+from app.models import Video
+
+
+NOW = datetime(2026, 10, 19, 12, 0, 0)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def add_video(sessions, youtube_id: str, channel_id: str) -> None:
+    db = sessions()
+    db.add(
+        Video(
+            youtube_id=youtube_id,
+            title="ASMR tapping",
+            description="wooden blocks",
+            channel_title=channel_id,
+            channel_id=channel_id,
+            published_at=NOW,
+        )
+    )
+    db.commit()
+    db.close()
+
+
+class ReplicaRoutingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.lag = 0.0
+        self.probes = 0
+        self.replica_sessions, replica_async = make_database(read_only=True)
+        self.router = ReplicaRouter(
+            None,
+            replica_async,
+            max_lag_seconds=5,
+            check_interval=2,
+            probe=self.probe,
+            clock=self.clock,
+        )
+        self.client, self.primary_sessions = make_client(router=self.router)
+        self.addCleanup(reset_client)
+        # Two separate databases, so every response shows where it was read.
+        add_video(self.primary_sessions, "p1", "UC_PRIMARY")
+        add_video(self.replica_sessions, "r1", "UC_REPLICA")
+
+    async def probe(self, db) -> float:
+        self.probes += 1
+        if isinstance(self.lag, Exception):
+            raise self.lag
+        return self.lag
+
+    def read_from(self) -> str:
+        channels = self.client.get("/api/channels/popular").json()
+        return channels[0]["channel_id"]
+
+    def test_reads_use_the_replica_except_right_after_a_write(self) -> None:
+        self.assertEqual(self.read_from(), "UC_REPLICA")
+
+        vote = self.client.post("/api/videos/p1/tags/tapping/vote", json={"vote": 1})
+        self.assertEqual(vote.json(), {"score": 1})
+        self.assertEqual(self.read_from(), "UC_PRIMARY")
+
+        self.clock.now += 5
+        self.assertEqual(self.read_from(), "UC_REPLICA")
+        stats = self.client.get("/api/admin/db-routing", headers=ADMIN_HEADERS).json()
+        self.assertEqual(stats["reads"], {"primary_recent_write": 1, "replica": 2})
+
+    def test_lagging_or_unreachable_replica_falls_back_to_the_primary(self) -> None:
+        self.lag = 30.0
+        self.assertEqual(self.read_from(), "UC_PRIMARY")
+        self.lag = 0.0
+        # Still within the check interval: the last measurement stands.
+        self.assertEqual(self.read_from(), "UC_PRIMARY")
+        self.assertEqual(self.probes, 1)
+
+        self.clock.now += 2
+        self.assertEqual(self.read_from(), "UC_REPLICA")
+
+        self.lag = OSError("connection refused")
+        self.clock.now += 2
+        self.assertEqual(self.read_from(), "UC_PRIMARY")
+        stats = self.client.get("/api/admin/db-routing", headers=ADMIN_HEADERS).json()
+        self.assertIsNone(stats["replica_lag_seconds"])
+
+    def test_replica_reads_compute_tags_without_writing_them_back(self) -> None:
+        page = self.client.get("/api/videos").json()
+
+        self.assertEqual([item["youtube_id"] for item in page["items"]], ["r1"])
+        self.assertIn("tapping", page["items"][0]["computed_tags"])
+        db = self.replica_sessions()
+        self.addCleanup(db.close)
+        self.assertIsNone(db.get(Video, "r1").computed_tags)
+
+
+if __name__ == "__main__":
+    unittest.main()
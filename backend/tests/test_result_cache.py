@@ -0,0 +1,221 @@
+import unittest
+from datetime import datetime, timedelta
+
+from app.models import Video
+from app.services.result_cache import (
+    LRUBackend,
+    RedisBackend,
+    RespClient,
+    ResultCache,
+    channel_tag,
+)
+from app.services.videos import browse_cache_tags, browse_signature
+from tests.api_client import make_client, reset_client
+from tests.resp_stub import RespStub
+
+
+NOW = datetime(2026, 10, 19, 12, 0, 0)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Counter:
+    def __init__(self, value="result") -> None:
+        self.calls = 0
+        self.value = value
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+class LRUBackendTests(unittest.TestCase):
+    def test_entries_expire_and_least_recent_is_evicted(self) -> None:
+        clock = FakeClock()
+        backend = LRUBackend(max_entries=2, ttl_seconds=10, clock=clock)
+        backend.set("a", b"1")
+        backend.set("b", b"2")
+        backend.get("a")
+        backend.set("c", b"3")
+
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(backend.get("a"), b"1")
+        clock.now = 11
+        self.assertIsNone(backend.get("a"))
+
+
+class ResultCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = ResultCache(LRUBackend())
+
+    def test_hits_until_a_stamped_tag_is_bumped(self) -> None:
+        compute = Counter({"items": [1, 2]})
+        fetch = lambda: self.cache.fetch("ns", {"q": 1}, ["catalog", "tag:x"], compute)
+
+        self.assertEqual(fetch(), {"items": [1, 2]})
+        self.assertEqual(fetch(), {"items": [1, 2]})
+        self.assertEqual(compute.calls, 1)
+
+        self.cache.invalidate(["tag:y"])
+        fetch()
+        self.assertEqual(compute.calls, 1)
+
+        self.cache.invalidate(["tag:x"])
+        fetch()
+        self.assertEqual(compute.calls, 2)
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 2))
+
+    def test_result_tags_are_stamped_after_compute(self) -> None:
+        compute = Counter(["v1", "v2"])
+        fetch = lambda: self.cache.fetch(
+            "ns", {}, [], compute, result_tags=lambda ids: [f"video:{i}" for i in ids]
+        )
+        fetch()
+        self.cache.invalidate_video_tags("v3", ["whisper"])
+        fetch()
+        self.assertEqual(compute.calls, 1)
+
+        self.cache.invalidate_video_tags("v2", ["whisper"])
+        fetch()
+        self.assertEqual(compute.calls, 2)
+
+    def test_result_is_not_stored_when_feedback_lands_during_compute(self) -> None:
+        def racing_compute():
+            self.cache.invalidate_video_tags("v1", ["whisper"])
+            return ["v1"]
+
+        self.cache.fetch("ns", {}, [], racing_compute)
+
+        self.assertEqual(len(self.cache.backend), 0)
+
+
+class BrowseSignatureTests(unittest.TestCase):
+    def test_equivalent_filters_share_a_signature(self) -> None:
+        first = browse_signature(tags=["b", "a", "a"], channel_ids=["y", "x"], sort="bogus")
+        second = browse_signature(tags=["a", "b"], channel_ids=["x", "y"], sort=None, page=0)
+
+        self.assertEqual(first, second)
+        self.assertEqual(first["sort"], "published_desc")
+
+    def test_channel_filtered_pages_depend_on_their_channels_only(self) -> None:
+        tags = browse_cache_tags(browse_signature(channel_ids=["UC1"], exclude_tags=["roleplay"]))
+        self.assertEqual(tags, ["catalog", "channel:UC1", "tag:roleplay"])
+
+        tags = browse_cache_tags(browse_signature())
+        self.assertEqual(tags, ["catalog", "channel:*"])
+
+
+class RedisBackendTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stub = RespStub().start()
+        self.addCleanup(self.stub.stop)
+
+    def make_cache(self) -> ResultCache:
+        client = RespClient.from_url(self.stub.url)
+        self.addCleanup(client.close)
+        return ResultCache(RedisBackend(client, ttl_seconds=60))
+
+    def test_entries_and_invalidations_are_shared_between_processes(self) -> None:
+        api, ingestion = self.make_cache(), self.make_cache()
+        compute = Counter({"published_at": NOW})
+
+        self.assertEqual(api.fetch("browse", {"q": 1}, ["channel:UC1"], compute), {"published_at": NOW})
+        # Values come back JSON-decoded, dates as ISO strings.
+        self.assertEqual(
+            api.fetch("browse", {"q": 1}, ["channel:UC1"], compute),
+            {"published_at": NOW.isoformat()},
+        )
+        self.assertEqual(compute.calls, 1)
+
+        ingestion.invalidate_channels(["UC1"])
+        api.fetch("browse", {"q": 1}, ["channel:UC1"], compute)
+        self.assertEqual(compute.calls, 2)
+        self.assertIn([b"SET"], [command[:1] for command in self.stub.commands])
+
+    def test_unreachable_server_falls_back_to_computing(self) -> None:
+        cache = self.make_cache()
+        self.stub.stop()
+        compute = Counter()
+
+        self.assertEqual(cache.fetch("browse", {}, [], compute), "result")
+        cache.invalidate_catalog()
+        self.assertEqual(compute.calls, 1)
+
+
+class BrowseCacheApiTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = ResultCache(LRUBackend())
+        self.client, self.sessions = make_client(self.cache)
+        self.addCleanup(reset_client)
+        db = self.sessions()
+        for n, channel in enumerate(["UC1", "UC1", "UC2"]):
+            db.add(
+                Video(
+                    youtube_id=f"v{n}",
+                    title=f"ASMR tapping {n}",
+                    channel_title=channel,
+                    channel_id=channel,
+                    published_at=NOW - timedelta(days=n),
+                    view_count=100 * n,
+                    computed_tags=["tapping"],
+                )
+            )
+        db.commit()
+        db.close()
+
+    def test_repeated_pages_are_served_from_the_cache(self) -> None:
+        first = self.client.get("/api/videos", params={"tags": "tapping,whisper"})
+        second = self.client.get("/api/videos", params={"tags": "whisper,tapping"})
+
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_votes_and_user_tags_invalidate_affected_pages(self) -> None:
+        self.client.get("/api/videos", params={"tags": "whisper"})
+        self.assertEqual(self.client.get("/api/videos", params={"tags": "whisper"}).json()["total"], 0)
+
+        created = self.client.post("/api/videos/v1/tags", json={"tag": "whisper"})
+        self.assertTrue(created.json()["created"])
+        page = self.client.get("/api/videos", params={"tags": "whisper"}).json()
+        self.assertEqual([item["youtube_id"] for item in page["items"]], ["v1"])
+
+        # v0 is on the UC1 page and its computed_tags are shown there.
+        self.client.get("/api/videos", params={"channels": "UC1"})
+        self.client.post("/api/videos/v0/tags/tapping/vote", json={"vote": -1})
+        self.client.get("/api/videos", params={"channels": "UC1"})
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 4))
+
+    def test_ingestion_only_invalidates_touched_channels(self) -> None:
+        self.client.get("/api/videos", params={"channels": "UC1"})
+        self.client.get("/api/videos", params={"channels": "UC2"})
+
+        db = self.sessions()
+        db.add(
+            Video(
+                youtube_id="v9",
+                title="ASMR new upload",
+                channel_title="UC2",
+                channel_id="UC2",
+                published_at=NOW,
+                computed_tags=[],
+            )
+        )
+        db.commit()
+        db.close()
+        self.cache.invalidate_channels(["UC2"])
+
+        uc1 = self.client.get("/api/videos", params={"channels": "UC1"}).json()
+        uc2 = self.client.get("/api/videos", params={"channels": "UC2"}).json()
+        self.assertEqual((uc1["total"], uc2["total"]), (2, 2))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 3))
+        self.assertEqual(self.cache.backend.versions([channel_tag("UC1")]), [0])
+
+
+if __name__ == "__main__":
+    unittest.main()
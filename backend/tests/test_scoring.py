@@ -0,0 +1,83 @@
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from app.services.scoring import SCORE_SCALE, ScoreWeights, score_arrays, score_videos
+
+
+NOW = datetime(2026, 3, 2, tzinfo=timezone.utc)
+
+
+def make_video(video_id: str, views: int, likes: int, hours_old: float) -> dict:
+    return {
+        "youtube_id": video_id,
+        "view_count": views,
+        "like_count": likes,
+        "published_at": NOW - timedelta(hours=hours_old),
+    }
+
+
+class ScoreVideosTests(unittest.TestCase):
+    def test_fast_rising_upload_beats_older_bigger_one(self) -> None:
+        videos = [
+            make_video("old_big", 200_000, 4_000, hours_old=24 * 6),
+            make_video("new_small", 40_000, 800, hours_old=6),
+        ]
+
+        result = score_videos(videos, now=NOW)
+
+        self.assertEqual(list(result.ranking()), [1, 0])
+
+    def test_weights_decide_which_signal_wins(self) -> None:
+        videos = [
+            make_video("fast", 50_000, 500, hours_old=10),
+            make_video("loved", 5_000, 1_000, hours_old=10),
+        ]
+
+        by_velocity = score_videos(videos, now=NOW, weights=ScoreWeights(1, 0, 0))
+        by_likes = score_videos(videos, now=NOW, weights=ScoreWeights(0, 1, 0))
+
+        self.assertEqual(list(by_velocity.ranking()), [0, 1])
+        self.assertEqual(list(by_likes.ranking()), [1, 0])
+
+    def test_tag_votes_break_ties(self) -> None:
+        videos = [make_video("a", 1_000, 30, 24), make_video("b", 1_000, 30, 24)]
+
+        result = score_videos(videos, now=NOW, tag_vote_totals={"b": 4})
+
+        self.assertEqual(list(result.ranking()), [1, 0])
+
+    def test_contributions_add_up_to_the_score(self) -> None:
+        videos = [make_video(f"v{n}", 1_000 * (n + 1), 10 * n, 5 + n) for n in range(10)]
+
+        result = score_videos(videos, now=NOW)
+
+        total = sum(result.contributions.values())
+        np.testing.assert_allclose(total, result.scores)
+        self.assertTrue(np.all(result.scores <= 1.0))
+        for index in range(len(videos)):
+            self.assertAlmostEqual(
+                sum(result.scaled_contributions(index).values()), result.scaled(index), delta=3
+            )
+        self.assertLessEqual(result.scaled(int(result.ranking()[0])), SCORE_SCALE)
+
+    def test_large_catalog_is_scored_in_one_vectorized_pass(self) -> None:
+        rng = np.random.default_rng(7)
+        size = 200_000
+        views = rng.integers(0, 5_000_000, size)
+        likes = (views * rng.uniform(0, 0.08, size)).astype(np.int64)
+        published = NOW.timestamp() - rng.uniform(3600, 14 * 86400, size)
+        votes = rng.integers(-5, 6, size)
+
+        started = time.perf_counter()
+        result = score_arrays(views, likes, published, votes, now_ts=NOW.timestamp())
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(result.scores.shape, (size,))
+        self.assertLess(elapsed, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,205 @@
+import asyncio
+import threading
+import time
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import anyio.to_thread
+
+from app.models import Video
+from app.services import channels
+from app.services.single_flight import SingleFlight, coalesced, flights
+from tests.api_client import ADMIN_HEADERS, make_client, reset_client
+
+
+def run_concurrently(count, target):
+    results = [None] * count
+    errors = [None] * count
+
+    def run(index):
+        try:
+            results[index] = target()
+        except Exception as exc:  # noqa: BLE001 - collected for assertions
+            errors[index] = exc
+
+    threads = [threading.Thread(target=run, args=(n,)) for n in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def wait_for_callers(flight: SingleFlight, key, count: int) -> None:
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        with flight._lock:
+            call = flight._calls.get(key) or flight._async_calls.get(key)
+            if call is not None and call.callers == count:
+                return
+        time.sleep(0.001)
+    raise AssertionError(f"{count} callers never joined {key}")
+
+
+class SingleFlightTests(unittest.TestCase):
+    def test_concurrent_callers_share_one_computation(self) -> None:
+        flight = SingleFlight()
+        release = threading.Event()
+        computations = []
+
+        def compute():
+            computations.append(1)
+            release.wait(5)
+            return {"items": [1]}
+
+        threads, results, _ = run_concurrently(6, lambda: flight.do("board", "main", compute))
+        wait_for_callers(flight, ("board", "main"), 6)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(computations), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        stats = flight.stats()["board"]
+        self.assertEqual((stats["computations"], stats["callers"], stats["coalesced"]), (1, 6, 5))
+        self.assertEqual(stats["callers_histogram"]["10"], 1)
+
+        # The key is released: the next call computes again.
+        flight.do("board", "main", compute)
+        self.assertEqual(len(computations), 2)
+
+    def test_followers_receive_the_leaders_exception(self) -> None:
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def compute():
+            release.wait(5)
+            raise RuntimeError("database went away")
+
+        threads, _, errors = run_concurrently(3, lambda: flight.do("board", "main", compute))
+        wait_for_callers(flight, ("board", "main"), 3)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(all(isinstance(error, RuntimeError) for error in errors))
+        self.assertEqual(flight.stats()["board"]["computations"], 1)
+
+    def test_async_followers_share_the_leaders_result(self) -> None:
+        flight = SingleFlight()
+        computations = []
+
+        async def compute():
+            computations.append(1)
+            await asyncio.sleep(0.05)
+            return {"items": [1]}
+
+        async def main():
+            calls = [asyncio.create_task(flight.do_async("board", "main", compute)) for _ in range(5)]
+            await asyncio.sleep(0.01)
+            # A cancelled follower leaves the others (and the leader) running.
+            calls[1].cancel()
+            return await asyncio.gather(*calls, return_exceptions=True)
+
+        results = asyncio.run(main())
+
+        self.assertEqual(len(computations), 1)
+        self.assertIsInstance(results[1], asyncio.CancelledError)
+        self.assertTrue(all(result is results[0] for result in results[2:]))
+        self.assertEqual(flight.stats()["board"]["callers"], 5)
+
+    def test_a_cancelled_async_leader_hands_over_to_its_followers(self) -> None:
+        flight = SingleFlight()
+        computations = []
+
+        async def compute():
+            computations.append(1)
+            await asyncio.sleep(0.05)
+            return {"items": [len(computations)]}
+
+        async def main():
+            leader = asyncio.create_task(flight.do_async("board", "main", compute))
+            await asyncio.sleep(0.01)
+            followers = [asyncio.create_task(flight.do_async("board", "main", compute)) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return await asyncio.gather(leader, *followers, return_exceptions=True)
+
+        leader, *followers = asyncio.run(main())
+
+        self.assertIsInstance(leader, asyncio.CancelledError)
+        # One follower took over the computation; the others shared its result.
+        self.assertEqual(len(computations), 2)
+        self.assertEqual(followers, [{"items": [2]}] * 3)
+        self.assertTrue(all(result is followers[0] for result in followers))
+        stats = flight.stats()["board"]
+        self.assertEqual((stats["computations"], stats["callers"]), (1, 3))
+
+    def test_coalesced_keys_on_bound_arguments_without_the_session(self) -> None:
+        keys = []
+
+        @coalesced("probe")
+        def probe(db, board="main", fields=("a",)):
+            return db
+
+        with mock.patch.object(flights, "do", lambda name, key, fn: keys.append(key) or fn()):
+            self.assertEqual(probe("session-1"), "session-1")
+            probe("session-2", "main", fields=["a"])
+            probe("session-3", board="whisper")
+
+        self.assertEqual(keys, [("main", ("a",)), ("main", ("a",)), ("whisper", ("a",))])
+
+
+class CoalescedEndpointTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client, self.sessions = make_client()
+        self.addCleanup(reset_client)
+        flights.reset_stats()
+        self.addCleanup(flights.reset_stats)
+        db = self.sessions()
+        db.add(
+            Video(
+                youtube_id="v1",
+                title="ASMR tapping",
+                channel_title="Channel",
+                channel_id="UC1",
+                published_at=datetime(2026, 10, 19),
+            )
+        )
+        db.commit()
+        db.close()
+
+    def test_concurrent_popular_channel_requests_run_one_query(self) -> None:
+        release = threading.Event()
+        queries = []
+
+        @coalesced("list_top_channels")
+        async def slow_list_top_channels(db, limit=30):
+            queries.append(limit)
+            await anyio.to_thread.run_sync(release.wait, 5)
+            return await db.run_sync(channels.list_top_channels.__wrapped__, limit)
+
+        patcher = mock.patch(
+            "app.api.endpoints.channels.list_top_channels_async", slow_list_top_channels
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        threads, results, _ = run_concurrently(
+            4, lambda: self.client.get("/api/channels/popular").json()
+        )
+        wait_for_callers(flights, ("list_top_channels", (30,)), 4)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(queries, [30])
+        self.assertEqual(results[0], [{"channel_id": "UC1", "channel_title": "Channel", "video_count": 1}])
+        self.assertTrue(all(result == results[0] for result in results))
+
+        stats = self.client.get("/api/admin/single-flight", headers=ADMIN_HEADERS).json()
+        self.assertEqual(stats["list_top_channels"]["callers"], 4)
+        self.assertEqual(stats["list_top_channels"]["max_callers"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from tests.api_client import ADMIN_HEADERS, make_client, reset_client
+from app.api.dependencies import get_admin_token
+from app.db.base import Base
+from app.main import app
+from app.db.slow_queries import SlowQueryLog, full_scans, install_slow_query_log, redact_parameters
+from app.models import Video
+
+
+def search_titles(engine, title: str) -> list:
+    with engine.connect() as conn:
+        return conn.execute(select(Video.youtube_id).where(Video.title == title)).fetchall()
+
+
+class SlowQueryLogTests(unittest.TestCase):
+    def setUp(self) -> None:
+        handle, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+        self.engine = create_engine(f"sqlite:///{self.path}", future=True)
+        self.addCleanup(self.engine.dispose)
+        Base.metadata.create_all(self.engine)
+
+    def install(self, **kwargs) -> SlowQueryLog:
+        log = SlowQueryLog(0, **kwargs)
+        install_slow_query_log(self.engine, log, name="test")
+        return log
+
+    def test_records_redacted_statement_caller_and_plan(self) -> None:
+        sink_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(sink_dir.cleanup)
+        sink = os.path.join(sink_dir.name, "slow.jsonl")
+        log = self.install(sink_path=sink)
+
+        search_titles(self.engine, "ASMR whisper for fp-secret")
+        log.drain()
+
+        [entry] = log.entries()
+        self.assertIn("FROM videos", entry["statement"])
+        self.assertEqual(entry["parameters"], ["<str>"])
+        self.assertRegex(entry["caller"], r"^tests/test_slow_queries\.py:\d+ in search_titles$")
+        self.assertIn("SCAN videos", entry["plan"])
+        self.assertEqual(entry["full_scans"], ["videos"])
+        self.assertEqual(log.entries(full_scan_on="videos"), [entry])
+        self.assertEqual(log.entries(full_scan_on="channels"), [])
+        with open(sink, encoding="utf-8") as lines:
+            [line] = lines.read().splitlines()
+        self.assertEqual(json.loads(line)["full_scans"], ["videos"])
+        self.assertNotIn("fp-secret", line)
+
+    def test_indexed_lookup_is_not_a_full_scan(self) -> None:
+        log = self.install()
+
+        with self.engine.connect() as conn:
+            conn.execute(select(Video.title).where(Video.youtube_id == "v1")).fetchall()
+        log.drain()
+
+        [entry] = log.entries()
+        self.assertEqual(entry["full_scans"], [])
+
+    def test_async_engine_reports_the_awaiting_caller(self) -> None:
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{self.path}")
+        log = SlowQueryLog(0)
+        install_slow_query_log(async_engine.sync_engine, log, name="test_async", explain_engine=self.engine)
+
+        async def lookup() -> None:
+            async with async_engine.connect() as conn:
+                await conn.execute(select(Video.youtube_id).where(Video.title == "ASMR"))
+            await async_engine.dispose()
+
+        asyncio.run(lookup())
+        log.drain()
+
+        [entry] = log.entries()
+        self.assertRegex(entry["caller"], r"test_slow_queries\.py:\d+ in lookup$")
+        self.assertEqual(entry["full_scans"], ["videos"])
+
+    def test_ring_buffer_keeps_the_newest_entries(self) -> None:
+        log = self.install(capacity=2, explain=False)
+
+        with self.engine.connect() as conn:
+            for n in range(5):
+                conn.execute(text(f"SELECT {n}"))
+        log.drain()
+
+        self.assertEqual([entry["statement"] for entry in log.entries()], ["SELECT 4", "SELECT 3"])
+        self.assertEqual(log.stats()["recorded"], 5)
+
+    def test_fast_statements_are_ignored(self) -> None:
+        log = SlowQueryLog(60_000)
+        install_slow_query_log(self.engine, log, name="test")
+
+        search_titles(self.engine, "ASMR")
+        log.drain()
+
+        self.assertEqual(log.entries(), [])
+
+
+class HelperTests(unittest.TestCase):
+    def test_redact_parameters(self) -> None:
+        self.assertEqual(
+            redact_parameters({"fingerprint": "abc", "limit": 20, "flag": None}),
+            {"fingerprint": "<str>", "limit": 20, "flag": None},
+        )
+        self.assertEqual(redact_parameters([("a", 1), ("b", 2)]), [["<str>", 1], ["<str>", 2]])
+
+    def test_full_scans(self) -> None:
+        plan = "Limit\n  ->  Seq Scan on videos\n        Filter: (title ~~* $1)"
+        self.assertEqual(full_scans(plan), ["videos"])
+        self.assertEqual(full_scans("SEARCH videos USING INDEX ix_videos_published_at (published_at>?)"), [])
+
+
+class SlowQueryApiTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client, _ = make_client()
+        self.addCleanup(reset_client)
+
+    def test_admin_endpoint_lists_entries(self) -> None:
+        log = SlowQueryLog(0, explain=False)
+        log.observe("SELECT 1", (), 0.75, engine_name="primary", explain_engine=None)
+        log.drain()
+
+        with mock.patch("app.api.endpoints.admin.slow_query_log", log):
+            body = self.client.get("/api/admin/slow-queries", headers=ADMIN_HEADERS).json()
+
+        self.assertEqual(body["recorded"], 1)
+        self.assertEqual(body["entries"][0]["duration_ms"], 750.0)
+
+    def test_disabled_log_is_404(self) -> None:
+        with mock.patch("app.api.endpoints.admin.slow_query_log", None):
+            response = self.client.get("/api/admin/slow-queries", headers=ADMIN_HEADERS)
+        self.assertEqual(response.status_code, 404)
+
+    def test_admin_endpoints_need_the_admin_token(self) -> None:
+        for name in ("slow-queries", "pools", "db-routing", "single-flight"):
+            path = f"/api/admin/{name}"
+            self.assertEqual(self.client.get(path).status_code, 403)
+            self.assertEqual(self.client.get(path, headers={"X-Admin-Token": "guess"}).status_code, 403)
+
+        # Without a configured token the admin endpoints do not exist.
+        with mock.patch.dict(app.dependency_overrides, {get_admin_token: lambda: None}):
+            self.assertEqual(self.client.get("/api/admin/pools", headers=ADMIN_HEADERS).status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
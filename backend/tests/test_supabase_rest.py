@@ -0,0 +1,224 @@
+import unittest
+from datetime import datetime, timezone
+
+from app.services.result_cache import channel_invalidation_tags
+from scripts.fetch_rankings import RankingPayload, persist_ranking
+from scripts.supabase_rest import SupabaseRestClient
+from tests.postgrest_stub import PostgrestStub
+
+
+def make_videos(count: int) -> list:
+    return [
+        {"youtube_id": f"vid{n}", "title": f"ASMR video {n}", "description": "tapping " * 40}
+        for n in range(count)
+    ]
+
+
+class SupabaseRestClientTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stub = PostgrestStub().start()
+        self.addCleanup(self.stub.stop)
+        self.client = SupabaseRestClient(
+            self.stub.url,
+            "service-key",
+            backoff_base=0.001,
+            sleep=lambda _: None,
+        )
+        self.addCleanup(self.client.close)
+
+    def test_upserts_are_gzipped_and_sent_in_parallel_batches(self) -> None:
+        self.stub.delay = 0.05
+        self.client.batch_max_rows = 50
+        self.client.gzip_min_bytes = 1024
+
+        self.client.upsert_videos(make_videos(300))
+
+        posts = [r for r in self.stub.requests if r.path == "videos"]
+        self.assertEqual(len(posts), 6)
+        self.assertTrue(all(r.headers.get("Content-Encoding") == "gzip" for r in posts))
+        self.assertEqual(posts[0].params["on_conflict"], "youtube_id")
+        self.assertGreater(self.stub.max_in_flight, 1)
+        self.assertLessEqual(self.stub.max_in_flight, self.client.max_concurrency)
+        self.assertEqual(len(self.stub.tables["videos"]), 300)
+        self.assertLess(self.client.stats.sent_bytes, self.client.stats.raw_bytes)
+
+    def test_batches_are_split_by_payload_bytes(self) -> None:
+        self.client.batch_max_bytes = 4096
+
+        batches = list(self.client.plan_batches(make_videos(40)))
+
+        self.assertGreater(len(batches), 1)
+        for batch in batches:
+            self.assertLessEqual(sum(len(row) + 1 for row in batch), 4096)
+        self.assertEqual(sum(len(batch) for batch in batches), 40)
+
+    def test_transient_failures_are_retried_for_upserts(self) -> None:
+        self.stub.fail_next(2, status=503)
+
+        self.client.upsert_videos(make_videos(3))
+
+        self.assertEqual(len(self.stub.tables["videos"]), 3)
+        self.assertEqual(self.client.stats.retries, 2)
+        # Compression is opt-in.
+        self.assertNotIn("Content-Encoding", self.stub.requests[-1].headers)
+
+    def test_non_idempotent_inserts_are_not_retried(self) -> None:
+        self.stub.fail_next(1, status=503)
+
+        with self.assertRaises(RuntimeError):
+            self.client._request(
+                "POST",
+                "ranking_lists",
+                json_payload=[{"name": "ASMR Weekly Pulse 2026-03-02"}],
+                prefer="return=representation",
+            )
+
+        self.assertEqual(self.client.stats.retries, 0)
+        self.assertNotIn("ranking_lists", self.stub.tables)
+
+    def test_retries_give_up_after_max_retries(self) -> None:
+        self.client.max_retries = 2
+        self.stub.fail_next(3, status=502)
+
+        with self.assertRaises(RuntimeError):
+            self.client.upsert_videos(make_videos(1))
+
+        self.assertEqual(self.client.stats.retries, 2)
+
+
+class TagVoteTotalsTests(unittest.TestCase):
+    def test_votes_are_summed_per_requested_video(self) -> None:
+        stub = PostgrestStub().start()
+        self.addCleanup(stub.stop)
+        stub.tables["video_tag_votes"] = [
+            {"video_id": "a", "vote": 1},
+            {"video_id": "a", "vote": 1},
+            {"video_id": "b", "vote": -1},
+            {"video_id": "c", "vote": 1},
+        ]
+        client = SupabaseRestClient(stub.url, "service-key")
+        self.addCleanup(client.close)
+
+        totals = client.fetch_tag_vote_totals(["a", "b", "d"], chunk_size=2)
+
+        self.assertEqual(totals, {"a": 2, "b": -1})
+        self.assertEqual([r.params["video_id"] for r in stub.requests], ["in.(a,b)", "in.(d)"])
+
+
+class PersistRankingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stub = PostgrestStub().start()
+        self.addCleanup(self.stub.stop)
+        self.lists = {}
+        self.stub.rpc_handlers["persist_ranking_boards"] = self._persist_ranking_boards
+        self.client = SupabaseRestClient(self.stub.url, "service-key", sleep=lambda _: None)
+        self.addCleanup(self.client.close)
+
+    def _store(self, name, board, items):
+        # Mirrors the SQL functions: one list per (name, board), items replaced wholesale.
+        stored = self.lists.setdefault((name, board), {"id": len(self.lists) + 1})
+        stored["items"] = items
+        return stored["id"]
+
+    def _persist_ranking_boards(self, payload):
+        return {
+            board["board"]: self._store(board["name"], board["board"], board["items"])
+            for board in payload["p_boards"]
+        }
+
+    def _payload(self):
+        videos = [
+            {
+                "youtube_id": "abc",
+                "title": "ASMR tapping",
+                "description": None,
+                "channel_title": "Channel",
+                "channel_id": "UC1",
+                "published_at": datetime(2026, 3, 1, tzinfo=timezone.utc),
+                "view_count": 1000,
+                "like_count": 10,
+                "duration": 600,
+                "tags": [],
+                "thumbnail_url": None,
+            }
+        ]
+        return RankingPayload(items=videos, generated_at=datetime.now(timezone.utc), queries=[])
+
+    def test_videos_are_upserted_before_the_boards_rpc(self) -> None:
+        persist_ranking(self.client, self._payload(), "ASMR Weekly Pulse 2026-03-02", "", False)
+
+        self.assertEqual([r.path for r in self.stub.requests], ["videos", "rpc/persist_ranking_boards"])
+        self.assertEqual(self.stub.tables["videos"][0]["published_at"], "2026-03-01T00:00:00+00:00")
+        self.assertEqual(
+            self.stub.requests[1].payload["p_boards"],
+            [
+                {
+                    "board": "main",
+                    "name": "ASMR Weekly Pulse 2026-03-02",
+                    "description": "",
+                    "items": [{"video_id": "abc", "position": 1, "score": 1000}],
+                }
+            ],
+        )
+
+    def test_sub_boards_share_the_write_and_the_video_rows(self) -> None:
+        base = self._payload()
+        payload = base._replace(boards={"whisper": base.items, "tapping": base.items})
+
+        persist_ranking(self.client, payload, "ASMR Weekly Pulse 2026-03-02", "", False)
+
+        self.assertEqual(len(self.stub.requests), 2)
+        sent = self.stub.requests[1].payload
+        self.assertEqual([b["board"] for b in sent["p_boards"]], ["main", "whisper", "tapping"])
+        self.assertEqual(len(self.stub.tables["videos"]), 1)
+        self.assertEqual(len(self.lists), 3)
+
+    def test_rpc_is_retried_and_stays_idempotent_per_label(self) -> None:
+        self.stub.fail_next(1, status=503)
+
+        first = self.client.persist_ranking_boards(
+            [{"board": "main", "name": "Week", "description": "", "items": [{"video_id": "a", "position": 1}]}]
+        )
+        second = self.client.persist_ranking_boards(
+            [{"board": "main", "name": "Week", "description": "", "items": [{"video_id": "b", "position": 1}]}]
+        )
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.client.stats.retries, 1)
+        self.assertEqual(self.lists[("Week", "main")]["items"][0]["video_id"], "b")
+
+    def test_persisted_channels_are_invalidated_after_the_write(self) -> None:
+        self.stub.rpc_handlers["bump_cache_versions"] = lambda payload: {
+            tag: 1 for tag in payload["p_tags"]
+        }
+
+        persist_ranking(
+            self.client,
+            self._payload(),
+            "ASMR Weekly Pulse 2026-03-02",
+            "",
+            False,
+            invalidate_channels=lambda channels: self.client.bump_cache_versions(
+                channel_invalidation_tags(channels)
+            ),
+        )
+
+        self.assertEqual(
+            [r.path for r in self.stub.requests],
+            ["videos", "rpc/persist_ranking_boards", "rpc/bump_cache_versions"],
+        )
+        self.assertEqual(self.stub.requests[2].payload, {"p_tags": ["channel:*", "channel:UC1"]})
+
+    def test_failed_invalidation_does_not_fail_the_ingestion(self) -> None:
+        def failing(channels):
+            raise RuntimeError("Supabase REST POST rpc/bump_cache_versions failed: 404")
+
+        persist_ranking(
+            self.client, self._payload(), "Week", "", False, invalidate_channels=failing
+        )
+
+        self.assertEqual(len(self.lists), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.models import Video, VideoStatsHistory
+from app.services.video_stats import (
+    RetentionPolicy,
+    downsample_history,
+    plan_downsample,
+    record_stats,
+    select_stale_videos,
+)
+
+
+NOW = datetime(2026, 10, 19, 12, 30)
+
+
+def make_video(video_id: str, views: int, refreshed_at=None) -> Video:
+    return Video(
+        youtube_id=video_id,
+        title=f"ASMR {video_id}",
+        channel_title="Channel",
+        channel_id="UC1",
+        published_at=NOW - timedelta(days=30),
+        view_count=views,
+        like_count=0,
+        stats_refreshed_at=refreshed_at,
+    )
+
+
+class VideoStatsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        engine = create_engine("sqlite://", future=True)
+        Base.metadata.create_all(engine)
+        self.db = sessionmaker(bind=engine)()
+        self.addCleanup(self.db.close)
+
+    def test_stale_videos_are_ordered_by_staleness_then_popularity(self) -> None:
+        self.db.add_all(
+            [
+                make_video("fresh", 10_000, refreshed_at=NOW - timedelta(hours=1)),
+                make_video("old-small", 10, refreshed_at=NOW - timedelta(days=3)),
+                make_video("never-small", 5),
+                make_video("never-big", 50_000),
+                make_video("older", 1, refreshed_at=NOW - timedelta(days=5)),
+            ]
+        )
+        self.db.commit()
+
+        ids = select_stale_videos(self.db, now=NOW, stale_after=timedelta(hours=24), limit=10)
+
+        self.assertEqual(ids, ["never-big", "never-small", "older", "old-small"])
+
+    def test_record_stats_appends_history_and_denormalizes(self) -> None:
+        self.db.add_all([make_video("a", 1), make_video("gone", 1)])
+        self.db.commit()
+
+        record_stats(self.db, {"a": (100, 5)}, observed_at=NOW, refreshed_ids=["a", "gone"])
+        record_stats(self.db, {"a": (120, 6)}, observed_at=NOW + timedelta(minutes=10))
+        self.db.commit()
+
+        history = self.db.query(VideoStatsHistory).all()
+        self.assertEqual(
+            [(h.video_id, h.observed_at, h.view_count) for h in history],
+            [("a", datetime(2026, 10, 19, 12), 120)],
+        )
+        video = self.db.get(Video, "a")
+        self.assertEqual((video.view_count, video.like_count), (120, 6))
+        self.assertIsNotNone(self.db.get(Video, "gone").stats_refreshed_at)
+
+    def test_downsampling_keeps_last_point_per_bucket(self) -> None:
+        policy = RetentionPolicy(raw_days=2, daily_days=10, retention_days=30)
+        points = [
+            ("a", NOW - timedelta(days=40)),
+            ("a", NOW - timedelta(days=20, hours=5)),
+            ("a", NOW - timedelta(days=20, hours=1)),
+            ("a", NOW - timedelta(days=5, hours=6)),
+            ("a", NOW - timedelta(days=5, hours=2)),
+            ("a", NOW - timedelta(hours=3)),
+            ("a", NOW - timedelta(hours=2)),
+            ("b", NOW - timedelta(days=5, hours=4)),
+        ]
+
+        doomed = plan_downsample(points, now=NOW, policy=policy)
+
+        self.assertEqual(
+            doomed,
+            [
+                ("a", NOW - timedelta(days=40)),
+                ("a", NOW - timedelta(days=20, hours=5)),
+                ("a", NOW - timedelta(days=5, hours=6)),
+            ],
+        )
+
+    def test_downsample_history_deletes_planned_points(self) -> None:
+        self.db.add(make_video("a", 1))
+        for hours in (24 * 40, 24 * 5 + 6, 24 * 5 + 2, 3):
+            self.db.add(
+                VideoStatsHistory(
+                    video_id="a",
+                    observed_at=NOW - timedelta(hours=hours),
+                    view_count=hours,
+                    like_count=0,
+                )
+            )
+        self.db.commit()
+
+        removed = downsample_history(
+            self.db, now=NOW, policy=RetentionPolicy(raw_days=2, daily_days=10, retention_days=30)
+        )
+
+        self.assertEqual(removed, 2)
+        remaining = [h.view_count for h in self.db.query(VideoStatsHistory).order_by("observed_at")]
+        self.assertEqual(remaining, [24 * 5 + 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+from scripts.youtube_client import VideoDetailsBatcher
+
+
+class FakeVideosList:
+    def __init__(self, missing=()) -> None:
+        self.calls = []
+        self.missing = set(missing)
+
+    def __call__(self, api_key, video_ids, parts):
+        self.calls.append(list(video_ids))
+        return [{"id": video_id} for video_id in video_ids if video_id not in self.missing]
+
+
+class VideoDetailsBatcherTests(unittest.TestCase):
+    def test_ids_from_many_producers_fill_full_batches(self) -> None:
+        fake = FakeVideosList()
+        batcher = VideoDetailsBatcher("key", fetch_batch=fake)
+
+        tickets = [
+            batcher.submit([f"c{channel}-v{n}" for n in range(20)])
+            for channel in range(8)
+        ]
+        batcher.flush()
+
+        self.assertEqual([len(call) for call in fake.calls], [50, 50, 50, 10])
+        for channel, ticket in enumerate(tickets):
+            self.assertEqual(
+                [item["id"] for item in ticket.result()],
+                [f"c{channel}-v{n}" for n in range(20)],
+            )
+        self.assertEqual(batcher.request_count, 4)
+
+    def test_already_fetched_ids_are_not_requested_again(self) -> None:
+        fake = FakeVideosList(missing={"gone"})
+        batcher = VideoDetailsBatcher("key", fetch_batch=fake)
+
+        first = batcher.submit(["a", "b", "gone"])
+        self.assertEqual([item["id"] for item in first.result()], ["a", "b"])
+
+        second = batcher.submit(["b", "gone", "c", "a"])
+        self.assertEqual([item["id"] for item in second.result()], ["b", "c", "a"])
+        self.assertEqual(fake.calls, [["a", "b", "gone"], ["c"]])
+
+    def test_result_flushes_pending_ids(self) -> None:
+        fake = FakeVideosList()
+        batcher = VideoDetailsBatcher("key", fetch_batch=fake)
+
+        ticket = batcher.submit(["a", "a", "b"])
+
+        self.assertEqual(fake.calls, [])
+        self.assertEqual([item["id"] for item in ticket.result()], ["a", "b"])
+        self.assertEqual(fake.calls, [["a", "b"]])
+
+
+if __name__ == "__main__":
+    unittest.main()